@@ -0,0 +1,91 @@
+"""
+Per-structure cost of generating the inputs of many structures with the same
+parameters.
+
+The "one by one" timings generate each input with generate_calculation, which
+resolves and validates the parameters (method, basis sets, solvation,
+dispersion correction) for every structure. The "batch" timings use
+ccinput.wrapper.gen_batch_objs, which resolves the parameters once and only
+copies them for each structure. The structures are parsed beforehand in both
+cases.
+
+Usage (from the root of the repository):
+    python -m benchmarks.bench_batch [repetitions]
+"""
+
+import os
+import sys
+import timeit
+from contextlib import redirect_stdout
+
+from ccinput.calculation import Structure
+from ccinput.wrapper import generate_calculation, gen_batch_objs
+
+STRUCTURES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "ccinput", "tests", "structures"
+)
+
+NUM_STRUCTURES = 500
+
+PARAMETERS = {
+    "type": "opt",
+    "method": "B3LYP",
+    "basis_set": "Def2-SVP",
+    "custom_basis_sets": "O=Def2-TZVP;",
+    "solvent": "methanol",
+    "solvation_model": "SMD",
+    "solvation_radii": "default",
+    "d3bj": True,
+    "nproc": 8,
+    "mem": "16G",
+}
+
+
+def one_by_one(structures, software):
+    return [
+        generate_calculation(
+            software=software, xyz=structure, name=f"calc_{index}", **PARAMETERS
+        )
+        for index, structure in enumerate(structures, 1)
+    ]
+
+
+def batch(structures, software):
+    return list(gen_batch_objs(structures, software=software, **PARAMETERS))
+
+
+def bench(fn, repetitions):
+    return min(timeit.repeat(fn, number=1, repeat=repetitions))
+
+
+def main(repetitions=5):
+    structure = Structure.from_file(os.path.join(STRUCTURES_DIR, "ethanol.xyz"))
+    structures = [structure] * NUM_STRUCTURES
+
+    print(
+        f"{'Software':>10} {'One by one (us/input)':>22} "
+        f"{'Batch (us/input)':>17} {'Speedup':>8}"
+    )
+    with open(os.devnull, "w") as gobble, redirect_stdout(gobble):
+        results = []
+        for software in ["gaussian", "orca"]:
+            ref = one_by_one(structures[:2], software)
+            for calc, ref_calc in zip(batch(structures[:2], software), ref):
+                assert calc.input_file == ref_calc.input_file
+
+            t_single = bench(lambda: one_by_one(structures, software), repetitions)
+            t_batch = bench(lambda: batch(structures, software), repetitions)
+            results.append((software, t_single, t_batch))
+
+    for software, t_single, t_batch in results:
+        print(
+            f"{software:>10} {t_single / NUM_STRUCTURES * 1e6:>22.0f} "
+            f"{t_batch / NUM_STRUCTURES * 1e6:>17.0f} {t_single / t_batch:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,81 @@
+"""
+Throughput of the detection of covalent bonds in large structures.
+
+The "pairwise" timings compare the distances between all the pairs of atoms,
+which grows quadratically with the number of atoms and is only timed for the
+smaller structures. The "cell list" timings use ccinput.utilities.get_bonds,
+which only compares the atoms of neighbouring cells. The fragments are then
+derived from the bonds with ccinput.utilities.get_fragments.
+
+Usage (from the root of the repository):
+    python -m benchmarks.bench_bonds [repetitions]
+"""
+
+import sys
+import timeit
+
+import numpy as np
+
+from ccinput.elements import COVALENT_RADII
+from ccinput.utilities import get_bonds, get_fragments, COVALENT_BOND_TOLERANCE
+
+NUM_ATOMS = [1000, 5000, 20000, 100000]
+
+# Largest structure for which all the pairs of atoms are compared
+MAX_PAIRWISE_ATOMS = 5000
+
+
+def random_structure(rng, num_atoms):
+    """Atoms of typical organic molecules at the density of a liquid"""
+    elements = list(rng.choice(["C", "H", "H", "O", "N"], num_atoms))
+    coordinates = rng.uniform(0, 2.2 * num_atoms ** (1 / 3), (num_atoms, 3))
+    return elements, coordinates
+
+
+def pairwise_bonds(elements, coordinates):
+    radii = np.array([COVALENT_RADII[el] for el in elements])
+    first, second = np.triu_indices(len(elements), k=1)
+    distances = np.linalg.norm(coordinates[first] - coordinates[second], axis=1)
+    bonded = distances < radii[first] + radii[second] + COVALENT_BOND_TOLERANCE
+    return np.stack([first[bonded], second[bonded]], axis=1)
+
+
+def bench(fn, repetitions):
+    return min(timeit.repeat(fn, number=1, repeat=repetitions))
+
+
+def main(repetitions=5):
+    rng = np.random.default_rng(0)
+    print(
+        f"{'Atoms':>8} {'Pairwise (s)':>13} {'Cell list (s)':>14} "
+        f"{'Speedup':>8} {'Fragments (s)':>14}"
+    )
+    for num_atoms in NUM_ATOMS:
+        elements, coordinates = random_structure(rng, num_atoms)
+
+        t_cells = bench(lambda: get_bonds(elements, coordinates), repetitions)
+        t_fragments = bench(lambda: get_fragments(elements, coordinates), repetitions)
+
+        if num_atoms <= MAX_PAIRWISE_ATOMS:
+            assert np.array_equal(
+                get_bonds(elements, coordinates), pairwise_bonds(elements, coordinates)
+            )
+            t_pairwise = bench(
+                lambda: pairwise_bonds(elements, coordinates), repetitions
+            )
+            pairwise = f"{t_pairwise:>13.4f}"
+            speedup = f"{t_pairwise / t_cells:>7.1f}x"
+        else:
+            pairwise = f"{'-':>13}"
+            speedup = f"{'-':>8}"
+
+        print(
+            f"{num_atoms:>8} {pairwise} {t_cells:>14.4f} {speedup} {t_fragments:>14.4f}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,101 @@
+"""
+Per-structure cost of generating inputs with custom basis sets on heavy-atom
+structures.
+
+The "cold" timings disable the disk cache and clear the in-memory caches
+before each input, so that they measure the cost of resolving the basis sets
+through the Basis Set Exchange. The "per element" timings request each element
+separately, like it was done before the elements were grouped by basis set.
+
+Usage (from the root of the repository):
+    python -m benchmarks.bench_custom_basis_sets [repetitions]
+"""
+
+import os
+import sys
+import timeit
+
+from ccinput import basis_sets
+from ccinput.basis_sets import get_basis_elements, clear_basis_block_caches
+from ccinput.constants import ATOMIC_NUMBER
+from ccinput.wrapper import gen_obj
+
+STRUCTURES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "ccinput", "tests", "structures"
+)
+
+CASES = [
+    ("AuI.xyz", "Au=Def2-TZVPD;I=Def2-TZVPD;", 0),
+    ("TeI2.xyz", "Te=Def2-TZVPD;I=Def2-TZVPD;", 0),
+]
+
+FORMATS = {
+    "gaussian": ("gaussian94", {}),
+    "orca": ("ORCA", {}),
+    "nwchem": ("nwchem", {"optimize_general": True, "uncontract_general": True}),
+}
+
+
+def generate(software, structure, custom_basis_sets, charge):
+    return gen_obj(
+        software=software,
+        type="sp",
+        method="B3LYP",
+        basis_set="Def2-SVP",
+        custom_basis_sets=custom_basis_sets,
+        charge=charge,
+        file=os.path.join(STRUCTURES_DIR, structure),
+    )
+
+
+def fetch_per_element(software, elements):
+    fmt, kwargs = FORMATS[software]
+    for el in elements:
+        get_basis_elements("Def2-TZVPD", [ATOMIC_NUMBER[el]], fmt=fmt, **kwargs)
+
+
+def fetch_bulk(software, elements):
+    fmt, kwargs = FORMATS[software]
+    el_nums = [ATOMIC_NUMBER[el] for el in elements]
+    get_basis_elements("Def2-TZVPD", el_nums, fmt=fmt, **kwargs)
+
+
+def bench(fn, repetitions):
+    return min(timeit.repeat(fn, number=1, repeat=repetitions)) * 1000
+
+
+def main(repetitions=5):
+    basis_sets.set_basis_set_cache(None)
+
+    print(
+        f"{'Structure':<10} {'Software':<10} {'Cold (ms)':>10} {'Warm (ms)':>10} "
+        f"{'Fetch per element (ms)':>23} {'Fetch bulk (ms)':>16}"
+    )
+    for structure, custom_basis_sets, charge in CASES:
+        elements = [e.split("=")[0] for e in custom_basis_sets.split(";") if e]
+        for software in FORMATS:
+
+            def cold():
+                clear_basis_block_caches()
+                generate(software, structure, custom_basis_sets, charge)
+
+            def warm():
+                generate(software, structure, custom_basis_sets, charge)
+
+            t_cold = bench(cold, repetitions)
+            warm()
+            t_warm = bench(warm, repetitions)
+            t_single = bench(lambda: fetch_per_element(software, elements), repetitions)
+            t_bulk = bench(lambda: fetch_bulk(software, elements), repetitions)
+
+            print(
+                f"{structure:<10} {software:<10} {t_cold:>10.2f} {t_warm:>10.2f} "
+                f"{t_single:>23.2f} {t_bulk:>16.2f}"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,93 @@
+"""
+Cost of finding the ECP of the basis sets built into ORCA on heavy-atom
+structures.
+
+The "scan" timings search the ECP with basis_set_exchange.filter_basis_sets,
+like it was done before the family ECP index. The "index" timings use the
+index, which is only built once. The "input" timings clear the in-memory
+basis set blocks before generating each input.
+
+Usage (from the root of the repository):
+    python -m benchmarks.bench_family_ecp [repetitions]
+"""
+
+import os
+import sys
+import timeit
+
+import basis_set_exchange
+
+from ccinput import basis_sets
+from ccinput.basis_sets import (
+    get_basis_info,
+    get_family_ecp_name,
+    clear_basis_block_caches,
+)
+from ccinput.constants import ATOMIC_NUMBER
+from ccinput.wrapper import gen_obj
+
+STRUCTURES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "ccinput", "tests", "structures"
+)
+
+CASES = [
+    ("AuI.xyz", "Au=Def2-TZVP;I=Def2-TZVP;", 0),
+    ("TeI2.xyz", "Te=Def2-TZVP;I=Def2-TZVP;", 0),
+    ("Ph2I_cation.xyz", "I=Def2-TZVP;", 1),
+]
+
+
+def scan(families):
+    for family in families:
+        hits = basis_set_exchange.filter_basis_sets(family=family, role="orbital")
+        for name, hit in hits.items():
+            if hit["function_types"] == ["scalar_ecp"]:
+                break
+
+
+def lookup(families):
+    for family in families:
+        get_family_ecp_name(family)
+
+
+def bench(fn, repetitions):
+    return min(timeit.repeat(fn, number=1, repeat=repetitions)) * 1000
+
+
+def main(repetitions=5):
+    basis_sets.set_basis_set_cache(None)
+
+    print(f"{'Structure':<16} {'Scan (ms)':>10} {'Index (ms)':>11} {'Input (ms)':>11}")
+    for structure, custom_basis_sets, charge in CASES:
+        el_nums = [
+            ATOMIC_NUMBER[e.split("=")[0]] for e in custom_basis_sets.split(";") if e
+        ]
+        families = [
+            info["family"] for info in get_basis_info("Def2-TZVP", el_nums).values()
+        ]
+
+        def generate():
+            clear_basis_block_caches()
+            gen_obj(
+                software="orca",
+                type="sp",
+                method="B3LYP",
+                basis_set="Def2-SVP",
+                custom_basis_sets=custom_basis_sets,
+                charge=charge,
+                file=os.path.join(STRUCTURES_DIR, structure),
+            )
+
+        generate()
+        t_scan = bench(lambda: scan(families), repetitions)
+        t_index = bench(lambda: lookup(families), repetitions)
+        t_input = bench(generate, repetitions)
+
+        print(f"{structure:<16} {t_scan:>10.2f} {t_index:>11.4f} {t_input:>11.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
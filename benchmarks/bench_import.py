@@ -0,0 +1,65 @@
+"""
+Import time of ccinput, as measured by `python -X importtime` in fresh
+interpreters.
+
+Reports the cumulative import time of the main modules and whether the
+heavy optional dependencies (only needed to rebuild data or to fetch basis
+sets) are imported at startup. The bytecode cache should be enabled
+(no PYTHONDONTWRITEBYTECODE), like it is for installed packages.
+
+Usage (from the root of the repository):
+    python -m benchmarks.bench_import [repetitions]
+"""
+
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "ccinput.constants",
+    "ccinput.utilities",
+    "ccinput.calculation",
+    "ccinput.wrapper",
+]
+
+HEAVY_MODULES = ["periodictable", "basis_set_exchange"]
+
+
+def import_times(module):
+    """Returns the cumulative import time of every module imported (in ms)"""
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    ).stderr
+
+    times = {}
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def main(repetitions=5):
+    # Warms up the bytecode cache
+    import_times("ccinput.wrapper")
+
+    print(f"{'Module':<22} {'Import (ms)':>12}")
+    for module in MODULES:
+        t = statistics.median(import_times(module)[module] for i in range(repetitions))
+        print(f"{module:<22} {t:>12.1f}")
+
+    imported = import_times("ccinput.wrapper")
+    print()
+    for module in HEAVY_MODULES:
+        print(f"{module} imported at startup: {module in imported}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
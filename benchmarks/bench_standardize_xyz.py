@@ -0,0 +1,91 @@
+"""
+Cost of standardizing large XYZ structures.
+
+The "loop" timings use the previous implementation of standardize_xyz, which
+parsed the atoms one line at a time and built the output by string
+concatenation. The "vectorized" timings use ccinput.utilities.standardize_xyz,
+which parses the coordinates as one NumPy array, validates each distinct atomic
+label once and joins the formatted lines.
+
+Usage (from the root of the repository):
+    python -m benchmarks.bench_standardize_xyz [repetitions]
+"""
+
+import sys
+import timeit
+
+import numpy as np
+
+from ccinput.constants import ATOMIC_NUMBER, ATOMIC_SYMBOL, LOWERCASE_ATOMIC_SYMBOLS
+from ccinput.utilities import standardize_xyz
+
+SIZES = [10000, 100000]
+
+
+def loop_standardize_xyz(xyz):
+    standard_xyz = ""
+    arr_xyz = xyz.strip().split("\n")
+
+    try:
+        num_atoms = int(arr_xyz[0])
+    except ValueError:
+        pass
+    else:
+        arr_xyz = arr_xyz[2:]
+
+    for el in arr_xyz:
+        line_data = []
+        if el.strip() == "":
+            continue
+
+        sel = el.strip().split()
+        if sel[0] not in ATOMIC_NUMBER:
+            if sel[0].isdigit():
+                line_data.append(ATOMIC_SYMBOL[int(sel[0])])
+            else:
+                line_data.append(LOWERCASE_ATOMIC_SYMBOLS[sel[0].lower()])
+        else:
+            line_data.append(sel[0])
+
+        for coord in sel[1:]:
+            line_data.append(float(coord))
+
+        standard_xyz += "{:<2} {:>12.8f} {:>12.8f} {:>12.8f}\n".format(*line_data)
+    return standard_xyz
+
+
+def random_xyz(num_atoms):
+    rng = np.random.default_rng(0)
+    elements = rng.choice(["C", "H", "O", "N", "cl", "6"], num_atoms)
+    coordinates = rng.uniform(-50, 50, (num_atoms, 3))
+    lines = [
+        f"{el} {x:.6f} {y:.6f} {z:.6f}"
+        for el, (x, y, z) in zip(elements, coordinates.tolist())
+    ]
+    return f"{num_atoms}\n\n" + "\n".join(lines) + "\n"
+
+
+def bench(fn, repetitions):
+    return min(timeit.repeat(fn, number=1, repeat=repetitions)) * 1000
+
+
+def main(repetitions=5):
+    print(f"{'Atoms':>8} {'Loop (ms)':>10} {'Vectorized (ms)':>16} {'Speedup':>8}")
+    for size in SIZES:
+        xyz = random_xyz(size)
+        assert loop_standardize_xyz(xyz) == standardize_xyz(xyz)
+
+        t_loop = bench(lambda: loop_standardize_xyz(xyz), repetitions)
+        t_vectorized = bench(lambda: standardize_xyz(xyz), repetitions)
+
+        print(
+            f"{size:>8} {t_loop:>10.1f} {t_vectorized:>16.1f} "
+            f"{t_loop / t_vectorized:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,101 @@
+"""
+Cost of resolving keywords to their canonical names with the get_abs_*
+functions.
+
+The "scan" timings use the previous implementation, which looped over all the
+canonical names of the synonym tables. The "index" timings use the synonym
+indexes of ccinput.utilities. Each lookup resolves the same sample of
+synonyms, including unknown keywords (worst case for the scan).
+
+Usage (from the root of the repository):
+    python -m benchmarks.bench_synonyms [repetitions]
+"""
+
+import sys
+import timeit
+
+from ccinput.constants import (
+    SYN_TYPES,
+    SYN_SOFTWARE,
+    SYN_METHODS,
+    SYN_BASIS_SETS,
+    SYN_SOLVENTS,
+    BASIS_SET_EXCHANGE_KEY,
+)
+from ccinput.utilities import (
+    indexify,
+    get_abs_type,
+    get_abs_software,
+    get_abs_method,
+    get_abs_basis_set,
+    get_abs_solvent,
+)
+
+
+def scan_table(table, keyword, bse=False):
+    _keyword = indexify(keyword)
+    for canonical in table:
+        if _keyword in table[canonical] or _keyword == canonical:
+            return canonical
+    if bse:
+        for canonical in BASIS_SET_EXCHANGE_KEY:
+            if _keyword == canonical:
+                return canonical
+    return None
+
+
+def index_table(fn, keyword):
+    try:
+        return fn(keyword)
+    except Exception:
+        return None
+
+
+def sample(table, size=20):
+    keywords = []
+    for canonical, synonyms in list(table.items())[:: max(len(table) // size, 1)]:
+        keywords.extend(list(synonyms)[:1] or [canonical])
+    return [str(k) for k in keywords] + ["unknown keyword"]
+
+
+CASES = [
+    ("type", SYN_TYPES, get_abs_type, False),
+    ("software", SYN_SOFTWARE, get_abs_software, False),
+    ("method", SYN_METHODS, get_abs_method, False),
+    ("basis_set", SYN_BASIS_SETS, get_abs_basis_set, True),
+    ("solvent", SYN_SOLVENTS, get_abs_solvent, False),
+]
+
+
+def bench(fn, repetitions, number=100):
+    return min(timeit.repeat(fn, number=number, repeat=repetitions)) / number
+
+
+def main(repetitions=5):
+    print(
+        f"{'Table':<10} {'Entries':>8} {'Scan (us/lookup)':>17} "
+        f"{'Index (us/lookup)':>18}"
+    )
+    for name, table, fn, bse in CASES:
+        keywords = sample(table)
+
+        # Builds the index outside of the timings
+        index_table(fn, keywords[0])
+
+        t_scan = bench(
+            lambda: [scan_table(table, k, bse) for k in keywords], repetitions
+        )
+        t_index = bench(lambda: [index_table(fn, k) for k in keywords], repetitions)
+
+        n = len(keywords)
+        print(
+            f"{name:<10} {len(table):>8} {t_scan / n * 1e6:>17.2f} "
+            f"{t_index / n * 1e6:>18.2f}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,98 @@
+"""
+Throughput of the conversion of Z-matrices to Cartesian coordinates.
+
+The "one by one" timings convert each molecule separately, as when reading
+Z-matrix files one at a time. The "batch" timings convert all the molecules
+with ccinput.zmatrix.zmatrices_to_cartesian, which places each row of atoms for
+all the molecules at once. The conversion is timed alone and together with the
+parsing of the Z-matrices.
+
+Usage (from the root of the repository):
+    python -m benchmarks.bench_zmatrix [repetitions]
+"""
+
+import sys
+import timeit
+
+import numpy as np
+
+from ccinput.zmatrix import parse_zmatrix, zmatrix_to_cartesian, zmatrices_to_cartesian
+
+NUM_MOLECULES = [1000, 5000]
+
+
+def random_zmatrix(rng, num_atoms):
+    lines = ["C"]
+    for i in range(1, num_atoms):
+        el = rng.choice(["C", "H", "O", "N"])
+        refs = rng.permutation(i)[:3] + 1
+        fields = [el, str(refs[0]), f"{rng.uniform(1.0, 1.6):.4f}"]
+        if i > 1:
+            fields += [str(refs[1]), f"{rng.uniform(95, 125):.3f}"]
+        if i > 2:
+            fields += [str(refs[2]), f"{rng.uniform(-180, 180):.3f}"]
+        lines.append(" ".join(fields))
+    return "\n".join(lines)
+
+
+def one_by_one(parsed):
+    return [zmatrix_to_cartesian(refs, values) for elements, refs, values in parsed]
+
+
+def padded_arrays(parsed):
+    max_atoms = max(len(elements) for elements, refs, values in parsed)
+    refs = np.zeros((len(parsed), max_atoms, 3), dtype=int)
+    values = np.zeros((len(parsed), max_atoms, 3))
+    for i, (elements, mol_refs, mol_values) in enumerate(parsed):
+        refs[i, : len(elements)] = mol_refs
+        values[i, : len(elements)] = mol_values
+    return refs, values
+
+
+def bench(fn, repetitions):
+    return min(timeit.repeat(fn, number=1, repeat=repetitions))
+
+
+def main(repetitions=5):
+    rng = np.random.default_rng(0)
+    print(
+        f"{'Molecules':>10} {'Step':>22} {'One by one (mol/s)':>19} "
+        f"{'Batch (mol/s)':>14} {'Speedup':>8}"
+    )
+    for num_molecules in NUM_MOLECULES:
+        zmatrices = [
+            random_zmatrix(rng, int(rng.integers(5, 40))) for i in range(num_molecules)
+        ]
+        parsed = [parse_zmatrix(zmatrix) for zmatrix in zmatrices]
+        refs, values = padded_arrays(parsed)
+
+        batch = zmatrices_to_cartesian(zmatrices)
+        for (elements, coords), single in zip(batch, one_by_one(parsed)):
+            assert np.allclose(coords, single)
+
+        steps = [
+            (
+                "conversion",
+                lambda: one_by_one(parsed),
+                lambda: zmatrix_to_cartesian(refs, values),
+            ),
+            (
+                "parsing + conversion",
+                lambda: [zmatrices_to_cartesian([z]) for z in zmatrices],
+                lambda: zmatrices_to_cartesian(zmatrices),
+            ),
+        ]
+        for step, fn_single, fn_batch in steps:
+            t_single = bench(fn_single, repetitions)
+            t_batch = bench(fn_batch, repetitions)
+            print(
+                f"{num_molecules:>10} {step:>22} {num_molecules / t_single:>19.0f} "
+                f"{num_molecules / t_batch:>14.0f} {t_single / t_batch:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,92 @@
+"""
+Archive output.
+
+Instead of one file per input, the inputs and their companion files can be
+written as members of a single archive (tar, gzip-compressed tar or zip). The
+archive is written as one sequential stream, so it can also be sent to the
+standard output.
+
+The archive is chosen through the extension of the output: the rest of the
+name of the archive is used as the pattern of the names of the members (e.g.,
+the inputs of "-o calc_dir/sp.inp.tar.gz" are named like with "-o sp.inp",
+inside calc_dir/sp.inp.tar.gz).
+"""
+
+import io
+import os
+import time
+import tarfile
+import zipfile
+
+# Extensions of the archives and their formats (longest extensions first)
+ARCHIVE_EXTENSIONS = {
+    ".tar.gz": "gztar",
+    ".tgz": "gztar",
+    ".tar": "tar",
+    ".zip": "zip",
+}
+
+
+def get_archive_format(output):
+    """
+    Returns the format of the archive given as output and the pattern of the
+    names of its members, or None if the output is not an archive.
+    """
+    name = os.path.basename(output)
+    for ext, archive_format in ARCHIVE_EXTENSIONS.items():
+        if name.lower().endswith(ext):
+            return archive_format, name[: -len(ext)]
+    return None
+
+
+class ArchiveWriter:
+    """
+    Writes files as members of an archive, in one sequential stream. The
+    archive is written to the path or to the binary file object, and is
+    referred to by the given name in the messages.
+    """
+
+    def __init__(self, target, archive_format, name=None):
+        if isinstance(target, str):
+            self.name = name or target
+            self.file = open(target, "wb")
+            self.owns_file = True
+        else:
+            self.name = name or getattr(target, "name", "archive")
+            self.file = target
+            self.owns_file = False
+
+        self.format = archive_format
+        if archive_format == "zip":
+            self.archive = zipfile.ZipFile(
+                self.file, "w", compression=zipfile.ZIP_DEFLATED
+            )
+        elif archive_format == "gztar":
+            self.archive = tarfile.open(fileobj=self.file, mode="w|gz")
+        else:
+            self.archive = tarfile.open(fileobj=self.file, mode="w|")
+
+    def add(self, name, content):
+        """Adds the text content as the member of the given name"""
+        data = content.encode("utf-8")
+        if self.format == "zip":
+            self.archive.writestr(name, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = time.time()
+            info.mode = 0o644
+            self.archive.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        self.archive.close()
+        if self.owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
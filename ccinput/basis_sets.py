@@ -0,0 +1,878 @@
+"""
+Access to the basis set data of the Basis Set Exchange (BSE).
+
+All the packages request basis sets through get_basis instead of calling
+basis_set_exchange directly. Results are stored in a persistent cache in the
+user data directory, since resolving a basis set through the BSE re-reads and
+re-assembles its JSON data on every call.
+
+A precompiled pack of basis sets can also be built in advance with
+`python -m ccinput.basis_sets` (see build_basis_set_pack). If present, it is
+used before the cache and the BSE, which is then only imported on a miss. A
+pack built with another version of the BSE is ignored.
+
+On top of this, the packages memoize the post-processed blocks of each element
+in memory (see basis_block_cache), so that a batch of calculations with the
+same custom basis sets only processes them once per element. The elements
+using the same basis set are requested together (see get_basis_elements).
+
+The name of the ECP of each basis set family is resolved through an index
+built once from the metadata of the BSE (see get_family_ecp_name).
+
+The cache and the pack can be moved or disabled with the CCINPUT_BASIS_CACHE
+and CCINPUT_BASIS_PACK environment variables (path, or 0 to disable them).
+"""
+
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+from appdirs import user_data_dir
+
+from ccinput.constants import BASIS_SET_EXCHANGE_KEY, SYN_BASIS_SETS
+from ccinput.utilities import indexify, warn
+
+data_dir = user_data_dir("ccinput", "CYLlab")
+
+CACHE_PATH = os.path.join(data_dir, "basis_sets.sqlite")
+PACK_PATH = os.path.join(data_dir, "basis_sets.pack")
+
+# Environment variables giving the path of the cache and of the pack, or 0 to
+# disable them
+CACHE_ENV_VAR = "CCINPUT_BASIS_CACHE"
+PACK_ENV_VAR = "CCINPUT_BASIS_PACK"
+
+# Maximum total size of the cached basis sets (in bytes)
+CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+# Options of the basis sets requested by each package
+PACKAGE_BASIS_FORMATS = {
+    "gaussian": {"fmt": "gaussian94"},
+    "orca": {"fmt": "ORCA"},
+    "nwchem": {"fmt": "nwchem", "optimize_general": True, "uncontract_general": True},
+}
+
+
+def get_bse_version():
+    import basis_set_exchange
+
+    return basis_set_exchange.version()
+
+
+def get_installed_bse_version():
+    """Returns the version of the installed BSE, if possible without importing it"""
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:  # Python < 3.8
+        return get_bse_version()
+
+    try:
+        return version("basis_set_exchange")
+    except PackageNotFoundError:
+        return get_bse_version()
+
+
+class BasisSetCache:
+    """
+    Size-bounded on-disk cache of basis sets obtained from the BSE.
+
+    The least recently used entries are evicted when the total size of the
+    cached data exceeds max_size. The whole cache is invalidated when the
+    version of the BSE changes, since the basis set data might have changed.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_size=CACHE_MAX_SIZE, version=None):
+        self.path = path
+        self.max_size = max_size
+        self._version = version
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+        # Set to False if the cache cannot be used (e.g., read-only file system)
+        self.enabled = True
+
+    @property
+    def version(self):
+        if self._version is None:
+            self._version = get_bse_version()
+        return self._version
+
+    def _connect(self):
+        if self._connection is not None:
+            # Connections cannot be shared with forked processes
+            if self._pid == os.getpid():
+                return self._connection
+            self._connection = None
+
+        Path(os.path.dirname(os.path.abspath(self.path))).mkdir(
+            parents=True, exist_ok=True
+        )
+        connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS basis_sets (key TEXT PRIMARY KEY, "
+            "data TEXT, size INTEGER, last_access REAL)"
+        )
+
+        row = connection.execute(
+            "SELECT value FROM metadata WHERE key = 'bse_version'"
+        ).fetchone()
+        if row is None or row[0] != self.version:
+            self._clear(connection)
+            connection.execute(
+                "INSERT OR REPLACE INTO metadata VALUES ('bse_version', ?)",
+                (self.version,),
+            )
+        connection.commit()
+
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
+
+    def _clear(self, connection):
+        connection.execute("DELETE FROM basis_sets")
+
+    def _disable(self):
+        self.enabled = False
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def get(self, key):
+        """Returns the cached data for the key or None if it is not cached"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            try:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT data FROM basis_sets WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                connection.execute(
+                    "UPDATE basis_sets SET last_access = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+                connection.commit()
+            except (sqlite3.Error, OSError):
+                self._disable()
+                return None
+
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        if not self.enabled:
+            return
+
+        data = json.dumps(value)
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO basis_sets VALUES (?, ?, ?, ?)",
+                    (key, data, len(data), time.time()),
+                )
+                self._evict(connection)
+                connection.commit()
+            except (sqlite3.Error, OSError):
+                self._disable()
+
+    def _evict(self, connection):
+        (total,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM basis_sets"
+        ).fetchone()
+        if total <= self.max_size:
+            return
+
+        rows = connection.execute(
+            "SELECT key, size FROM basis_sets ORDER BY last_access"
+        ).fetchall()
+        to_delete = []
+        for key, size in rows:
+            if total <= self.max_size:
+                break
+            to_delete.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM basis_sets WHERE key = ?", to_delete)
+
+    def invalidate(self):
+        """Removes all the cached basis sets"""
+        with self._lock:
+            try:
+                connection = self._connect()
+                self._clear(connection)
+                connection.commit()
+            except (sqlite3.Error, OSError):
+                self._disable()
+
+    def __len__(self):
+        if not self.enabled:
+            return 0
+        with self._lock:
+            try:
+                (num,) = (
+                    self._connect()
+                    .execute("SELECT COUNT(*) FROM basis_sets")
+                    .fetchone()
+                )
+            except (sqlite3.Error, OSError):
+                self._disable()
+                return 0
+        return num
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def get_default_basis_set_cache():
+    """Returns the cache at the path of CCINPUT_BASIS_CACHE (or CACHE_PATH), or None if disabled"""
+    path = os.environ.get(CACHE_ENV_VAR, "")
+    if path == "0":
+        return None
+    return BasisSetCache(path or CACHE_PATH)
+
+
+_cache = get_default_basis_set_cache()
+
+
+def get_basis_set_cache():
+    return _cache
+
+
+def set_basis_set_cache(cache):
+    """Replaces the cache used by get_basis (None disables the disk cache)"""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = cache
+    clear_family_ecp_index()
+
+
+def invalidate_basis_set_cache():
+    if _cache is not None:
+        _cache.invalidate()
+    clear_family_ecp_index()
+
+
+class BasisSetPack:
+    """
+    Read-only pack of precompiled basis sets (see build_basis_set_pack).
+
+    The pack contains the same entries as the disk cache, as well as the list
+    of elements defined by each basis set. This allows to know that a basis set
+    is not available for an element without calling the BSE.
+
+    The pack is ignored if it was built with another version of the BSE,
+    since the basis set data might have changed.
+    """
+
+    def __init__(self, path=PACK_PATH, version=None):
+        self.path = path
+        self._version = version
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._elements = None
+
+        # Set to False if there is no usable pack
+        self.enabled = True
+
+    def _connect(self):
+        if self._connection is not None:
+            if self._pid == os.getpid():
+                return self._connection
+            self._connection = None
+
+        if not os.path.isfile(self.path):
+            raise OSError(f"No basis set pack found at {self.path}")
+
+        connection = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+        row = connection.execute(
+            "SELECT value FROM metadata WHERE key = 'bse_version'"
+        ).fetchone()
+        version = self._version or get_installed_bse_version()
+        if row is None or row[0] != version:
+            connection.close()
+            warn(
+                f"Ignoring the basis set pack {self.path}: built with version "
+                f"{row[0] if row else 'unknown'} of basis_set_exchange instead of {version}"
+            )
+            raise OSError(f"Outdated basis set pack: {self.path}")
+
+        self._elements = {
+            name: set(int(el) for el in elements.split(",") if el != "")
+            for name, elements in connection.execute("SELECT name, elements FROM names")
+        }
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
+
+    def _disable(self):
+        self.enabled = False
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def get(self, key):
+        """Returns the packed data for the key or None if it is not packed"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            try:
+                row = (
+                    self._connect()
+                    .execute("SELECT data FROM basis_sets WHERE key = ?", (key,))
+                    .fetchone()
+                )
+            except (sqlite3.Error, OSError):
+                self._disable()
+                return None
+
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]))
+
+    def is_unavailable(self, name, element):
+        """Returns True if the pack knows that the basis set does not define the element"""
+        if not self.enabled:
+            return False
+
+        with self._lock:
+            try:
+                self._connect()
+            except (sqlite3.Error, OSError):
+                self._disable()
+                return False
+
+        elements = self._elements.get(name.lower())
+        return elements is not None and element not in elements
+
+    def names(self):
+        if not self.enabled:
+            return []
+
+        with self._lock:
+            try:
+                self._connect()
+            except (sqlite3.Error, OSError):
+                self._disable()
+                return []
+        return sorted(self._elements.keys())
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def get_default_basis_set_pack():
+    """Returns the pack at the path of CCINPUT_BASIS_PACK (or PACK_PATH), or None if disabled"""
+    path = os.environ.get(PACK_ENV_VAR, "")
+    if path == "0":
+        return None
+    return BasisSetPack(path or PACK_PATH)
+
+
+_pack = get_default_basis_set_pack()
+
+
+def get_basis_set_pack():
+    return _pack
+
+
+def set_basis_set_pack(pack):
+    """Replaces the pack used by get_basis (None disables the pack)"""
+    global _pack
+    if _pack is not None:
+        _pack.close()
+    _pack = pack
+    clear_family_ecp_index()
+
+
+def get_cache_key(name, element, fmt=None, header=False, **kwargs):
+    options = ",".join(f"{k}={v}" for k, v in sorted(kwargs.items()))
+    return f"{name.lower()}|{element}|{str(fmt).lower()}|{header}|{options}"
+
+
+def _lookup(key):
+    if _pack is not None:
+        bs = _pack.get(key)
+        if bs is not None:
+            return bs
+
+    if _cache is not None:
+        return _cache.get(key)
+
+    return None
+
+
+def _store(key, bs):
+    if _cache is not None:
+        _cache.set(key, bs)
+
+
+def get_basis(name, element, fmt=None, header=False, **kwargs):
+    """
+    Returns the basis set of one element as given by basis_set_exchange.get_basis.
+    The keyword arguments are passed to the BSE (e.g., optimize_general).
+    """
+    key = get_cache_key(name, element, fmt=fmt, header=header, **kwargs)
+
+    bs = _lookup(key)
+    if bs is not None:
+        return bs
+
+    import basis_set_exchange
+
+    bs = basis_set_exchange.get_basis(
+        name, fmt=fmt, elements=[element], header=header, **kwargs
+    )
+
+    _store(key, bs)
+
+    return bs
+
+
+def get_basis_elements(name, elements, fmt=None, header=False, **kwargs):
+    """
+    Returns the basis sets of multiple elements as a dictionary indexed by
+    atomic number. The elements which are not cached are obtained from the BSE
+    in a single call and split afterwards, so that the basis set is only
+    resolved once. The elements for which the basis set cannot be obtained
+    are omitted from the dictionary.
+    """
+    basis = {}
+    missing = []
+    for element in elements:
+        bs = _lookup(get_cache_key(name, element, fmt, header, **kwargs))
+
+        if bs is not None:
+            basis[element] = bs
+        elif _pack is None or not _pack.is_unavailable(name, element):
+            missing.append(element)
+
+    if len(missing) > 0:
+        fetched = fetch_basis_elements(name, missing, fmt, header, **kwargs)
+        for element, bs in fetched.items():
+            _store(get_cache_key(name, element, fmt, header, **kwargs), bs)
+        basis.update(fetched)
+
+    return basis
+
+
+def get_basis_info(name, elements):
+    """
+    Returns the family of the basis set and whether it uses an ECP for each
+    element, as a dictionary indexed by atomic number. The elements for which
+    the basis set cannot be obtained are omitted from the dictionary.
+    """
+    info = {}
+    missing = []
+    for element in elements:
+        el_info = _lookup(get_cache_key(name, element, fmt="info"))
+
+        if el_info is not None:
+            info[element] = el_info
+        elif _pack is None or not _pack.is_unavailable(name, element):
+            missing.append(element)
+
+    if len(missing) > 0:
+        for element, el_dict in fetch_basis_elements(name, missing).items():
+            el_info = get_element_info(el_dict, element)
+            _store(get_cache_key(name, element, fmt="info"), el_info)
+            info[element] = el_info
+
+    return info
+
+
+def get_element_info(basis_dict, element):
+    return {
+        "family": basis_dict["family"],
+        "has_ecp": "ecp_potentials" in basis_dict["elements"][str(element)],
+    }
+
+
+# Key of the family ECP index in the cache and the pack
+FAMILY_ECP_INDEX_KEY = "|family_ecp_index|"
+
+_family_ecp_index = None
+
+
+def build_family_ecp_index():
+    """
+    Returns the name of the first orbital basis set made only of an ECP for
+    each family of the BSE. The basis sets are considered in the same order as
+    basis_set_exchange.filter_basis_sets.
+    """
+    import basis_set_exchange
+
+    index = {}
+    for name, metadata in basis_set_exchange.get_metadata().items():
+        if metadata["role"] != "orbital":
+            continue
+        if metadata["function_types"] == ["scalar_ecp"]:
+            index.setdefault(metadata["family"], name)
+    return index
+
+
+def get_family_ecp_index():
+    """
+    Returns the family ECP index. It is built once and stored in the cache,
+    unless it is found in the pack or the cache.
+    """
+    global _family_ecp_index
+    if _family_ecp_index is None:
+        index = _lookup(FAMILY_ECP_INDEX_KEY)
+        if index is None:
+            index = build_family_ecp_index()
+            _store(FAMILY_ECP_INDEX_KEY, index)
+        _family_ecp_index = index
+    return _family_ecp_index
+
+
+def clear_family_ecp_index():
+    global _family_ecp_index
+    _family_ecp_index = None
+
+
+def get_family_ecp_name(family):
+    """Returns the name of the ECP of the basis set family or None"""
+    return get_family_ecp_index().get(family.lower())
+
+
+def get_bse_split_helpers():
+    """
+    Returns the private functions of the BSE used to split a basis set into
+    elements (function types and header), or None for those which this
+    version of the BSE does not provide
+    """
+    import basis_set_exchange
+
+    whole_basis_types = getattr(
+        getattr(basis_set_exchange, "compose", None), "_whole_basis_types", None
+    )
+    header_string = getattr(
+        getattr(basis_set_exchange, "api", None), "_header_string", None
+    )
+    return whole_basis_types, header_string
+
+
+def fetch_basis_elements(name, elements=None, fmt=None, header=False, **kwargs):
+    """
+    Obtains the basis sets of multiple elements from the BSE (without cache)
+    as a dictionary indexed by atomic number. All the elements of the basis set
+    are returned if elements is None. The elements for which the basis set
+    cannot be obtained are omitted from the dictionary.
+    """
+    import basis_set_exchange
+
+    try:
+        basis_dict = basis_set_exchange.get_basis(name, elements=elements, **kwargs)
+    except Exception:
+        # One of the elements is not available, the other ones might be
+        fetched = {}
+        if elements is not None and len(elements) > 1:
+            for element in elements:
+                fetched.update(
+                    fetch_basis_elements(name, [element], fmt, header, **kwargs)
+                )
+        return fetched
+
+    if elements is None:
+        elements = [int(el) for el in basis_dict["elements"]]
+
+    whole_basis_types, header_string = get_bse_split_helpers()
+    if whole_basis_types is None or (
+        fmt is not None and header and header_string is None
+    ):
+        return fetch_each_basis_element(name, elements, fmt, header, **kwargs)
+
+    fetched = {}
+    for element in elements:
+        el_dict = dict(basis_dict)
+        el_dict["elements"] = {str(element): basis_dict["elements"][str(element)]}
+        # Same as what the BSE does when it is given a subset of elements
+        el_dict["function_types"] = whole_basis_types(el_dict)
+
+        if fmt is None:
+            fetched[element] = el_dict
+            continue
+
+        if header:
+            header_str = header_string(el_dict)
+        else:
+            header_str = None
+
+        try:
+            fetched[element] = basis_set_exchange.writers.write_formatted_basis_str(
+                el_dict, fmt, header_str
+            )
+        except Exception:
+            # Some formats do not support all the types of functions
+            pass
+
+    return fetched
+
+
+def fetch_each_basis_element(name, elements, fmt=None, header=False, **kwargs):
+    """
+    Obtains the basis sets of multiple elements from the BSE (without cache)
+    with one call per element, like fetch_basis_elements
+    """
+    import basis_set_exchange
+
+    fetched = {}
+    for element in elements:
+        try:
+            fetched[element] = basis_set_exchange.get_basis(
+                name, elements=[element], fmt=fmt, header=header, **kwargs
+            )
+        except Exception:
+            pass
+    return fetched
+
+
+def build_basis_set_pack(path=PACK_PATH, names=None, software=None, verbose=False):
+    """
+    Compiles the basis sets of all their elements into a pack for the chosen
+    packages (all by default). By default, all the basis sets known by
+    ccinput are included. Returns the number of basis sets packed.
+    """
+    import basis_set_exchange
+
+    if names is None:
+        names = sorted(
+            set(BASIS_SET_EXCHANGE_KEY.values()) | set(SYN_BASIS_SETS.keys()),
+            key=str.lower,
+        )
+    else:
+        # Same names as the ones used by the custom basis sets of Parameters
+        names = [BASIS_SET_EXCHANGE_KEY.get(indexify(name), name) for name in names]
+    if software is None:
+        software = list(PACKAGE_BASIS_FORMATS.keys())
+
+    Path(os.path.dirname(os.path.abspath(path))).mkdir(parents=True, exist_ok=True)
+
+    # The pack is only replaced once it is complete
+    tmp_path = path + ".tmp"
+    if os.path.isfile(tmp_path):
+        os.remove(tmp_path)
+
+    connection = sqlite3.connect(tmp_path)
+    connection.execute("CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT)")
+    connection.execute("CREATE TABLE basis_sets (key TEXT PRIMARY KEY, data BLOB)")
+    connection.execute("CREATE TABLE names (name TEXT PRIMARY KEY, elements TEXT)")
+    connection.executemany(
+        "INSERT INTO metadata VALUES (?, ?)",
+        [
+            ("bse_version", get_installed_bse_version()),
+            ("software", ",".join(software)),
+            ("date", time.strftime("%Y-%m-%d %H:%M:%S")),
+        ],
+    )
+
+    def pack(key, data):
+        blob = zlib.compress(json.dumps(data).encode("UTF-8"), 9)
+        connection.execute(
+            "INSERT OR REPLACE INTO basis_sets VALUES (?, ?)", (key, blob)
+        )
+
+    pack(FAMILY_ECP_INDEX_KEY, build_family_ecp_index())
+
+    num_packed = 0
+    for name in names:
+        basis = fetch_basis_elements(name)
+        if verbose:
+            print(f"{name}: {len(basis)} elements")
+
+        # Names unknown to the BSE are also recorded, so that they can be
+        # recognized as such without importing the BSE
+        connection.execute(
+            "INSERT OR REPLACE INTO names VALUES (?, ?)",
+            (name.lower(), ",".join(str(el) for el in sorted(basis))),
+        )
+        if len(basis) == 0:
+            continue
+
+        for element, el_dict in basis.items():
+            pack(
+                get_cache_key(name, element, fmt="info"),
+                get_element_info(el_dict, element),
+            )
+
+        for package in software:
+            options = dict(PACKAGE_BASIS_FORMATS[package])
+            fmt = options.pop("fmt")
+            header = options.pop("header", False)
+            for element, bs in fetch_basis_elements(
+                name, None, fmt, header, **options
+            ).items():
+                pack(get_cache_key(name, element, fmt, header, **options), bs)
+
+        num_packed += 1
+
+    connection.commit()
+    connection.close()
+    os.replace(tmp_path, path)
+
+    if _pack is not None and os.path.abspath(_pack.path) == os.path.abspath(path):
+        # Make sure that the new pack is used
+        set_basis_set_pack(BasisSetPack(path))
+
+    return num_packed
+
+
+# Maximum number of post-processed basis set blocks kept in memory per package
+BLOCK_CACHE_SIZE = 1024
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class BasisBlockCache:
+    """
+    Thread-safe LRU cache in front of a function returning the post-processed
+    basis set blocks of elements for a package.
+
+    The function takes a basis set keyword and a tuple of atomic numbers and
+    returns the blocks as a dictionary indexed by atomic number. The blocks
+    are cached per element, and the function is only called once with all the
+    elements that are not cached yet.
+    """
+
+    def __init__(self, fn, maxsize=BLOCK_CACHE_SIZE):
+        self.fn = fn
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._blocks = OrderedDict()
+        self._lock = threading.Lock()
+        functools.update_wrapper(self, fn)
+
+    def __call__(self, bs_keyword, el_nums):
+        blocks = {}
+        missing = []
+        with self._lock:
+            for el_num in el_nums:
+                key = (bs_keyword, el_num)
+                if key in self._blocks:
+                    self._blocks.move_to_end(key)
+                    blocks[el_num] = self._blocks[key]
+                    self.hits += 1
+                else:
+                    missing.append(el_num)
+                    self.misses += 1
+
+        if len(missing) > 0:
+            # The lock is not held during the computation, so that threads
+            # requesting different basis sets do not wait for each other
+            computed = self.fn(bs_keyword, tuple(missing))
+            with self._lock:
+                for el_num, block in computed.items():
+                    self._blocks[(bs_keyword, el_num)] = block
+                    self._blocks.move_to_end((bs_keyword, el_num))
+                while len(self._blocks) > self.maxsize:
+                    self._blocks.popitem(last=False)
+            blocks.update(computed)
+
+        return blocks
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._blocks))
+
+    def cache_clear(self):
+        with self._lock:
+            self._blocks.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_block_caches = {}
+
+
+def basis_block_cache(software):
+    """
+    Memoizes a function that returns the post-processed basis set blocks of
+    elements for a package (see BasisBlockCache). The returned blocks must not
+    be modified by the callers.
+    """
+
+    def decorator(fn):
+        cached_fn = BasisBlockCache(fn)
+        _block_caches[software] = cached_fn
+        return cached_fn
+
+    return decorator
+
+
+def basis_block_cache_info():
+    """Returns the hit/miss statistics of the in-memory basis set block caches"""
+    return {software: fn.cache_info() for software, fn in _block_caches.items()}
+
+
+def clear_basis_block_caches():
+    for fn in _block_caches.values():
+        fn.cache_clear()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Builds a pack of precompiled basis sets used before the Basis Set Exchange"
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        default=PACK_PATH,
+        type=str,
+        help=f"Path of the pack (default: {PACK_PATH})",
+    )
+    parser.add_argument(
+        "--basis_sets",
+        "-bs",
+        nargs="+",
+        default=None,
+        help="Basis sets to include (default: all basis sets known by ccinput)",
+    )
+    parser.add_argument(
+        "--software",
+        nargs="+",
+        choices=list(PACKAGE_BASIS_FORMATS.keys()),
+        default=None,
+        help="Packages for which to compile the basis sets (default: all)",
+    )
+    parser.add_argument("--quiet", "-q", action="store_true", help="No output")
+
+    args = parser.parse_args()
+
+    num = build_basis_set_pack(
+        args.output,
+        names=args.basis_sets,
+        software=args.software,
+        verbose=not args.quiet,
+    )
+    if not args.quiet:
+        print(f"Packed {num} basis sets in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import hashlib
 import os
 from itertools import zip_longest
 
+import numpy as np
+
 from ccinput.exceptions import (
     InvalidParameter,
     InternalError,
@@ -16,16 +18,138 @@ from ccinput.utilities import (
     get_abs_solvent,
     get_theory_level,
     standardize_memory,
-    get_npxyz,
+    parse_xyz,
+    format_xyz,
+    read_xyz_file,
+    iter_xyz_frames,
+    iter_xyz_frame_range,
     get_coord,
+    get_coords,
     has_dispersion_parameters,
     warn,
     indexify,
     get_charge_mult_from_name,
 )
+from ccinput.zmatrix import (
+    is_zmatrix,
+    is_zmatrix_file,
+    read_zmatrix_file,
+    zmatrices_to_cartesian,
+)
 from ccinput.constants import ATOMIC_NUMBER, SYN_SOFTWARE, BASIS_SET_EXCHANGE_KEY
 
 
+class Structure:
+    """
+    Holds the atoms of the system, parsed once and shared by the calculation,
+    its constraints and the packages. The standard XYZ string of the structure
+    (see standardize_xyz) is only generated if it is needed.
+
+    Indexing a structure gives the element and the coordinates of an atom, like
+    the arrays of get_npxyz.
+    """
+
+    def __init__(self, elements, coordinates):
+        self.elements = list(elements)
+        self.coordinates = np.array(coordinates, dtype=float).reshape(
+            len(self.elements), 3
+        )
+
+        self._xyz = None
+        self._atomic_numbers = None
+        self._unique_elements = None
+
+    @classmethod
+    def from_xyz(cls, xyz):
+        """
+        Parses a structure from any XYZ string or list of lines accepted by
+        standardize_xyz, or from a Z-matrix (see parse_zmatrix)
+        """
+        if isinstance(xyz, Structure):
+            return xyz
+        if is_zmatrix(xyz):
+            return cls.from_zmatrix(xyz)
+        return cls(*parse_xyz(xyz))
+
+    @classmethod
+    def from_zmatrix(cls, zmatrix):
+        return cls(*zmatrices_to_cartesian([zmatrix])[0])
+
+    @classmethod
+    def from_zmatrices(cls, zmatrices):
+        """Converts many Z-matrices to structures in one batch"""
+        return [cls(*atoms) for atoms in zmatrices_to_cartesian(zmatrices)]
+
+    @classmethod
+    def from_file(cls, path):
+        if is_zmatrix_file(path):
+            return cls.from_zmatrix(read_zmatrix_file(path))
+        return cls(*parse_xyz(read_xyz_file(path)))
+
+    @classmethod
+    def iter_file(cls, path, start=0, stop=None, persist_index=False):
+        """
+        Yields the comment line and the structure of the frames of a multi-frame
+        XYZ file. A range of frames (counting from 0) is read through the frame
+        index of the file (see load_xyz_frame_index).
+        """
+        if start == 0 and stop is None and not persist_index:
+            frames = iter_xyz_frames(path)
+        else:
+            frames = iter_xyz_frame_range(path, start, stop, persist=persist_index)
+
+        for comment, lines in frames:
+            yield comment, cls(*parse_xyz(lines))
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __getitem__(self, index):
+        return self.elements[index], self.coordinates[index]
+
+    def __eq__(self, other):
+        if not isinstance(other, Structure):
+            return NotImplemented
+        return self.elements == other.elements and np.array_equal(
+            self.coordinates, other.coordinates
+        )
+
+    @property
+    def xyz(self):
+        """Standard XYZ string of the structure"""
+        if self._xyz is None:
+            self._xyz = format_xyz(self.elements, self.coordinates)
+        return self._xyz
+
+    @property
+    def atomic_numbers(self):
+        if self._atomic_numbers is None:
+            self._atomic_numbers = np.array(
+                [ATOMIC_NUMBER[el] for el in self.elements], dtype=int
+            )
+        return self._atomic_numbers
+
+    @property
+    def unique_elements(self):
+        """Elements of the structure in order of first appearance"""
+        if self._unique_elements is None:
+            self._unique_elements = tuple(dict.fromkeys(self.elements))
+        return self._unique_elements
+
+    @property
+    def num_electrons(self):
+        """Number of electrons of the neutral structure"""
+        return int(self.atomic_numbers.sum())
+
+    def get_coord(self, ids):
+        """Returns the distance, angle or dihedral angle between the atoms (one-indexed)"""
+        return get_coord(self, ids)
+
+    def get_coords(self, ids):
+        """Returns the values of get_coord for many groups of atoms at once"""
+        return get_coords(self.coordinates, ids)
+
+
 class Calculation:
     """
     Holds all the data required to generate an input file.
@@ -54,7 +178,7 @@ class Calculation:
         fragments=None,
         **kwargs,
     ):
-        self.xyz = xyz
+        self.structure = Structure.from_xyz(xyz)
         self.parameters = parameters
         self.type = type
         self.file = file
@@ -86,27 +210,8 @@ class Calculation:
             if software in ["gaussian"]:
                 raise
 
-        try:
-            self.charge = int(charge)
-        except ValueError:
-            raise InvalidParameter(f"Invalid charge: '{charge}'")
-
-        if abs(self.charge - float(charge)) > 1e-4:
-            raise InvalidParameter(f"Charge must be an integer (received '{charge}')")
-
-        try:
-            self.multiplicity = int(multiplicity)
-        except ValueError:
-            raise InvalidParameter(f"Invalid multiplicity: '{multiplicity}'")
-
-        if abs(self.multiplicity - float(multiplicity)) > 1e-4:
-            raise InvalidParameter(
-                f"Multiplicity must be an integer (received '{multiplicity}')"
-            )
-        if self.multiplicity < 1:
-            raise InvalidParameter(
-                f"Multiplicity must at least 1 (received '{multiplicity}')"
-            )
+        self.charge = parse_charge(charge)
+        self.multiplicity = parse_multiplicity(multiplicity)
 
         if parse_name:
             if not file:
@@ -135,20 +240,20 @@ class Calculation:
         self.driver = driver.lower()
         self.kwargs = kwargs
 
-    def verify_charge_mult(self):
-        """Verifies that the requested charge and multiplicity are possible for the structure"""
-        electrons = 0
-        for line in self.xyz.split("\n"):
-            if line.strip() == "":
-                continue
-            el = line.split()[0]
-            electrons += ATOMIC_NUMBER[el]
+    @property
+    def xyz(self):
+        """Standard XYZ string of the structure"""
+        return self.structure.xyz
 
-        electrons -= self.charge
-        odd_e = electrons % 2
-        odd_m = self.multiplicity % 2
+    @xyz.setter
+    def xyz(self, xyz):
+        self.structure = Structure.from_xyz(xyz)
 
-        if odd_e == odd_m:
+    def verify_charge_mult(self):
+        """Verifies that the requested charge and multiplicity are possible for the structure"""
+        if not is_possible_charge_mult(
+            self.structure.num_electrons, self.charge, self.multiplicity
+        ):
             if self.file:
                 extra_detail = f" (file={self.file})"
             else:
@@ -160,6 +265,130 @@ class Calculation:
             )
 
 
+def parse_charge(charge):
+    """Returns the charge as an integer, or raises InvalidParameter"""
+    try:
+        _charge = int(charge)
+    except ValueError:
+        raise InvalidParameter(f"Invalid charge: '{charge}'")
+
+    if abs(_charge - float(charge)) > 1e-4:
+        raise InvalidParameter(f"Charge must be an integer (received '{charge}')")
+    return _charge
+
+
+def parse_multiplicity(multiplicity):
+    """Returns the multiplicity as an integer, or raises InvalidParameter"""
+    try:
+        _multiplicity = int(multiplicity)
+    except ValueError:
+        raise InvalidParameter(f"Invalid multiplicity: '{multiplicity}'")
+
+    if abs(_multiplicity - float(multiplicity)) > 1e-4:
+        raise InvalidParameter(
+            f"Multiplicity must be an integer (received '{multiplicity}')"
+        )
+    if _multiplicity < 1:
+        raise InvalidParameter(
+            f"Multiplicity must at least 1 (received '{multiplicity}')"
+        )
+    return _multiplicity
+
+
+def is_possible_charge_mult(num_electrons, charge, multiplicity):
+    """
+    Returns True if the charge and multiplicity are possible for a structure
+    with the given number of electrons (when neutral). Also works on arrays.
+    """
+    return (num_electrons - charge) % 2 != multiplicity % 2
+
+
+def _parse_integer_array(values, parse_fn):
+    """
+    Vectorized version of parse_charge and parse_multiplicity. Returns the
+    values as integers and the mask of the valid values.
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind not in "biuf":
+        # Strings and objects follow the exact rules of parse_fn
+        integers = np.zeros(len(arr), dtype=np.int64)
+        valid = np.zeros(len(arr), dtype=bool)
+        for i, value in enumerate(arr.tolist()):
+            try:
+                integers[i] = parse_fn(value)
+            except (InvalidParameter, TypeError, OverflowError):
+                pass
+            else:
+                valid[i] = True
+        return integers, valid
+
+    floats = arr.astype(float)
+    valid = np.isfinite(floats)
+    integers = np.trunc(np.where(valid, floats, 0))
+    valid &= np.abs(integers - floats) <= 1e-4
+    return integers.astype(np.int64), valid
+
+
+def verify_charge_mult_batch(structures, charges, multiplicities):
+    """
+    Verifies many combinations of structure, charge and multiplicity at once,
+    with the same rules as Calculation. The structures are given as arrays of
+    atomic numbers (or as Structure objects), or as a single 2D array of atomic
+    numbers padded with zeros.
+
+    Returns a boolean array which is True for the valid combinations and a
+    dictionary of the error messages of the invalid combinations by index.
+    """
+    if not len(structures) == len(charges) == len(multiplicities):
+        raise InvalidParameter(
+            "There must be as many charges and multiplicities as structures"
+        )
+
+    if isinstance(structures, np.ndarray) and structures.ndim == 2:
+        num_electrons = structures.sum(axis=1)
+    else:
+        atomic_numbers = [
+            s.atomic_numbers if isinstance(s, Structure) else np.asarray(s, dtype=int)
+            for s in structures
+        ]
+
+        # Number of electrons of each structure from the cumulative sum of all atoms
+        lengths = np.array([len(a) for a in atomic_numbers], dtype=np.int64)
+        cumsum = np.zeros(lengths.sum() + 1, dtype=np.int64)
+        if len(atomic_numbers) > 0:
+            np.cumsum(np.concatenate(atomic_numbers), out=cumsum[1:])
+        ends = np.cumsum(lengths)
+        num_electrons = cumsum[ends] - cumsum[ends - lengths]
+
+    _charges, valid_charges = _parse_integer_array(charges, parse_charge)
+    _multiplicities, valid_multiplicities = _parse_integer_array(
+        multiplicities, parse_multiplicity
+    )
+    valid_multiplicities &= _multiplicities >= 1
+
+    valid = valid_charges & valid_multiplicities
+    valid &= is_possible_charge_mult(num_electrons, _charges, _multiplicities)
+
+    # The messages are only generated for the invalid combinations
+    errors = {}
+    for i in np.flatnonzero(~valid).tolist():
+        try:
+            charge = parse_charge(charges[i])
+            multiplicity = parse_multiplicity(multiplicities[i])
+        except InvalidParameter as e:
+            errors[i] = str(e)
+        except (TypeError, OverflowError):
+            errors[i] = (
+                f"Invalid charge or multiplicity: '{charges[i]}', '{multiplicities[i]}'"
+            )
+        else:
+            errors[i] = (
+                f"This combination of charge ({charge}) "
+                + f"and multiplicity ({multiplicity}) is impossible"
+            )
+    return valid, errors
+
+
 class Parameters:
     """
     Holds all the parameters about the computational method.
@@ -319,6 +548,8 @@ class Constraint:
         ids=[],
         xyz=None,
         software="",
+        current_d=None,
+        native_scan=True,
     ):
         self.scan = scan
         self.ids = ids  # One-indexed (Gaussian like, not like ORCA)
@@ -329,7 +560,7 @@ class Constraint:
                 f"Invalid number of atoms: {len(ids)}, needs to be between 2 and 4"
             )
 
-        _xyz = get_npxyz(xyz)
+        _xyz = Structure.from_xyz(xyz)
 
         if max(ids) > len(_xyz):
             raise InvalidParameter(
@@ -358,7 +589,8 @@ class Constraint:
                     "The XYZ structure needs to be specified in order to calculate the initial coordinate value"
                 )
 
-        if software != "gaussian":
+        # Only applies when the package runs the scan itself
+        if software != "gaussian" or not native_scan:
             self.start_d = start_d
         else:
             if start_d is not None:
@@ -373,7 +605,10 @@ class Constraint:
         self.num_steps = num_steps
 
         if self.start_d is None:
-            self.start_d = get_coord(_xyz, self.ids)
+            # The current value can be evaluated beforehand for many constraints at once
+            if current_d is None:
+                current_d = _xyz.get_coord(self.ids)
+            self.start_d = current_d
 
         if self.scan:
             self.complete_parameters()
@@ -473,6 +708,7 @@ class Constraint:
 
 
 def parse_freeze_constraints(arr, xyz_str, software=""):
+    """xyz_str can be an XYZ string or a Structure"""
     if len(arr) == 0:
         return []
     constr = ""
@@ -482,43 +718,64 @@ def parse_freeze_constraints(arr, xyz_str, software=""):
     return parse_str_constraints(constr, xyz_str, software=software)
 
 
-def parse_scan_constraints(arr, sfrom, sto, snsteps, sstep, xyz_str, software=""):
+def parse_scan_constraints(
+    arr, sfrom, sto, snsteps, sstep, xyz_str, software="", native_scan=True
+):
+    """
+    xyz_str can be an XYZ string or a Structure. native_scan is False when
+    the scans are not run by the package (see ccinput.scan).
+    """
     if len(arr) == 0:
         return []
 
-    scans = []
+    structure = Structure.from_xyz(xyz_str)
+
+    specs = []
     for ids, fro, to, nsteps, step in zip_longest(arr, sfrom, sto, snsteps, sstep):
         if ids is None:
             raise InvalidParameter(
                 "Not enough sets of atom indices specified for the number of other parameters"
             )
-        _ids = [int(i) for i in ids]
+        specs.append(([int(i) for i in ids], fro, to, nsteps, step))
+
+    current_values = get_current_coords(structure, [spec[0] for spec in specs])
+
+    scans = []
+    for (ids, fro, to, nsteps, step), current_d in zip(specs, current_values):
         scans.append(
             gen_constraint(
-                _ids,
-                xyz_str,
+                ids,
+                structure,
                 "scan",
                 start_str=fro,
                 end_str=to,
                 nsteps_str=nsteps,
                 step_str=step,
                 software=software,
+                current_d=current_d,
+                native_scan=native_scan,
             )
         )
 
     return scans
 
 
-def parse_str_constraints(s, xyz_str, software=""):
+def parse_str_constraints(s, xyz_str, software="", native_scan=True):
+    """
+    xyz_str can be an XYZ string or a Structure. native_scan is False when
+    the scans are not run by the package (see ccinput.scan).
+    """
     if s.strip() == "":
         return []
 
+    structure = Structure.from_xyz(xyz_str)
+
     if software == "":
         warn(
             "No software specified for the constraints; the behaviour might be incorrect"
         )
 
-    constraints = []
+    specs = []
     cs = s.split(";")
     for c in cs:
         if c.strip() == "":
@@ -535,14 +792,45 @@ def parse_str_constraints(s, xyz_str, software=""):
             raise InvalidParameter(
                 f"Could not parse the atom numbers from the string '{ids_str}'"
             )
+        specs.append((ids, specs_str.split("_")))
 
+    current_values = get_current_coords(structure, [ids for ids, options in specs])
+
+    constraints = []
+    for (ids, options), current_d in zip(specs, current_values):
         constraints.append(
-            gen_constraint(ids, xyz_str, *specs_str.split("_"), software=software)
+            gen_constraint(
+                ids,
+                structure,
+                *options,
+                software=software,
+                current_d=current_d,
+                native_scan=native_scan,
+            )
         )
 
     return constraints
 
 
+def get_current_coords(structure, ids):
+    """
+    Returns the current values of the coordinates of the constraints, evaluated
+    in one call. The value is None for invalid atom indices, which are reported
+    by the Constraint.
+    """
+    valid = [
+        i
+        for i, group in enumerate(ids)
+        if 2 <= len(group) <= 4
+        and max(group) <= len(structure)
+        and len(group) == len(set(group))
+    ]
+    values = [None] * len(ids)
+    for i, value in zip(valid, structure.get_coords([ids[i] for i in valid])):
+        values[i] = float(value)
+    return values
+
+
 def gen_constraint(
     ids,
     xyz_str,
@@ -552,6 +840,8 @@ def gen_constraint(
     nsteps_str=None,
     step_str=None,
     software="",
+    current_d=None,
+    native_scan=True,
 ):
     """
     Generate a constraint object from arrays of parameters.
@@ -626,4 +916,6 @@ def gen_constraint(
         ids=ids,
         xyz=xyz_str,
         software=software.lower(),
+        current_d=current_d,
+        native_scan=native_scan,
     )
@@ -1,6 +1,14 @@
-import periodictable
+import json
+import os
 from enum import Enum
 
+from ccinput.elements import (
+    ATOMIC_NUMBER,
+    ATOMIC_SYMBOL,
+    LOWERCASE_ATOMIC_SYMBOLS,
+    COVALENT_RADII,
+)
+
 
 class CalcType(Enum):
     UNDEFINED = 0
@@ -21,14 +29,61 @@ class CalcType(Enum):
     OPTFREQ = 20
 
 
-ATOMIC_NUMBER = {}
-ATOMIC_SYMBOL = {}
-LOWERCASE_ATOMIC_SYMBOLS = {}
+ELEMENTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "elements.py")
+
+
+def get_element_tables():
+    """
+    Returns ATOMIC_NUMBER, ATOMIC_SYMBOL, LOWERCASE_ATOMIC_SYMBOLS and
+    COVALENT_RADII (in Å, for the elements which have one) as derived from
+    periodictable.
+    """
+    import periodictable
+
+    atomic_number = {}
+    atomic_symbol = {}
+    lowercase_atomic_symbols = {}
+    covalent_radii = {}
+    for el in periodictable.elements:
+        atomic_number[el.symbol] = el.number
+        atomic_symbol[el.number] = el.symbol
+        lowercase_atomic_symbols[el.symbol.lower()] = el.symbol
+        if el.covalent_radius is not None:
+            covalent_radii[el.symbol] = el.covalent_radius
+    return atomic_number, atomic_symbol, lowercase_atomic_symbols, covalent_radii
+
+
+def write_element_tables(path=ELEMENTS_PATH):
+    """
+    Writes the snapshot of the element tables imported by this module, so that
+    periodictable is not needed at runtime.
+    """
+    import periodictable
+
+    tables = zip(
+        [
+            "ATOMIC_NUMBER",
+            "ATOMIC_SYMBOL",
+            "LOWERCASE_ATOMIC_SYMBOLS",
+            "COVALENT_RADII",
+        ],
+        get_element_tables(),
+    )
+
+    with open(path, "w") as out:
+        out.write(
+            '"""\n'
+            "Element tables derived from periodictable "
+            f"{periodictable.__version__}.\n\n"
+            "Generated by `python -m ccinput.constants`, do not edit.\n"
+            '"""\n'
+        )
+        for name, table in tables:
+            out.write(f"\n{name} = {{\n")
+            for key, value in table.items():
+                out.write(f"    {json.dumps(key)}: {json.dumps(value)},\n")
+            out.write("}\n")
 
-for el in periodictable.elements:
-    ATOMIC_NUMBER[el.symbol] = el.number
-    ATOMIC_SYMBOL[el.number] = el.symbol
-    LOWERCASE_ATOMIC_SYMBOLS[el.symbol.lower()] = el.symbol
 
 # Synonyms for each type of calculation
 # The first synonym will be used as detailed name in the documentation
@@ -335,7 +390,7 @@ SYN_SOLVENTS = {
     "nmethylaniline": [],
     "nmethylformamidemixture": [],
     "nndimethylacetamide": [],
-    "nndimethylformamide": ["dmf"],
+    "nndimethylformamide": [],
     "nnonane": [],
     "noctane": [],
     "npentadecane": [],
@@ -3207,3 +3262,8 @@ SOFTWARE_MULTIPLICITY = {
         8: "octet",
     }
 }
+
+
+if __name__ == "__main__":
+    write_element_tables()
+    print(f"Element tables written to {ELEMENTS_PATH}")
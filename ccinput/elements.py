@@ -0,0 +1,467 @@
+"""
+Element tables derived from periodictable 2.1.0.
+
+Generated by `python -m ccinput.constants`, do not edit.
+"""
+
+ATOMIC_NUMBER = {
+    "H": 1,
+    "He": 2,
+    "Li": 3,
+    "Be": 4,
+    "B": 5,
+    "C": 6,
+    "N": 7,
+    "O": 8,
+    "F": 9,
+    "Ne": 10,
+    "Na": 11,
+    "Mg": 12,
+    "Al": 13,
+    "Si": 14,
+    "P": 15,
+    "S": 16,
+    "Cl": 17,
+    "Ar": 18,
+    "K": 19,
+    "Ca": 20,
+    "Sc": 21,
+    "Ti": 22,
+    "V": 23,
+    "Cr": 24,
+    "Mn": 25,
+    "Fe": 26,
+    "Co": 27,
+    "Ni": 28,
+    "Cu": 29,
+    "Zn": 30,
+    "Ga": 31,
+    "Ge": 32,
+    "As": 33,
+    "Se": 34,
+    "Br": 35,
+    "Kr": 36,
+    "Rb": 37,
+    "Sr": 38,
+    "Y": 39,
+    "Zr": 40,
+    "Nb": 41,
+    "Mo": 42,
+    "Tc": 43,
+    "Ru": 44,
+    "Rh": 45,
+    "Pd": 46,
+    "Ag": 47,
+    "Cd": 48,
+    "In": 49,
+    "Sn": 50,
+    "Sb": 51,
+    "Te": 52,
+    "I": 53,
+    "Xe": 54,
+    "Cs": 55,
+    "Ba": 56,
+    "La": 57,
+    "Ce": 58,
+    "Pr": 59,
+    "Nd": 60,
+    "Pm": 61,
+    "Sm": 62,
+    "Eu": 63,
+    "Gd": 64,
+    "Tb": 65,
+    "Dy": 66,
+    "Ho": 67,
+    "Er": 68,
+    "Tm": 69,
+    "Yb": 70,
+    "Lu": 71,
+    "Hf": 72,
+    "Ta": 73,
+    "W": 74,
+    "Re": 75,
+    "Os": 76,
+    "Ir": 77,
+    "Pt": 78,
+    "Au": 79,
+    "Hg": 80,
+    "Tl": 81,
+    "Pb": 82,
+    "Bi": 83,
+    "Po": 84,
+    "At": 85,
+    "Rn": 86,
+    "Fr": 87,
+    "Ra": 88,
+    "Ac": 89,
+    "Th": 90,
+    "Pa": 91,
+    "U": 92,
+    "Np": 93,
+    "Pu": 94,
+    "Am": 95,
+    "Cm": 96,
+    "Bk": 97,
+    "Cf": 98,
+    "Es": 99,
+    "Fm": 100,
+    "Md": 101,
+    "No": 102,
+    "Lr": 103,
+    "Rf": 104,
+    "Db": 105,
+    "Sg": 106,
+    "Bh": 107,
+    "Hs": 108,
+    "Mt": 109,
+    "Ds": 110,
+    "Rg": 111,
+    "Cn": 112,
+    "Nh": 113,
+    "Fl": 114,
+    "Mc": 115,
+    "Lv": 116,
+    "Ts": 117,
+    "Og": 118,
+}
+
+ATOMIC_SYMBOL = {
+    1: "H",
+    2: "He",
+    3: "Li",
+    4: "Be",
+    5: "B",
+    6: "C",
+    7: "N",
+    8: "O",
+    9: "F",
+    10: "Ne",
+    11: "Na",
+    12: "Mg",
+    13: "Al",
+    14: "Si",
+    15: "P",
+    16: "S",
+    17: "Cl",
+    18: "Ar",
+    19: "K",
+    20: "Ca",
+    21: "Sc",
+    22: "Ti",
+    23: "V",
+    24: "Cr",
+    25: "Mn",
+    26: "Fe",
+    27: "Co",
+    28: "Ni",
+    29: "Cu",
+    30: "Zn",
+    31: "Ga",
+    32: "Ge",
+    33: "As",
+    34: "Se",
+    35: "Br",
+    36: "Kr",
+    37: "Rb",
+    38: "Sr",
+    39: "Y",
+    40: "Zr",
+    41: "Nb",
+    42: "Mo",
+    43: "Tc",
+    44: "Ru",
+    45: "Rh",
+    46: "Pd",
+    47: "Ag",
+    48: "Cd",
+    49: "In",
+    50: "Sn",
+    51: "Sb",
+    52: "Te",
+    53: "I",
+    54: "Xe",
+    55: "Cs",
+    56: "Ba",
+    57: "La",
+    58: "Ce",
+    59: "Pr",
+    60: "Nd",
+    61: "Pm",
+    62: "Sm",
+    63: "Eu",
+    64: "Gd",
+    65: "Tb",
+    66: "Dy",
+    67: "Ho",
+    68: "Er",
+    69: "Tm",
+    70: "Yb",
+    71: "Lu",
+    72: "Hf",
+    73: "Ta",
+    74: "W",
+    75: "Re",
+    76: "Os",
+    77: "Ir",
+    78: "Pt",
+    79: "Au",
+    80: "Hg",
+    81: "Tl",
+    82: "Pb",
+    83: "Bi",
+    84: "Po",
+    85: "At",
+    86: "Rn",
+    87: "Fr",
+    88: "Ra",
+    89: "Ac",
+    90: "Th",
+    91: "Pa",
+    92: "U",
+    93: "Np",
+    94: "Pu",
+    95: "Am",
+    96: "Cm",
+    97: "Bk",
+    98: "Cf",
+    99: "Es",
+    100: "Fm",
+    101: "Md",
+    102: "No",
+    103: "Lr",
+    104: "Rf",
+    105: "Db",
+    106: "Sg",
+    107: "Bh",
+    108: "Hs",
+    109: "Mt",
+    110: "Ds",
+    111: "Rg",
+    112: "Cn",
+    113: "Nh",
+    114: "Fl",
+    115: "Mc",
+    116: "Lv",
+    117: "Ts",
+    118: "Og",
+}
+
+LOWERCASE_ATOMIC_SYMBOLS = {
+    "h": "H",
+    "he": "He",
+    "li": "Li",
+    "be": "Be",
+    "b": "B",
+    "c": "C",
+    "n": "N",
+    "o": "O",
+    "f": "F",
+    "ne": "Ne",
+    "na": "Na",
+    "mg": "Mg",
+    "al": "Al",
+    "si": "Si",
+    "p": "P",
+    "s": "S",
+    "cl": "Cl",
+    "ar": "Ar",
+    "k": "K",
+    "ca": "Ca",
+    "sc": "Sc",
+    "ti": "Ti",
+    "v": "V",
+    "cr": "Cr",
+    "mn": "Mn",
+    "fe": "Fe",
+    "co": "Co",
+    "ni": "Ni",
+    "cu": "Cu",
+    "zn": "Zn",
+    "ga": "Ga",
+    "ge": "Ge",
+    "as": "As",
+    "se": "Se",
+    "br": "Br",
+    "kr": "Kr",
+    "rb": "Rb",
+    "sr": "Sr",
+    "y": "Y",
+    "zr": "Zr",
+    "nb": "Nb",
+    "mo": "Mo",
+    "tc": "Tc",
+    "ru": "Ru",
+    "rh": "Rh",
+    "pd": "Pd",
+    "ag": "Ag",
+    "cd": "Cd",
+    "in": "In",
+    "sn": "Sn",
+    "sb": "Sb",
+    "te": "Te",
+    "i": "I",
+    "xe": "Xe",
+    "cs": "Cs",
+    "ba": "Ba",
+    "la": "La",
+    "ce": "Ce",
+    "pr": "Pr",
+    "nd": "Nd",
+    "pm": "Pm",
+    "sm": "Sm",
+    "eu": "Eu",
+    "gd": "Gd",
+    "tb": "Tb",
+    "dy": "Dy",
+    "ho": "Ho",
+    "er": "Er",
+    "tm": "Tm",
+    "yb": "Yb",
+    "lu": "Lu",
+    "hf": "Hf",
+    "ta": "Ta",
+    "w": "W",
+    "re": "Re",
+    "os": "Os",
+    "ir": "Ir",
+    "pt": "Pt",
+    "au": "Au",
+    "hg": "Hg",
+    "tl": "Tl",
+    "pb": "Pb",
+    "bi": "Bi",
+    "po": "Po",
+    "at": "At",
+    "rn": "Rn",
+    "fr": "Fr",
+    "ra": "Ra",
+    "ac": "Ac",
+    "th": "Th",
+    "pa": "Pa",
+    "u": "U",
+    "np": "Np",
+    "pu": "Pu",
+    "am": "Am",
+    "cm": "Cm",
+    "bk": "Bk",
+    "cf": "Cf",
+    "es": "Es",
+    "fm": "Fm",
+    "md": "Md",
+    "no": "No",
+    "lr": "Lr",
+    "rf": "Rf",
+    "db": "Db",
+    "sg": "Sg",
+    "bh": "Bh",
+    "hs": "Hs",
+    "mt": "Mt",
+    "ds": "Ds",
+    "rg": "Rg",
+    "cn": "Cn",
+    "nh": "Nh",
+    "fl": "Fl",
+    "mc": "Mc",
+    "lv": "Lv",
+    "ts": "Ts",
+    "og": "Og",
+}
+
+COVALENT_RADII = {
+    "H": 0.31,
+    "He": 0.28,
+    "Li": 1.28,
+    "Be": 0.96,
+    "B": 0.84,
+    "C": 0.76,
+    "N": 0.71,
+    "O": 0.66,
+    "F": 0.57,
+    "Ne": 0.58,
+    "Na": 1.66,
+    "Mg": 1.41,
+    "Al": 1.21,
+    "Si": 1.11,
+    "P": 1.07,
+    "S": 1.05,
+    "Cl": 1.02,
+    "Ar": 1.06,
+    "K": 2.03,
+    "Ca": 1.76,
+    "Sc": 1.7,
+    "Ti": 1.6,
+    "V": 1.53,
+    "Cr": 1.39,
+    "Mn": 1.39,
+    "Fe": 1.32,
+    "Co": 1.26,
+    "Ni": 1.24,
+    "Cu": 1.32,
+    "Zn": 1.22,
+    "Ga": 1.22,
+    "Ge": 1.2,
+    "As": 1.19,
+    "Se": 1.2,
+    "Br": 1.2,
+    "Kr": 1.16,
+    "Rb": 2.2,
+    "Sr": 1.95,
+    "Y": 1.9,
+    "Zr": 1.75,
+    "Nb": 1.64,
+    "Mo": 1.54,
+    "Tc": 1.47,
+    "Ru": 1.46,
+    "Rh": 1.42,
+    "Pd": 1.39,
+    "Ag": 1.45,
+    "Cd": 1.44,
+    "In": 1.42,
+    "Sn": 1.39,
+    "Sb": 1.39,
+    "Te": 1.38,
+    "I": 1.39,
+    "Xe": 1.4,
+    "Cs": 2.44,
+    "Ba": 2.15,
+    "La": 2.07,
+    "Ce": 2.04,
+    "Pr": 2.03,
+    "Nd": 2.01,
+    "Pm": 1.99,
+    "Sm": 1.98,
+    "Eu": 1.98,
+    "Gd": 1.96,
+    "Tb": 1.94,
+    "Dy": 1.92,
+    "Ho": 1.92,
+    "Er": 1.89,
+    "Tm": 1.9,
+    "Yb": 1.87,
+    "Lu": 1.87,
+    "Hf": 1.75,
+    "Ta": 1.7,
+    "W": 1.62,
+    "Re": 1.51,
+    "Os": 1.44,
+    "Ir": 1.41,
+    "Pt": 1.36,
+    "Au": 1.36,
+    "Hg": 1.32,
+    "Tl": 1.45,
+    "Pb": 1.46,
+    "Bi": 1.48,
+    "Po": 1.4,
+    "At": 1.5,
+    "Rn": 1.5,
+    "Fr": 2.6,
+    "Ra": 2.21,
+    "Ac": 2.15,
+    "Th": 2.06,
+    "Pa": 2.0,
+    "U": 1.96,
+    "Np": 1.9,
+    "Pu": 1.87,
+    "Am": 1.8,
+    "Cm": 1.69,
+}
@@ -0,0 +1,288 @@
+"""
+Streaming readers for the molecule libraries in the SDF (MDL molfile V2000 and
+V3000) and Tripos MOL2 formats.
+
+The records are read one at a time, so the memory used does not depend on the
+size of the library. Each record gives the structure of the molecule and,
+when available, its formal charge and spin multiplicity.
+"""
+
+import os
+from collections import namedtuple
+
+from ccinput.calculation import Structure
+from ccinput.utilities import parse_xyz
+from ccinput.exceptions import InvalidParameter
+
+# Charge and multiplicity are None when the record does not specify them
+MoleculeRecord = namedtuple(
+    "MoleculeRecord", ["name", "structure", "charge", "multiplicity"]
+)
+
+# Charge codes of the atom block of V2000 molfiles
+SDF_CHARGE_CODES = {0: 0, 1: 3, 2: 2, 3: 1, 4: 0, 5: -1, 6: -2, 7: -3}
+
+# Unpaired electrons of the radical codes of molfiles (M  RAD, RAD=)
+SDF_RADICAL_ELECTRONS = {0: 0, 1: 0, 2: 1, 3: 2}
+
+# Data items giving the multiplicity of SDF records (case insensitive)
+SDF_MULTIPLICITY_TAGS = ["multiplicity", "spin_multiplicity", "mult"]
+
+
+def _get_record_multiplicity(radicals, tags):
+    for tag in SDF_MULTIPLICITY_TAGS:
+        if tag in tags:
+            try:
+                return int(tags[tag])
+            except ValueError:
+                raise InvalidParameter(f"Invalid multiplicity: '{tags[tag]}'")
+
+    if radicals:
+        return sum(SDF_RADICAL_ELECTRONS.get(r, 0) for r in radicals.values()) + 1
+    return None
+
+
+def _read_sdf_line(f, title):
+    line = f.readline()
+    if line == "":
+        raise InvalidParameter(f"Invalid SDF file: record '{title}' is incomplete")
+    return line.rstrip("\r\n")
+
+
+def _read_v2000_atoms(f, title, counts):
+    try:
+        num_atoms = int(counts[0:3])
+        num_bonds = int(counts[3:6])
+    except ValueError:
+        raise InvalidParameter(f"Invalid SDF counts line: '{counts.strip()}'")
+
+    lines = []
+    charges = {}
+    radicals = {}
+    for i in range(1, num_atoms + 1):
+        line = _read_sdf_line(f, title)
+        lines.append(f"{line[31:34]} {line[0:10]} {line[10:20]} {line[20:30]}")
+
+        code = line[36:39].strip()
+        if code not in ("", "0"):
+            try:
+                charges[i] = SDF_CHARGE_CODES[int(code)]
+            except (ValueError, KeyError):
+                raise InvalidParameter(f"Invalid SDF atom line: '{line}'")
+            if code == "4":  # Doublet radical
+                radicals[i] = 2
+
+    for i in range(num_bonds):
+        _read_sdf_line(f, title)
+
+    # The properties block replaces the charges and radicals of the atom block
+    properties = {}
+    while True:
+        line = _read_sdf_line(f, title)
+        if line.startswith("M  END"):
+            break
+        if line[:6] in ("M  CHG", "M  RAD"):
+            values = properties.setdefault(line[:6], {})
+            fields = line[6:].split()
+            try:
+                for atom, value in zip(fields[1::2], fields[2::2]):
+                    values[int(atom)] = int(value)
+            except ValueError:
+                raise InvalidParameter(f"Invalid SDF property line: '{line}'")
+
+    if properties:
+        charges = properties.get("M  CHG", {})
+        radicals = properties.get("M  RAD", {})
+    return lines, charges, radicals
+
+
+def _read_v3000_atoms(f, title):
+    """Reads the CTAB block of a V3000 molfile (only the atoms are parsed)"""
+
+    def read_v30_line():
+        line = _read_sdf_line(f, title)
+        # A trailing dash continues the line
+        while line.endswith("-"):
+            line = line[:-1] + _read_sdf_line(f, title)[7:]
+        return line[7:] if line.startswith("M  V30 ") else line
+
+    lines = []
+    charges = {}
+    radicals = {}
+    in_atoms = False
+    while True:
+        line = read_v30_line()
+        if line.startswith("M  END"):
+            break
+        elif line.startswith("BEGIN ATOM"):
+            in_atoms = True
+        elif line.startswith("END ATOM"):
+            in_atoms = False
+        elif in_atoms:
+            fields = line.split()
+            if len(fields) < 6:
+                raise InvalidParameter(f"Invalid SDF atom line: '{line}'")
+            lines.append(" ".join(fields[1:5]))
+
+            for field in fields[6:]:
+                key, sep, value = field.partition("=")
+                if key in ("CHG", "RAD"):
+                    try:
+                        value = int(value)
+                    except ValueError:
+                        raise InvalidParameter(f"Invalid SDF atom line: '{line}'")
+                    if key == "CHG":
+                        charges[int(fields[0])] = value
+                    else:
+                        radicals[int(fields[0])] = value
+    return lines, charges, radicals
+
+
+def iter_sdf_records(path):
+    """
+    Reads the records of an SDF file (or of a single molfile) one at a time.
+    Yields a MoleculeRecord for each molecule, with the formal charge given by
+    the connection table and the multiplicity given by a data item
+    (SDF_MULTIPLICITY_TAGS) or by the radicals of the connection table.
+    """
+    if not os.path.isfile(path):
+        raise InvalidParameter(f"Input file not found: {path}")
+
+    with open(path) as f:
+        while True:
+            title = f.readline()
+            if title == "":
+                return
+            title = title.strip()
+
+            header = [f.readline() for i in range(3)]
+            if header[-1] == "":
+                if title == "" and all(line.strip() == "" for line in header):
+                    return  # Trailing blank lines
+                raise InvalidParameter(
+                    f"Invalid SDF file: record '{title}' is incomplete"
+                )
+
+            counts = header[-1]
+            if "V3000" in counts:
+                lines, charges, radicals = _read_v3000_atoms(f, title)
+            else:
+                lines, charges, radicals = _read_v2000_atoms(f, title, counts)
+
+            # Data items until the end of the record
+            tags = {}
+            tag = None
+            while True:
+                line = f.readline()
+                if line == "" or line.startswith("$$$$"):
+                    break
+                if line.startswith(">"):
+                    start = line.find("<")
+                    end = line.find(">", start)
+                    tag = line[start + 1 : end].lower() if start != -1 else None
+                elif tag is not None and line.strip() != "":
+                    tags.setdefault(tag, line.strip())
+
+            if len(lines) == 0:
+                raise InvalidParameter(
+                    f"Invalid SDF file: record '{title}' has no atoms"
+                )
+
+            yield MoleculeRecord(
+                title,
+                Structure(*parse_xyz(lines)),
+                sum(charges.values()),
+                _get_record_multiplicity(radicals, tags),
+            )
+
+
+def iter_mol2_records(path):
+    """
+    Reads the molecules of a Tripos MOL2 file one at a time. Yields a
+    MoleculeRecord for each molecule. The formal charge is given by the charges
+    of the UNITY_ATOM_ATTR section or, if absent, by the sum of the partial
+    charges of the atoms. It is None if the molecule has neither, or if its
+    charge type is NO_CHARGES. MOL2 files do not specify the multiplicity.
+    """
+    if not os.path.isfile(path):
+        raise InvalidParameter(f"Input file not found: {path}")
+
+    def make_record(molecule):
+        name, lines, partial_charges, formal_charges, header = molecule
+        if len(lines) == 0:
+            raise InvalidParameter(f"Invalid MOL2 file: molecule '{name}' has no atoms")
+
+        # Counts, type of molecule and type of charges
+        charge_type = header[2].upper() if len(header) > 2 else ""
+        if formal_charges:
+            charge = sum(formal_charges)
+        elif charge_type == "NO_CHARGES" or len(partial_charges) != len(lines):
+            charge = None
+        else:
+            charge = round(sum(partial_charges))
+        return MoleculeRecord(name, Structure(*parse_xyz(lines)), charge, None)
+
+    molecule = None
+    with open(path) as f:
+        section = None
+        for line in f:
+            if line.startswith("@<TRIPOS>"):
+                section = line.strip()[9:]
+                if section == "MOLECULE":
+                    if molecule is not None:
+                        yield make_record(molecule)
+                    molecule = [f.readline().strip(), [], [], [], []]
+                continue
+
+            if line.strip() == "" or line.startswith("#") or molecule is None:
+                continue
+
+            if section == "MOLECULE":
+                molecule[4].append(line.strip())
+            elif section == "ATOM":
+                fields = line.split()
+                if len(fields) < 6:
+                    raise InvalidParameter(f"Invalid MOL2 atom line: '{line.strip()}'")
+                element = fields[5].split(".")[0]
+                molecule[1].append(" ".join([element] + fields[2:5]))
+                if len(fields) > 8:
+                    try:
+                        molecule[2].append(float(fields[8]))
+                    except ValueError:
+                        raise InvalidParameter(
+                            f"Invalid MOL2 atom line: '{line.strip()}'"
+                        )
+            elif section == "UNITY_ATOM_ATTR":
+                fields = line.split()
+                if len(fields) == 2 and fields[0] == "charge":
+                    try:
+                        molecule[3].append(int(fields[1]))
+                    except ValueError:
+                        raise InvalidParameter(
+                            f"Invalid MOL2 formal charge: '{line.strip()}'"
+                        )
+
+    if molecule is not None:
+        yield make_record(molecule)
+
+
+# Readers of the molecule files by extension
+MOLECULE_FILE_READERS = {
+    ".sdf": iter_sdf_records,
+    ".sd": iter_sdf_records,
+    ".mol": iter_sdf_records,
+    ".mol2": iter_mol2_records,
+}
+
+
+def is_molecule_file(path):
+    """Returns True if the file is a molecule library (SDF, MOL2) and not XYZ"""
+    return os.path.splitext(path)[1].lower() in MOLECULE_FILE_READERS
+
+
+def iter_molecule_records(path):
+    """Yields the MoleculeRecord of each molecule of an SDF or MOL2 file"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in MOLECULE_FILE_READERS:
+        raise InvalidParameter(f"Unknown molecule file format: '{ext}'")
+    return MOLECULE_FILE_READERS[ext](path)
@@ -1,23 +1,74 @@
-import basis_set_exchange
 import numpy as np
 
 from ccinput.utilities import (
     get_method,
     get_solvent,
     get_basis_set,
-    clean_xyz,
     get_distance,
     get_angle,
     get_dihedral,
-    get_npxyz,
+    get_fragments,
     check_fragments,
     add_fragments_xyz,
     parse_specifications,
 )
-from ccinput.constants import CalcType, ATOMIC_NUMBER, LOWERCASE_ATOMIC_SYMBOLS
+from ccinput.constants import (
+    CalcType,
+    ATOMIC_NUMBER,
+    ATOMIC_SYMBOL,
+    LOWERCASE_ATOMIC_SYMBOLS,
+)
+from ccinput.basis_sets import (
+    get_basis_elements,
+    basis_block_cache,
+    PACKAGE_BASIS_FORMATS,
+)
 from ccinput.exceptions import InvalidParameter, ImpossibleCalculation
 
 
+@basis_block_cache("gaussian")
+def get_gaussian_basis_blocks(bs_keyword, el_nums):
+    """
+    Returns the basis set and ECP blocks (empty if there is no ECP) of the
+    elements for the Gen/GenECP appendix, indexed by atomic number.
+    """
+    basis = get_basis_elements(bs_keyword, el_nums, **PACKAGE_BASIS_FORMATS["gaussian"])
+
+    blocks = {}
+    for el_num in el_nums:
+        if el_num in basis:
+            blocks[el_num] = split_gaussian_basis(basis[el_num])
+            continue
+
+        # Some basis sets are built-in, but use different names as the BSE does (e.g., SDD)
+        # In this case, just feed the user keyword in and hope it works.
+        # The basis set string has been recognized by ccinput, so it should exist in the program.
+        # ECP is added if Z > 18 (Ar)
+        el = ATOMIC_SYMBOL[el_num]
+        bs_gen = f"{el} 0\n{bs_keyword}\n****\n"
+        if el_num > 18:
+            blocks[el_num] = (bs_gen, f"{el} 0\n{bs_keyword}\n")
+        else:
+            blocks[el_num] = (bs_gen, "")
+    return blocks
+
+
+def split_gaussian_basis(bs):
+    """Splits a basis set in the Gaussian94 format into its basis set and ECP parts"""
+    if bs.find("-ECP") == -1:
+        return bs, ""
+
+    sbs = bs.split("\n")
+    ecp_ind = -1
+    for ind, line in enumerate(sbs):
+        if sbs[ind].find("-ECP") != -1:
+            ecp_ind = ind
+            break
+    bs_gen = "\n".join(sbs[: ecp_ind - 2]) + "\n"
+    bs_ecp = "\n".join(sbs[ecp_ind - 2 :])
+    return bs_gen, bs_ecp
+
+
 class GaussianCalculation:
     TEMPLATE = """%chk={}.chk
     %nproc={}
@@ -127,7 +178,6 @@ class GaussianCalculation:
         elif self.calc.type == CalcType.CONSTR_OPT:
             self.add_options("opt", ["modredundant"])
 
-            xyz = get_npxyz(self.calc.xyz)
             gaussian_constraints = ""
 
             has_scan = False
@@ -172,28 +222,39 @@ class GaussianCalculation:
             self.command_line += f"{method} "
         # Counterpoise related commands processing
         if "counterpoise" in self.commands.keys():
+            if self.calc.fragments is None:
+                self.calc.fragments = self.detect_fragments(
+                    self.commands["counterpoise"][0]
+                )
             check_fragments(
-                self.commands["counterpoise"][0], self.calc.fragments, self.calc.xyz
+                self.commands["counterpoise"][0],
+                self.calc.fragments,
+                self.calc.structure,
             )
 
+    def detect_fragments(self, counterpoise):
+        """Returns the fragments of the structure as detected from its bonds"""
+        fragments = get_fragments(
+            self.calc.structure.elements, self.calc.structure.coordinates
+        )
+        num_fragments = int(fragments.max())
+        if str(num_fragments) != str(counterpoise).strip():
+            raise InvalidParameter(
+                f"Found {num_fragments} fragment(s) in the structure, but "
+                f"counterpoise={counterpoise} was requested: specify the fragments explicitly"
+            )
+        return ",".join(str(i) for i in fragments)
+
     def parse_custom_basis_set(self, base_bs):
         custom_basis_sets = self.calc.parameters.custom_basis_sets
         to_append_gen = []
         to_append_ecp = []
 
-        unique_atoms = []
-        normal_atoms = []
-        for line in self.calc.xyz.split("\n"):
-            if line.strip() == "":
-                continue
-            a, *_ = line.split()
-            if a not in unique_atoms:
-                unique_atoms.append(a)
-                if a not in normal_atoms and a not in custom_basis_sets:
-                    normal_atoms.append(a)
+        unique_atoms = self.calc.structure.unique_elements
+        normal_atoms = [a for a in unique_atoms if a not in custom_basis_sets]
 
         custom_atoms = []
-        ecp = False
+        keyword_elements = {}
         for el, bs_keyword in custom_basis_sets.items():
             if el not in unique_atoms:
                 continue
@@ -205,36 +266,20 @@ class GaussianCalculation:
                 raise InvalidParameter(
                     f"Invalid atom in custom basis set string: '{el}'"
                 )
+            keyword_elements.setdefault(bs_keyword, []).append(el_num)
 
-            try:
-                bs = basis_set_exchange.get_basis(
-                    bs_keyword, fmt="gaussian94", elements=[el_num], header=False
-                )
-            except:
-                # Some basis sets are built-in, but use different names as the BSE does (e.g., SDD)
-                # In this case, just feed the user keyword in and hope it works.
-                # The basis set string has been recognized by ccinput, so it should exist in the program.
-                # ECP is added if Z > 18 (Ar)
-                to_append_gen.append(f"{el} 0\n{bs_keyword}\n****\n")
-                if el_num > 18:
-                    ecp = True
-                    to_append_ecp.append(f"{el} 0\n{bs_keyword}\n")
+        # Elements which use the same basis set are fetched together
+        blocks = {}
+        for bs_keyword, el_nums in keyword_elements.items():
+            blocks.update(get_gaussian_basis_blocks(bs_keyword, el_nums))
 
-            else:
-                if bs.find("-ECP") != -1:
-                    ecp = True
-                    sbs = bs.split("\n")
-                    ecp_ind = -1
-                    for ind, line in enumerate(sbs):
-                        if sbs[ind].find("-ECP") != -1:
-                            ecp_ind = ind
-                            break
-                    bs_gen = "\n".join(sbs[: ecp_ind - 2]) + "\n"
-                    bs_ecp = "\n".join(sbs[ecp_ind - 2 :])
-                    to_append_gen.append(bs_gen)
-                    to_append_ecp.append(bs_ecp)
-                else:
-                    to_append_gen.append(bs)
+        ecp = False
+        for el in custom_atoms:
+            bs_gen, bs_ecp = blocks[ATOMIC_NUMBER[el]]
+            to_append_gen.append(bs_gen)
+            if bs_ecp != "":
+                ecp = True
+                to_append_ecp.append(bs_ecp)
 
         if len(custom_atoms) > 0:
             if ecp:
@@ -257,7 +302,7 @@ class GaussianCalculation:
             return self.calc.parameters.basis_set, ""
 
     def handle_xyz(self):
-        lines = [i + "\n" for i in clean_xyz(self.calc.xyz).split("\n") if i != ""]
+        lines = self.calc.xyz.splitlines(keepends=True)
         # If counterpoise correction is the option, modify xyz corresponding to fragments
         if self.calc.fragments != None:
             lines = add_fragments_xyz(lines, self.calc.fragments)
@@ -1,11 +1,9 @@
 __author__ = "Zarko Ivkovic, zivkoviv7@alumnes.ub.edu"
-import basis_set_exchange
 import re
 
 from ccinput.utilities import (
     get_solvent,
     get_basis_set,
-    clean_xyz,
     warn,
     parse_specifications,
 )
@@ -15,6 +13,11 @@ from ccinput.constants import (
     LOWERCASE_ATOMIC_SYMBOLS,
     SOFTWARE_MULTIPLICITY,
 )
+from ccinput.basis_sets import (
+    get_basis_elements,
+    basis_block_cache,
+    PACKAGE_BASIS_FORMATS,
+)
 from ccinput.exceptions import (
     InvalidParameter,
     ImpossibleCalculation,
@@ -23,6 +26,33 @@ from ccinput.exceptions import (
 )
 
 
+@basis_block_cache("nwchem")
+def get_nwchem_basis_blocks(bs_keyword, el_nums):
+    """
+    Returns the content of the basis block and of the ECP block (None if
+    there is no ECP) for the elements, indexed by atomic number. The value is
+    None for the elements whose basis set is not available in the BSE.
+    """
+    basis = get_basis_elements(bs_keyword, el_nums, **PACKAGE_BASIS_FORMATS["nwchem"])
+
+    blocks = {}
+    for el_num in el_nums:
+        if el_num not in basis:
+            blocks[el_num] = None
+            continue
+
+        bs = basis[el_num]
+        matched_ECP = re.search(r"ECP\n(.*?)END", bs, re.DOTALL)
+        matched_bs = re.search(
+            r'BASIS "ao basis" SPHERICAL PRINT\n(.*?)END', bs, re.DOTALL
+        )
+        if matched_ECP != None:
+            blocks[el_num] = (matched_bs.group(1), matched_ECP.group(1))
+        else:
+            blocks[el_num] = (matched_bs.group(1), None)
+    return blocks
+
+
 class NWChemCalculation:
     TEMPLATE = """TITLE "{}"
     start {}
@@ -175,18 +205,11 @@ class NWChemCalculation:
         to_append_bs = []
         to_append_ecp = []
         not_recoginzed_bs = {}
-        unique_atoms = []
-        normal_atoms = []
-        for line in self.calc.xyz.split("\n"):
-            if line.strip() == "":
-                continue
-            a, *_ = line.split()
-            if a not in unique_atoms:
-                unique_atoms.append(a)
-                if a not in normal_atoms and a not in custom_basis_sets:
-                    normal_atoms.append(a)
+        unique_atoms = self.calc.structure.unique_elements
+        normal_atoms = [a for a in unique_atoms if a not in custom_basis_sets]
 
         custom_atoms = []
+        keyword_elements = {}
         for el, bs_keyword in custom_basis_sets.items():
             if el not in unique_atoms:
                 continue
@@ -198,18 +221,16 @@ class NWChemCalculation:
                 raise InvalidParameter(
                     f"Invalid atom in custom basis set string: '{el}'"
                 )
+            keyword_elements.setdefault(bs_keyword, []).append(el_num)
 
-            try:
-                bs = basis_set_exchange.get_basis(
-                    bs_keyword,
-                    fmt="nwchem",
-                    elements=[el_num],
-                    header=False,
-                    optimize_general=True,
-                    uncontract_general=True,
-                )
+        # Elements which use the same basis set are fetched together
+        blocks = {}
+        for bs_keyword, el_nums in keyword_elements.items():
+            blocks.update(get_nwchem_basis_blocks(bs_keyword, el_nums))
 
-            except:
+        for el in custom_atoms:
+            bs_keyword = custom_basis_sets[el]
+            if blocks[ATOMIC_NUMBER[el]] is None:
                 # Some basis sets are built-in, but use different names as the BSE does (e.g., SDD)
                 # In this case, just feed the user keyword in and hope it works.
                 # The basis set string has been recognized by ccinput, so it should exist in the program.
@@ -219,13 +240,10 @@ class NWChemCalculation:
                 )
                 not_recoginzed_bs[el] = bs_keyword
             else:
-                matched_ECP = re.search(r"ECP\n(.*?)END", bs, re.DOTALL)
-                matched_bs = re.search(
-                    r'BASIS "ao basis" SPHERICAL PRINT\n(.*?)END', bs, re.DOTALL
-                )
-                if matched_ECP != None:
-                    to_append_ecp.append(matched_ECP.group(1))
-                to_append_bs.append(matched_bs.group(1))
+                bs_block, ecp_block = blocks[ATOMIC_NUMBER[el]]
+                if ecp_block is not None:
+                    to_append_ecp.append(ecp_block)
+                to_append_bs.append(bs_block)
         if len(custom_atoms) > 0:
             custom_bs = "\n".join(to_append_bs)
             self.basis_set = f"basis spherical \n {custom_bs} \n "
@@ -358,8 +376,7 @@ class NWChemCalculation:
                     self.additional_block += constraint.to_nwchem()
 
     def handle_xyz(self):
-        lines = [i + "\n" for i in clean_xyz(self.calc.xyz).split("\n") if i != ""]
-        self.xyz_structure = "".join(lines)
+        self.xyz_structure = self.calc.xyz
 
     def handle_solvation(self):
         """Default radii used in nwchem are complex combination of different sources.
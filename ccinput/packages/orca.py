@@ -1,8 +1,7 @@
-import basis_set_exchange as bse
-
 from ccinput.constants import (
     CalcType,
     ATOMIC_NUMBER,
+    ATOMIC_SYMBOL,
     LOWERCASE_ATOMIC_SYMBOLS,
     SOFTWARE_BASIS_SETS,
 )
@@ -11,10 +10,18 @@ from ccinput.utilities import (
     get_basis_set,
     get_solvent,
     get_abs_basis_set,
-    clean_xyz,
     warn,
     parse_specifications,
 )
+from ccinput.basis_sets import (
+    get_basis,
+    get_basis_elements,
+    get_basis_info,
+    get_element_info,
+    get_family_ecp_name,
+    basis_block_cache,
+    PACKAGE_BASIS_FORMATS,
+)
 from ccinput.exceptions import (
     InvalidParameter,
     UnimplementedError,
@@ -22,6 +29,73 @@ from ccinput.exceptions import (
 )
 
 
+@basis_block_cache("orca")
+def get_orca_basis_blocks(bs_keyword, el_nums):
+    """
+    Returns the content of the basis block for the elements, as well as whether
+    the name of the ECP of a built-in basis set could not be found, indexed by
+    atomic number.
+    """
+    abs_keyword = get_abs_basis_set(bs_keyword)
+    blocks = {}
+    missing_ecp = []
+    if abs_keyword in SOFTWARE_BASIS_SETS["orca"]:
+        basis_info = get_basis_info(bs_keyword, el_nums)
+        for el_num in el_nums:
+            el = ATOMIC_SYMBOL[el_num]
+            if el_num in basis_info:
+                info = basis_info[el_num]
+            else:
+                # Raises the error from the BSE
+                info = get_element_info(get_basis(bs_keyword, el_num), el_num)
+
+            custom_bs = (
+                f'NewGTO {el} "{SOFTWARE_BASIS_SETS["orca"][abs_keyword]}" end\n'
+            )
+            if not info["has_ecp"]:
+                blocks[el_num] = (custom_bs, False)
+                continue
+
+            ecp_name = get_family_ecp_name(info["family"])
+            ecp_keyword = ""
+            if ecp_name is not None:
+                ecp_keyword = get_basis_set(ecp_name, "orca")
+            else:
+                missing_ecp.append(el_num)
+
+            if ecp_keyword:
+                custom_bs += f'NewECP {el} "{ecp_keyword}" end\n'
+                blocks[el_num] = (custom_bs, False)
+
+            # TODO: handle auxiliary basis sets
+
+    remaining = [el_num for el_num in el_nums if el_num not in blocks]
+    if len(remaining) == 0:
+        return blocks
+
+    basis = get_basis_elements(bs_keyword, remaining, **PACKAGE_BASIS_FORMATS["orca"])
+    for el_num in remaining:
+        el = ATOMIC_SYMBOL[el_num]
+        if el_num in basis:
+            bs = basis[el_num].strip()
+        else:
+            bs = get_basis(bs_keyword, el_num, **PACKAGE_BASIS_FORMATS["orca"]).strip()
+
+        sbs = bs.split("\n")
+        if bs.find("ECP") != -1:
+            clean_bs = "\n".join(sbs[3:]).strip() + "\n"
+            clean_bs = clean_bs.replace("\n$END", "$END").replace("$END", "end")
+            custom_bs = f"newgto {el}\n"
+            custom_bs += clean_bs.strip()
+        else:
+            clean_bs = "\n".join(sbs[3:-1]).strip() + "\n"
+            custom_bs = f"newgto {el}\n"
+            custom_bs += clean_bs.strip()
+            custom_bs += "end"
+        blocks[el_num] = (custom_bs, el_num in missing_ecp)
+    return blocks
+
+
 class OrcaCalculation:
     calc = None
 
@@ -148,16 +222,7 @@ class OrcaCalculation:
                 self.add_to_block("geom", ["Calc_Hess true"])
         elif self.calc.type == CalcType.MO:
             self.command_line = "SP "
-            struct = clean_xyz(self.calc.xyz)
-
-            electrons = 0
-            for line in struct.split("\n"):
-                if line.strip() == "":
-                    continue
-                el = line.split()[0]
-                electrons += ATOMIC_NUMBER[el]
-
-            electrons -= self.calc.charge
+            electrons = self.calc.structure.num_electrons - self.calc.charge
 
             if self.calc.multiplicity == 1:
                 n_HOMO = (electrons // 2) - 1
@@ -264,15 +329,10 @@ class OrcaCalculation:
         if len(self.calc.parameters.custom_basis_sets) == 0:
             return
 
-        unique_atoms = []
-        for line in self.calc.xyz.split("\n"):
-            if line.strip() == "":
-                continue
-            a, *_ = line.split()
-            if a not in unique_atoms:
-                unique_atoms.append(a)
+        unique_atoms = self.calc.structure.unique_elements
 
-        custom_bs = ""
+        custom_elements = []
+        keyword_elements = {}
         for el, bs_keyword in self.calc.parameters.custom_basis_sets.items():
             if el not in unique_atoms:
                 continue
@@ -282,58 +342,28 @@ class OrcaCalculation:
             except KeyError:
                 raise InvalidParameter("Invalid atom in custom basis set string")
 
-            abs_keyword = get_abs_basis_set(bs_keyword)
-            success = False
-            if abs_keyword in SOFTWARE_BASIS_SETS["orca"]:
-                _custom_bs = (
-                    f'NewGTO {el} "{SOFTWARE_BASIS_SETS["orca"][abs_keyword]}" end\n'
-                )
-                gbs = bse.get_basis(bs_keyword, elements=[el_num])
-                if "ecp_potentials" in gbs["elements"][str(el_num)]:
-                    # Search for the right ECP
-                    hits = bse.filter_basis_sets(family=gbs["family"], role="orbital")
-                    ecp_keyword = ""
-                    for name, hit in hits.items():
-                        if hit["function_types"] == ["scalar_ecp"]:
-                            ecp_keyword = get_basis_set(name, "orca")
-                            break
-                    else:
-                        warn(
-                            "Could not find the name of the ECP linked to {SOFTWARE_BASIS_SETS['orca'][abs_keyword]}, adding manually..."
-                        )
-
-                    if ecp_keyword:
-                        _custom_bs += f'NewECP {el} "{ecp_keyword}" end\n'
-                        success = True
-                else:
-                    success = True
+            custom_elements.append((el_num, bs_keyword))
+            keyword_elements.setdefault(bs_keyword, []).append(el_num)
 
-                # TODO: handle auxiliary basis sets
+        # Elements which use the same basis set are fetched together
+        blocks = {}
+        for bs_keyword, el_nums in keyword_elements.items():
+            blocks.update(get_orca_basis_blocks(bs_keyword, el_nums))
 
-            if success:
-                custom_bs += _custom_bs
-            else:
-                bs = bse.get_basis(
-                    bs_keyword, fmt="ORCA", elements=[el_num], header=False
-                ).strip()
-                sbs = bs.split("\n")
-                if bs.find("ECP") != -1:
-                    clean_bs = "\n".join(sbs[3:]).strip() + "\n"
-                    clean_bs = clean_bs.replace("\n$END", "$END").replace("$END", "end")
-                    custom_bs += f"newgto {el}\n"
-                    custom_bs += clean_bs.strip()
-                else:
-                    clean_bs = "\n".join(sbs[3:-1]).strip() + "\n"
-                    custom_bs += f"newgto {el}\n"
-                    custom_bs += clean_bs.strip()
-                    custom_bs += "end"
+        custom_bs = ""
+        for el_num, bs_keyword in custom_elements:
+            block, missing_ecp = blocks[el_num]
+            if missing_ecp:
+                warn(
+                    f"Could not find the name of the ECP linked to {bs_keyword}, adding manually..."
+                )
+            custom_bs += block
 
         if custom_bs != "":
             self.add_to_block("basis", custom_bs.split("\n"))
 
     def handle_xyz(self):
-        lines = [i + "\n" for i in clean_xyz(self.calc.xyz).split("\n") if i != ""]
-        self.xyz_structure = "".join(lines)
+        self.xyz_structure = self.calc.xyz
 
     def handle_pal_mem(self):
         if self.calc.parameters.theory_level == "semiempirical":
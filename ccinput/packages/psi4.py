@@ -1,11 +1,9 @@
-import basis_set_exchange
 import numpy as np
 
 from ccinput.utilities import (
     get_method,
     get_solvent,
     get_basis_set,
-    clean_xyz,
     get_distance,
     get_angle,
     get_dihedral,
@@ -267,8 +265,7 @@ molecule {{
         return memory_line
 
     def handle_xyz(self):
-        lines = [i + "\n" for i in clean_xyz(self.calc.xyz).split("\n") if i != ""]
-        self.xyz_structure = "".join(lines)
+        self.xyz_structure = self.calc.xyz
 
     def handle_solvation(self):
         return
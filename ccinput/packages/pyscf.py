@@ -7,7 +7,6 @@ from ccinput.constants import (
 from ccinput.utilities import (
     get_method,
     get_solvent,
-    clean_xyz,
     warn,
     parse_specifications,
 )
@@ -227,8 +226,7 @@ class PySCFCalculation:
             )
 
     def handle_xyz(self):
-        lines = [i + "\n" for i in clean_xyz(self.calc.xyz).split("\n") if i != ""]
-        self.xyz_structure = "".join(lines)
+        self.xyz_structure = self.calc.xyz
 
     def handle_pal_mem(self):
         self.pal = self.calc.nproc
@@ -7,7 +7,7 @@ from ccinput.constants import (
     LOWERCASE_ATOMIC_SYMBOLS,
     THEORY_LEVELS,
 )
-from ccinput.utilities import clean_xyz, get_basis_set, get_method, get_solvent
+from ccinput.utilities import get_basis_set, get_method, get_solvent
 from ccinput.exceptions import InvalidParameter
 
 _CALC_TYPE_TO_JOBTYPE = {
@@ -123,14 +123,13 @@ class QChemCalculation:
         if len(self.calc.parameters.custom_basis_sets) == 0:
             return
 
-        unique_atoms = _get_unique_atoms(self.calc.xyz)
+        unique_atoms = self.calc.structure.unique_elements
 
         for el, bs_keyword in self.calc.parameters.custom_basis_sets.items():
             pass
 
     def handle_xyz(self) -> None:
-        lines = [i + "\n" for i in clean_xyz(self.calc.xyz).split("\n") if i != ""]
-        self.xyz_structure = "".join(lines)
+        self.xyz_structure = self.calc.xyz
 
     def parse_custom_solvation_radii(self) -> None:
         for radius in self.calc.parameters.custom_solvation_radii.split(";"):
@@ -267,15 +266,4 @@ class QChemCalculation:
         return self.input_file
 
 
-def _get_unique_atoms(xyz: str) -> List[str]:
-    unique_atoms = []
-    for line in xyz.split("\n"):
-        if line.strip() == "":
-            continue
-        a, *_ = line.split()
-        if a not in unique_atoms:
-            unique_atoms.append(a)
-    return unique_atoms
-
-
 _ALLOWED_RADII_SETS = ("", "bondi", "ff", "read")
@@ -36,6 +36,7 @@ class XtbCalculation:
         self.force_constant = 1.0
         self.concerted_scan = False
         self.confirmed_specifications = ""
+        self.structure_file = ""
 
         if self.calc.type not in self.EXECUTABLES:
             raise ImpossibleCalculation(
@@ -52,6 +53,7 @@ class XtbCalculation:
         self.handle_parameters()
 
         self.create_command()
+        self.handle_structure_file()
 
     def get_output_name(self):
         if self.calc.file:
@@ -133,8 +135,6 @@ class XtbCalculation:
         if len(self.calc.constraints) == 0:
             raise InvalidParameter("No constraint in constrained optimisation mode")
 
-        num_atoms = len(self.calc.xyz.split("\n"))
-
         input_file_name = self.get_output_name()
 
         self.input_file += "$constrain\n"
@@ -147,7 +147,7 @@ class XtbCalculation:
 
         self.input_file += f"atoms: {compress_indices(constr_atoms)}\n"
 
-        mtd_atoms = list(range(1, num_atoms))
+        mtd_atoms = list(range(1, len(self.calc.structure) + 1))
         for a in constr_atoms:
             if int(a) in mtd_atoms:
                 mtd_atoms.remove(int(a))
@@ -331,6 +331,14 @@ class XtbCalculation:
         elif self.calc.type == CalcType.FREQ:
             self.main_command += "--hess "
 
+    def handle_structure_file(self):
+        # The frames and scan points are not files of their own: the structure
+        # read by the command must be written next to the input
+        if self.calc.kwargs.get("write_structure") and not self.calc.file:
+            self.structure_file = (
+                f"{len(self.calc.structure)}\n{self.calc.name}\n{self.calc.xyz}"
+            )
+
     def create_command(self):
         input_file_name = self.get_output_name()
 
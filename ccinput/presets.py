@@ -42,6 +42,19 @@ def save_preset(args, default_args):
         warn("Ignoring the input structure")
         del params["file"]
 
+    for key in [
+        "frames",
+        "frame_range",
+        "save_frame_index",
+        "scan_fanout",
+        "jobs",
+        "archive_stdout",
+        "socket",
+    ]:
+        if key in params:
+            warn(f"Ignoring the {key} option")
+            del params[key]
+
     if "output" in params:
         warn("Ignoring the output name")
         del params["output"]
@@ -0,0 +1,172 @@
+"""
+Fan-out of relaxed scans into independent constrained optimisations.
+
+Instead of one input scanning the coordinates, one input is generated for each
+point of the scan, with the scanned coordinates frozen at their value for this
+point. The points can then run in parallel, with any package which supports
+frozen coordinates. Multiple scans give one input per point of their grid.
+
+The geometry of each point is obtained by displacing the moving part of the
+structure: the atoms bonded to the last atom of the coordinate when the bond
+around which the coordinate changes is cut. The displacements of all the
+points are applied at once as arrays of translations and rotations.
+"""
+
+import itertools
+from collections import deque
+
+import numpy as np
+
+from ccinput.utilities import get_bonds, get_coords, warn
+
+# Packages whose scans have as many points as steps (including both ends),
+# instead of one more point than steps (e.g., Gaussian)
+SCAN_STEPS_AS_POINTS_SOFTWARE = ["orca", "xtb"]
+
+
+def get_scan_values(constraint, software=""):
+    """
+    Returns the values of the coordinate at each point of a scan constraint,
+    with as many points as the native scans of the package
+    """
+    if software in SCAN_STEPS_AS_POINTS_SOFTWARE:
+        num_points = constraint.num_steps
+    else:
+        num_points = constraint.num_steps + 1
+    return np.linspace(constraint.start_d, constraint.end_d, num_points)
+
+
+def get_moving_atoms(num_atoms, bonds, ids):
+    """
+    Returns the atoms (zero-indexed) moved when changing the coordinate between
+    the atoms (one-indexed): the atoms on the side of the last atom of the
+    bond "ids[-2]-ids[-1]" (distances and angles) or "ids[1]-ids[2]" (dihedral
+    angles). If the structure cannot be split this way (e.g., the atoms are
+    part of a ring), only the last atom is moved.
+    """
+    if len(ids) == 4:
+        tail, head = ids[1] - 1, ids[2] - 1
+        fixed = [ids[0] - 1, ids[1] - 1]
+    else:
+        tail, head = ids[-2] - 1, ids[-1] - 1
+        fixed = [i - 1 for i in ids[:-1]]
+
+    neighbours = [[] for i in range(num_atoms)]
+    for a, b in bonds:
+        neighbours[a].append(b)
+        neighbours[b].append(a)
+
+    moving = {head}
+    queue = deque([head])
+    while queue:
+        atom = queue.popleft()
+        for other in neighbours[atom]:
+            if other in moving or (atom == head and other == tail):
+                continue
+            moving.add(other)
+            queue.append(other)
+
+    if ids[-1] - 1 not in moving or any(atom in moving for atom in fixed):
+        warn(
+            f"The structure cannot be split around the coordinate {'-'.join(str(i) for i in ids)} "
+            f"(e.g., ring); only atom {ids[-1]} will be displaced"
+        )
+        return np.array([ids[-1] - 1])
+    return np.array(sorted(moving))
+
+
+def _normalize(vectors):
+    return vectors / np.linalg.norm(vectors, axis=-1)[..., np.newaxis]
+
+
+def _rotation_matrices(axes, angles):
+    """
+    Rotation matrices (p, k, 3, 3) of the angles (p, k) in degrees around the
+    axes (p, 3) (Rodrigues' formula)
+    """
+    x, y, z = axes[:, 0], axes[:, 1], axes[:, 2]
+    zero = np.zeros_like(x)
+    cross = np.stack(
+        [
+            np.stack([zero, -z, y], axis=-1),
+            np.stack([z, zero, -x], axis=-1),
+            np.stack([-y, x, zero], axis=-1),
+        ],
+        axis=-2,
+    )[:, np.newaxis]
+    angles = np.radians(angles)[..., np.newaxis, np.newaxis]
+    return (
+        np.eye(3)
+        + np.sin(angles) * cross
+        + (1 - np.cos(angles)) * np.matmul(cross, cross)
+    )
+
+
+def displace_coordinate(coordinates, ids, moving, values):
+    """
+    Sets the coordinate between the atoms (one-indexed) to each of the values
+    by displacing the moving atoms (see get_moving_atoms) of each geometry
+    (p, n, 3). Returns the displaced geometries (p * k, n, 3), ordered by
+    geometry then value.
+    """
+    num_geometries, num_atoms = coordinates.shape[:2]
+    values = np.asarray(values, dtype=float)
+
+    # Current values of the coordinate in all the geometries
+    current = get_coords(
+        coordinates.reshape(-1, 3),
+        [[i + g * num_atoms for i in ids] for g in range(num_geometries)],
+    )
+    deltas = values[np.newaxis, :] - current[:, np.newaxis]
+
+    atoms = coordinates[:, np.array(ids) - 1]
+    displaced = np.repeat(coordinates[:, np.newaxis], len(values), axis=1)
+    if len(ids) == 2:
+        direction = _normalize(atoms[:, 1] - atoms[:, 0])
+        displaced[:, :, moving] += (
+            deltas[:, :, np.newaxis, np.newaxis] * direction[:, np.newaxis, np.newaxis]
+        )
+    else:
+        if len(ids) == 3:
+            origin = atoms[:, 1]
+            axes = np.cross(atoms[:, 0] - atoms[:, 1], atoms[:, 2] - atoms[:, 1])
+
+            # Linear angles: any axis perpendicular to the moving bond
+            bond = atoms[:, 2] - atoms[:, 1]
+            linear = np.linalg.norm(axes, axis=1) < 1e-8 * np.linalg.norm(bond, axis=1)
+            if linear.any():
+                axes[linear] = np.cross(bond[linear], [1.0, 0.0, 0.0])
+                still_linear = linear & (np.linalg.norm(axes, axis=1) < 1e-8)
+                axes[still_linear] = np.cross(bond[still_linear], [0.0, 1.0, 0.0])
+        else:
+            # Positive rotations around c->b increase the dihedral angle (get_dihedral)
+            origin = atoms[:, 2]
+            axes = atoms[:, 1] - atoms[:, 2]
+
+        rotations = _rotation_matrices(_normalize(axes), deltas)
+        relative = coordinates[:, moving] - origin[:, np.newaxis]
+        displaced[:, :, moving] = (
+            np.einsum("pkij,pmj->pkmi", rotations, relative)
+            + origin[:, np.newaxis, np.newaxis]
+        )
+
+    return displaced.reshape(-1, num_atoms, 3)
+
+
+def gen_scan_points(structure, scans, software=""):
+    """
+    Returns the values of the scanned coordinates at each point of the grid of
+    the scan constraints, and the coordinates of the structure at each point
+    (p, n, 3). The points are ordered like itertools.product of the values of
+    each scan. The number of points of each scan follows the convention of the
+    package (see get_scan_values).
+    """
+    bonds = get_bonds(structure.elements, structure.coordinates)
+    scan_values = [get_scan_values(scan, software) for scan in scans]
+
+    coordinates = structure.coordinates[np.newaxis]
+    for scan, values in zip(scans, scan_values):
+        moving = get_moving_atoms(len(structure), bonds, scan.ids)
+        coordinates = displace_coordinate(coordinates, scan.ids, moving, values)
+
+    return list(itertools.product(*scan_values)), coordinates
@@ -0,0 +1,240 @@
+"""
+Generation server.
+
+"ccinput serve" keeps a process running with all the packages imported and all
+the caches filled, and generates inputs on request through a Unix domain
+socket. This avoids starting the interpreter and importing the modules for
+each input.
+
+The requests and responses are JSON objects, one per line. A request contains
+the same keyword arguments as gen_input, and optionally an "id" which is
+returned with the response:
+
+    {"id": 1, "software": "orca", "type": "sp", "method": "HF", "basis_set": "STO-3G", "xyz": "H 0 0 0\\nH 0 0 0.74"}
+
+The response contains the name of the calculation, the input, the command to
+run it (if any), the other files to write next to the input and the warnings:
+
+    {"id": 1, "name": "calc", "input": "...", "command": "", "files": {}, "warnings": []}
+
+If the input cannot be generated, the response contains the error and the
+name of its exception instead:
+
+    {"id": 1, "error": "...", "type": "InvalidParameter", "warnings": []}
+
+Each connection can send many requests, and the connections are handled
+concurrently.
+"""
+
+import io
+import os
+import sys
+import json
+import socket
+import tempfile
+import threading
+import socketserver
+from contextlib import contextmanager
+
+from ccinput import exceptions
+from ccinput.wrapper import SOFTWARE_CLASSES, gen_obj, get_companion_files
+from ccinput.exceptions import CCInputException, InvalidParameter, InternalError
+
+
+def get_default_socket_path():
+    """Returns the path of the socket used when none is specified"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"ccinput-{os.getuid()}.sock")
+
+
+class ThreadOutput(io.TextIOBase):
+    """
+    Standard output which can be captured separately by each thread, so that
+    the warnings of each request are returned with it
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is None:
+            return self.stream.write(text)
+        return buffer.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    @contextmanager
+    def capture(self):
+        self.local.buffer = io.StringIO()
+        try:
+            yield self.local.buffer
+        finally:
+            self.local.buffer = None
+
+
+def get_warnings(output):
+    """Returns the warnings printed by warn"""
+    warnings = []
+    for line in output.splitlines():
+        line = line.strip()
+        if line.startswith("*** ") and line.endswith(" ***"):
+            line = line[4:-4]
+        if line != "":
+            warnings.append(line)
+    return warnings
+
+
+def process_request(request):
+    """Returns the response (dictionary) to a request (JSON string)"""
+    try:
+        args = json.loads(request)
+    except ValueError as e:
+        return {"error": f"Invalid JSON request: {e}", "type": "InvalidParameter"}
+    if not isinstance(args, dict):
+        return {
+            "error": "The request must be a JSON object",
+            "type": "InvalidParameter",
+        }
+
+    request_id = args.pop("id", None)
+    try:
+        calc = gen_obj(**args)
+    except Exception as e:
+        # The server keeps running whatever the error
+        response = {"error": str(e), "type": type(e).__name__}
+    else:
+        response = {
+            "name": calc.calc.name,
+            "input": calc.input_file,
+            "command": getattr(calc, "command", "") or "",
+            "files": get_companion_files(calc),
+        }
+
+    if request_id is not None:
+        response["id"] = request_id
+    return response
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if line.strip() == b"":
+                continue
+
+            if isinstance(sys.stdout, ThreadOutput):
+                with sys.stdout.capture() as output:
+                    response = process_request(line)
+                response["warnings"] = get_warnings(output.getvalue())
+            else:
+                response = process_request(line)
+                response["warnings"] = []
+
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class GenerationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # Many clients can connect at once
+    request_queue_size = socket.SOMAXCONN
+
+
+def is_socket_in_use(path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def create_server(path=None):
+    """
+    Returns the server listening on the socket (get_default_socket_path by
+    default), with all the packages imported. Only the user can connect to
+    the socket.
+    """
+    path = path or get_default_socket_path()
+    if os.path.exists(path):
+        if is_socket_in_use(path):
+            raise InvalidParameter(f"A server is already listening on {path}")
+        # Left over by a server which did not stop properly
+        try:
+            os.unlink(path)
+        except OSError as e:
+            raise InvalidParameter(f"Cannot remove the existing socket {path}: {e}")
+
+    for name in SOFTWARE_CLASSES:
+        SOFTWARE_CLASSES[name]
+
+    # The socket is created without permissions for the other users
+    umask = os.umask(0o077)
+    try:
+        server = GenerationServer(path, RequestHandler)
+    finally:
+        os.umask(umask)
+    return server
+
+
+def serve(path=None):
+    """Generates inputs on request until interrupted"""
+    server = create_server(path)
+    stdout = sys.stdout
+    sys.stdout = ThreadOutput(stdout)
+    print(f"--- Listening on {server.server_address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sys.stdout = stdout
+        server.server_close()
+        os.unlink(server.server_address)
+
+
+class Client:
+    """Connection to a generation server, which can send many requests"""
+
+    def __init__(self, path=None, timeout=None):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # With a timeout, the connection fails instead of waiting when the
+        # server has not accepted the previous connections yet
+        self.socket.connect(path or get_default_socket_path())
+        self.socket.settimeout(timeout)
+        self.file = self.socket.makefile("rwb")
+
+    def request(self, **args):
+        """Sends the request and returns the response, including errors"""
+        self.file.write(json.dumps(args).encode("utf-8") + b"\n")
+        self.file.flush()
+        line = self.file.readline()
+        if line == b"":
+            raise InternalError("The server closed the connection")
+        return json.loads(line)
+
+    def generate(self, **args):
+        """
+        Returns the response to the request (see the module documentation), or
+        raises the exception of the error
+        """
+        response = self.request(**args)
+        if "error" in response:
+            exception = getattr(exceptions, response["type"], None)
+            if not (
+                isinstance(exception, type) and issubclass(exception, CCInputException)
+            ):
+                exception = InternalError
+            raise exception(response["error"])
+        return response
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from ccinput.basis_sets import (
+    BasisSetCache,
+    CACHE_ENV_VAR,
+    PACK_ENV_VAR,
+    get_basis_set_cache,
+    get_basis_set_pack,
+    set_basis_set_cache,
+    set_basis_set_pack,
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_basis_sets(tmp_path_factory):
+    """
+    Uses a temporary basis set cache and no pack, so that the tests do not
+    depend on (or modify) the data directory of the user
+    """
+    path = str(tmp_path_factory.mktemp("basis_sets") / "basis_sets.sqlite")
+    old_cache = get_basis_set_cache()
+    old_pack = get_basis_set_pack()
+    old_env = {var: os.environ.get(var) for var in [CACHE_ENV_VAR, PACK_ENV_VAR]}
+
+    # Also used by the subprocesses of the tests
+    os.environ[CACHE_ENV_VAR] = path
+    os.environ[PACK_ENV_VAR] = "0"
+    set_basis_set_cache(BasisSetCache(path))
+    set_basis_set_pack(None)
+    yield
+
+    set_basis_set_cache(old_cache)
+    set_basis_set_pack(old_pack)
+    for var, value in old_env.items():
+        if value is None:
+            del os.environ[var]
+        else:
+            os.environ[var] = value
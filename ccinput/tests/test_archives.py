@@ -0,0 +1,177 @@
+import io
+import os
+import tarfile
+import zipfile
+import tempfile
+from unittest import TestCase
+from mock import patch
+from contextlib import redirect_stdout
+from os import devnull
+
+from ccinput.archives import get_archive_format, ArchiveWriter
+from ccinput.wrapper import cmd
+
+STRUCTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "structures")
+
+
+def struct(name):
+    return os.path.join(STRUCTURES, name + ".xyz")
+
+
+def read_members(path):
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            return {name: archive.read(name).decode() for name in archive.namelist()}
+    with tarfile.open(path) as archive:
+        return {
+            member.name: archive.extractfile(member).read().decode()
+            for member in archive.getmembers()
+        }
+
+
+class ArchiveFormatTests(TestCase):
+    def test_formats(self):
+        self.assertEqual(get_archive_format("sp.inp.tar.gz"), ("gztar", "sp.inp"))
+        self.assertEqual(get_archive_format("sp.inp.TGZ"), ("gztar", "sp.inp"))
+        self.assertEqual(get_archive_format("calc_dir/sp.tar"), ("tar", "sp"))
+        self.assertEqual(get_archive_format(".com.zip"), ("zip", ".com"))
+
+    def test_not_archive(self):
+        self.assertIsNone(get_archive_format("sp.inp"))
+        self.assertIsNone(get_archive_format("tar.gz/sp.inp"))
+        self.assertIsNone(get_archive_format(""))
+
+
+class ArchiveWriterTests(TestCase):
+    def test_formats(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name, archive_format in [
+                ("a.tar", "tar"),
+                ("a.tar.gz", "gztar"),
+                ("a.zip", "zip"),
+            ]:
+                path = os.path.join(tmp_dir, name)
+                with ArchiveWriter(path, archive_format) as archive:
+                    archive.add("sp_1.inp", "! HF\n")
+                    archive.add("sp_2.inp", "! B3LYP Å\n")
+
+                self.assertEqual(
+                    read_members(path),
+                    {"sp_1.inp": "! HF\n", "sp_2.inp": "! B3LYP Å\n"},
+                )
+
+    def test_stream(self):
+        stream = io.BytesIO()
+        with ArchiveWriter(stream, "gztar") as archive:
+            archive.add("sp.inp", "! HF\n")
+
+        self.assertFalse(stream.closed)
+        stream.seek(0)
+        with tarfile.open(fileobj=stream) as archive:
+            self.assertEqual(archive.getnames(), ["sp.inp"])
+
+
+class ArchiveOutputTests(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+
+        cwd = os.getcwd()
+        os.chdir(self.tmp_dir)
+        self.addCleanup(os.chdir, cwd)
+
+    def run_cmd(self, cmd_line):
+        with open(devnull, "w") as gobble, redirect_stdout(gobble):
+            cmd(cmd_line=cmd_line)
+
+    def test_multiple_files(self):
+        self.run_cmd(
+            f"orca sp HF -bs Def2SVP -f {struct('ethanol')} {struct('CH4')} -o sp.inp.tar.gz"
+        )
+
+        self.assertEqual(os.listdir(self.tmp_dir), ["sp.inp.tar.gz"])
+        members = read_members("sp.inp.tar.gz")
+        self.assertEqual(list(members), ["sp_ethanol.inp", "sp_CH4.inp"])
+        self.assertIn("!SP HF Def2-SVP", members["sp_CH4.inp"])
+
+    def test_single_file(self):
+        self.run_cmd(
+            f"orca sp HF -bs Def2SVP -f {struct('ethanol')} -o my_calc.inp.zip"
+        )
+        self.assertEqual(list(read_members("my_calc.inp.zip")), ["my_calc.inp"])
+
+    def test_frames(self):
+        self.run_cmd(
+            f"orca sp HF -bs Def2SVP -f {struct('h2o_conformers')} --frames -o .inp.tar"
+        )
+        self.assertEqual(
+            list(read_members(".inp.tar")),
+            [
+                "h2o_conformers_1.inp",
+                "h2o_conformers_2.inp",
+                "h2o_conformers_3.inp",
+            ],
+        )
+
+    def test_companion_files(self):
+        self.run_cmd(
+            f"nwchem sp B3LYP -bs 3-21G -f {struct('I')} -c -1 -s chloroform -sm SMD -csr Cl=1.00 -o I.nw.tar.gz"
+        )
+
+        members = read_members("I.nw.tar.gz")
+        self.assertEqual(list(members), ["I.nw", "I_sol.parameters"])
+        self.assertEqual(members["I_sol.parameters"].strip(), "Cl 1.0")
+        self.assertEqual(os.listdir(self.tmp_dir), ["I.nw.tar.gz"])
+
+    def test_stdout(self):
+        stdout = io.TextIOWrapper(io.BytesIO())
+        stderr = io.StringIO()
+        with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
+            cmd(
+                cmd_line=f"orca sp HF -bs Def2SVP -f {struct('ethanol')} {struct('CH4')} -o sp.inp.zip --archive_stdout"
+            )
+
+        # Only the archive is written to the standard output
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+        stdout.buffer.seek(0)
+        with zipfile.ZipFile(stdout.buffer) as archive:
+            self.assertEqual(archive.namelist(), ["sp_ethanol.inp", "sp_CH4.inp"])
+        self.assertIn("Input file written to sp_CH4.inp", stderr.getvalue())
+
+    def test_stdout_xtb(self):
+        stdout = io.TextIOWrapper(io.BytesIO())
+        stderr = io.StringIO()
+        with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
+            cmd(
+                cmd_line=f"xtb sp gfn2-xtb -f {struct('ethanol')} -o x.zip --archive_stdout"
+            )
+
+        # The structure read by the command, but no empty input
+        stdout.buffer.seek(0)
+        with zipfile.ZipFile(stdout.buffer) as archive:
+            self.assertEqual(archive.namelist(), ["ethanol.xyz"])
+            with open(struct("ethanol")) as f:
+                self.assertEqual(archive.read("ethanol.xyz").decode(), f.read())
+        self.assertIn(
+            "written to ethanol.xyz in archive on standard output", stderr.getvalue()
+        )
+
+    def test_xtb_input(self):
+        self.run_cmd(
+            f"xtb constr_opt gfn2-xtb -f {struct('ethanol')} --freeze 1 2 -o input.tar"
+        )
+
+        members = read_members("input.tar")
+        self.assertEqual(list(members), ["input", "ethanol.xyz"])
+        self.assertIn("$constrain", members["input"])
+
+    def test_stdout_not_archive(self):
+        with self.assertRaises(SystemExit):
+            self.run_cmd(
+                f"orca sp HF -bs Def2SVP -f {struct('ethanol')} -o sp.inp --archive_stdout"
+            )
+
+    def test_no_name(self):
+        with self.assertRaises(SystemExit):
+            self.run_cmd(f"orca sp HF -bs Def2SVP -f {struct('ethanol')} -o .tar.gz")
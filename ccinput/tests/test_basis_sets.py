@@ -0,0 +1,463 @@
+import os
+import tempfile
+import basis_set_exchange
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from mock import patch
+
+from ccinput import basis_sets
+from ccinput.basis_sets import (
+    BasisSetCache,
+    BasisSetPack,
+    build_basis_set_pack,
+    get_basis_info,
+    get_family_ecp_name,
+    clear_family_ecp_index,
+    FAMILY_ECP_INDEX_KEY,
+    get_basis,
+    get_cache_key,
+    get_basis_elements,
+    get_default_basis_set_cache,
+    get_default_basis_set_pack,
+    fetch_basis_elements,
+    basis_block_cache_info,
+    clear_basis_block_caches,
+    BLOCK_CACHE_SIZE,
+)
+from ccinput.packages.gaussian import get_gaussian_basis_blocks
+from ccinput.packages.nwchem import get_nwchem_basis_blocks
+from ccinput.wrapper import gen_input
+
+STRUCTURE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "structures", "Ph2I_cation.xyz"
+)
+
+
+class BasisSetCacheTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite")
+        self.cache = BasisSetCache(self.path, version="1.0")
+        self.old_cache = basis_sets.get_basis_set_cache()
+        basis_sets._cache = self.cache
+
+    def tearDown(self):
+        self.cache.close()
+        basis_sets._cache = self.old_cache
+        self.tmpdir.cleanup()
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get("def2-svp|1|none|False|"))
+
+    def test_set_get(self):
+        self.cache.set("key", "content")
+        self.assertEqual(self.cache.get("key"), "content")
+        self.assertEqual(len(self.cache), 1)
+
+    def test_set_get_dict(self):
+        self.cache.set("key", {"family": "ahlrichs"})
+        self.assertEqual(self.cache.get("key"), {"family": "ahlrichs"})
+
+    def test_persistent(self):
+        self.cache.set("key", "content")
+        self.cache.close()
+
+        cache = BasisSetCache(self.path, version="1.0")
+        self.assertEqual(cache.get("key"), "content")
+        cache.close()
+
+    def test_version_change(self):
+        self.cache.set("key", "content")
+        self.cache.close()
+
+        cache = BasisSetCache(self.path, version="2.0")
+        self.assertIsNone(cache.get("key"))
+        cache.close()
+
+    def test_invalidate(self):
+        self.cache.set("key", "content")
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_eviction(self):
+        self.cache.max_size = 30
+        self.cache.set("key1", "a" * 10)
+        self.cache.set("key2", "b" * 10)
+        self.cache.get("key1")
+        self.cache.set("key3", "c" * 10)
+
+        # key2 is the least recently used
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get("key2"))
+        self.assertEqual(self.cache.get("key1"), "a" * 10)
+
+    def test_cache_key_options(self):
+        self.assertNotEqual(
+            get_cache_key("Def2-SVP", 1, fmt="nwchem"),
+            get_cache_key("Def2-SVP", 1, fmt="nwchem", optimize_general=True),
+        )
+
+    def test_cache_key_case(self):
+        self.assertEqual(
+            get_cache_key("Def2-SVP", 1, fmt="nwchem"),
+            get_cache_key("def2-svp", 1, fmt="NWChem"),
+        )
+
+    def test_get_basis_cached(self):
+        bs = get_basis("Def2-SVP", 53, fmt="gaussian94")
+        self.assertEqual(len(self.cache), 1)
+
+        with patch("basis_set_exchange.get_basis") as bse_get_basis:
+            self.assertEqual(get_basis("Def2-SVP", 53, fmt="gaussian94"), bs)
+            bse_get_basis.assert_not_called()
+
+    def test_get_basis_elements_single_call(self):
+        with patch(
+            "basis_set_exchange.get_basis", wraps=basis_set_exchange.get_basis
+        ) as bse_get_basis:
+            basis = get_basis_elements("Def2-TZVPD", [1, 6, 53], fmt="gaussian94")
+            self.assertEqual(bse_get_basis.call_count, 1)
+
+        self.assertEqual(len(self.cache), 3)
+        for el_num in [1, 6, 53]:
+            self.assertEqual(
+                basis[el_num],
+                basis_set_exchange.get_basis(
+                    "Def2-TZVPD", fmt="gaussian94", elements=[el_num], header=False
+                ),
+            )
+
+    def test_get_basis_elements_cached(self):
+        get_basis_elements("Def2-TZVPD", [1, 53], fmt="nwchem")
+        with patch(
+            "basis_set_exchange.get_basis", wraps=basis_set_exchange.get_basis
+        ) as bse_get_basis:
+            basis = get_basis_elements("Def2-TZVPD", [1, 6, 53], fmt="nwchem")
+            bse_get_basis.assert_called_once()
+            self.assertEqual(bse_get_basis.call_args[1]["elements"], [6])
+        self.assertEqual(len(basis), 3)
+
+    def test_get_basis_elements_dict(self):
+        basis = get_basis_elements("Def2-TZVPD", [6, 53])
+        self.assertEqual(list(basis[53]["elements"].keys()), ["53"])
+        self.assertIn("ecp_potentials", basis[53]["elements"]["53"])
+        self.assertNotIn("scalar_ecp", basis[6]["function_types"])
+
+    def test_get_basis_elements_missing(self):
+        basis = get_basis_elements("6-31G", [1, 53], fmt="gaussian94")
+        self.assertEqual(list(basis.keys()), [1])
+
+    def test_get_basis_elements_unknown(self):
+        self.assertEqual(get_basis_elements("SDD", [1, 53], fmt="gaussian94"), {})
+
+    def test_get_basis_elements_fallback(self):
+        # Without the private helpers of the BSE, the elements are fetched one by one
+        for fmt, header in [(None, False), ("gaussian94", False), ("nwchem", True)]:
+            ref = fetch_basis_elements("Def2-TZVPD", [1, 6, 53], fmt, header)
+            with patch(
+                "ccinput.basis_sets.get_bse_split_helpers", return_value=(None, None)
+            ), patch(
+                "basis_set_exchange.get_basis", wraps=basis_set_exchange.get_basis
+            ) as bse_get_basis:
+                basis = fetch_basis_elements("Def2-TZVPD", [1, 6, 53], fmt, header)
+            # One call for the elements, then one per element
+            self.assertEqual(bse_get_basis.call_count, 4)
+            self.assertEqual(list(basis), [1, 6, 53])
+            for element in basis:
+                if header:
+                    # The header contains the time of the request
+                    self.assertEqual(
+                        basis[element].splitlines()[-30:],
+                        ref[element].splitlines()[-30:],
+                    )
+                else:
+                    self.assertEqual(basis[element], ref[element])
+
+    def test_get_basis_no_cache(self):
+        basis_sets._cache = None
+        bs = get_basis("Def2-SVP", 53, fmt="gaussian94")
+        self.assertNotEqual(bs.find("-ECP"), -1)
+
+    def test_environment(self):
+        path = os.path.join(self.tmpdir.name, "other.sqlite")
+        with patch.dict(os.environ, {"CCINPUT_BASIS_CACHE": path}):
+            self.assertEqual(get_default_basis_set_cache().path, path)
+        with patch.dict(os.environ, {"CCINPUT_BASIS_CACHE": "0"}):
+            self.assertIsNone(get_default_basis_set_cache())
+        with patch.dict(os.environ, {"CCINPUT_BASIS_PACK": "0"}):
+            self.assertIsNone(get_default_basis_set_pack())
+
+    def test_unusable_path(self):
+        open(os.path.join(self.tmpdir.name, "file"), "w").close()
+        cache = BasisSetCache(
+            os.path.join(self.tmpdir.name, "file", "cache.sqlite"), version="1.0"
+        )
+        cache.set("key", "content")
+        self.assertIsNone(cache.get("key"))
+        self.assertFalse(cache.enabled)
+
+
+class FamilyEcpIndexTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = BasisSetCache(
+            os.path.join(self.tmpdir.name, "cache.sqlite"), version="1.0"
+        )
+        self.old_cache = basis_sets._cache
+        self.old_pack = basis_sets._pack
+        basis_sets._cache = self.cache
+        basis_sets._pack = None
+        clear_family_ecp_index()
+
+    def tearDown(self):
+        self.cache.close()
+        basis_sets._cache = self.old_cache
+        basis_sets._pack = self.old_pack
+        clear_family_ecp_index()
+        self.tmpdir.cleanup()
+
+    def test_family_ecp_name(self):
+        self.assertEqual(get_family_ecp_name("ahlrichs"), "def2-ecp")
+        self.assertEqual(get_family_ecp_name("lanl"), "lanl2dz ecp")
+
+    def test_no_ecp(self):
+        self.assertIsNone(get_family_ecp_name("pople"))
+
+    def test_same_as_filter(self):
+        hits = basis_set_exchange.filter_basis_sets(family="stuttgart", role="orbital")
+        for name, hit in hits.items():
+            if hit["function_types"] == ["scalar_ecp"]:
+                break
+        self.assertEqual(get_family_ecp_name("stuttgart"), name)
+
+    def test_built_once(self):
+        with patch(
+            "basis_set_exchange.get_metadata", wraps=basis_set_exchange.get_metadata
+        ) as get_metadata:
+            get_family_ecp_name("ahlrichs")
+            get_family_ecp_name("lanl")
+            get_metadata.assert_called_once()
+
+    def test_persistent(self):
+        get_family_ecp_name("ahlrichs")
+        self.assertIsNotNone(self.cache.get(FAMILY_ECP_INDEX_KEY))
+        clear_family_ecp_index()
+
+        with patch("basis_set_exchange.get_metadata") as get_metadata:
+            self.assertEqual(get_family_ecp_name("ahlrichs"), "def2-ecp")
+            get_metadata.assert_not_called()
+
+    def test_orca_no_filter(self):
+        with patch("basis_set_exchange.filter_basis_sets") as filter_basis_sets:
+            inp = gen_input(
+                software="orca",
+                type="sp",
+                method="B3LYP",
+                basis_set="6-31+G(d,p)",
+                custom_basis_sets="I=Def2-TZVPD;",
+                charge="+1",
+                file=STRUCTURE,
+            )
+            filter_basis_sets.assert_not_called()
+        self.assertIn('NewECP I "def2-ECP" end', inp)
+
+
+class BasisSetPackTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmpdir.name, "basis_sets.pack")
+        cls.num_packed = build_basis_set_pack(
+            cls.path, names=["Def2-TZVPD", "SDD", "6-31G"], software=["gaussian"]
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def setUp(self):
+        self.old_cache = basis_sets._cache
+        self.old_pack = basis_sets._pack
+        basis_sets._cache = None
+        self.pack = BasisSetPack(self.path)
+        basis_sets._pack = self.pack
+        clear_basis_block_caches()
+
+    def tearDown(self):
+        self.pack.close()
+        basis_sets._cache = self.old_cache
+        basis_sets._pack = self.old_pack
+        clear_basis_block_caches()
+
+    @patch("ccinput.basis_sets.warn")
+    def test_other_bse_version(self, warn_fn):
+        pack = BasisSetPack(self.path, version="0.0")
+        self.assertIsNone(pack.get(get_cache_key("Def2-TZVPD", 1, fmt="gaussian94")))
+        self.assertFalse(pack.enabled)
+        warn_fn.assert_called_once()
+
+    def test_num_packed(self):
+        # SDD is not in the BSE
+        self.assertEqual(self.num_packed, 2)
+
+    def test_names(self):
+        self.assertEqual(self.pack.names(), ["6-31g", "def2-tzvpd", "sdd"])
+
+    def test_unavailable(self):
+        self.assertTrue(self.pack.is_unavailable("SDD", 1))
+        self.assertTrue(self.pack.is_unavailable("6-31G", 53))
+        self.assertFalse(self.pack.is_unavailable("6-31G", 1))
+        self.assertFalse(self.pack.is_unavailable("Def2-SVP", 1))
+
+    def test_get_basis_elements_packed(self):
+        with patch("basis_set_exchange.get_basis") as bse_get_basis:
+            basis = get_basis_elements("Def2-TZVPD", [1, 53], fmt="gaussian94")
+            self.assertEqual(get_basis_elements("6-31G", [53], fmt="gaussian94"), {})
+            bse_get_basis.assert_not_called()
+
+        self.assertEqual(
+            basis[53],
+            basis_set_exchange.get_basis(
+                "Def2-TZVPD", fmt="gaussian94", elements=[53], header=False
+            ),
+        )
+
+    def test_family_ecp_index_packed(self):
+        clear_family_ecp_index()
+        with patch("basis_set_exchange.get_metadata") as get_metadata:
+            self.assertEqual(get_family_ecp_name("ahlrichs"), "def2-ecp")
+            get_metadata.assert_not_called()
+
+    def test_get_basis_info_packed(self):
+        with patch("basis_set_exchange.get_basis") as bse_get_basis:
+            info = get_basis_info("Def2-TZVPD", [6, 53])
+            bse_get_basis.assert_not_called()
+
+        self.assertEqual(info[53]["family"], "ahlrichs")
+        self.assertTrue(info[53]["has_ecp"])
+        self.assertFalse(info[6]["has_ecp"])
+
+    def test_not_packed(self):
+        bs = get_basis("Def2-SVP", 53, fmt="gaussian94")
+        self.assertNotEqual(bs.find("-ECP"), -1)
+
+    def test_missing_pack(self):
+        pack = BasisSetPack(os.path.join(self.tmpdir.name, "missing.pack"))
+        self.assertIsNone(pack.get(get_cache_key("Def2-TZVPD", 1, fmt="gaussian94")))
+        self.assertFalse(pack.is_unavailable("SDD", 1))
+        self.assertFalse(pack.enabled)
+
+    def test_same_input(self):
+        params = {
+            "software": "gaussian",
+            "type": "sp",
+            "method": "B3LYP",
+            "basis_set": "6-31G",
+            "custom_basis_sets": "I=Def2-TZVPD;H=SDD;",
+            "charge": "+1",
+            "file": STRUCTURE,
+        }
+        with patch("basis_set_exchange.get_basis") as bse_get_basis:
+            packed = gen_input(**params)
+            bse_get_basis.assert_not_called()
+
+        basis_sets._pack = None
+        clear_basis_block_caches()
+        self.assertEqual(gen_input(**params), packed)
+
+
+class BasisBlockCacheTests(TestCase):
+    def setUp(self):
+        clear_basis_block_caches()
+
+    def test_cache_info(self):
+        info = basis_block_cache_info()
+        self.assertIn("gaussian", info)
+        self.assertIn("orca", info)
+        self.assertIn("nwchem", info)
+
+    def test_gaussian_hits(self):
+        get_gaussian_basis_blocks("Def2-TZVPD", [53])
+        get_gaussian_basis_blocks("Def2-TZVPD", [53])
+        get_gaussian_basis_blocks("Def2-TZVPD", [79])
+
+        info = basis_block_cache_info()["gaussian"]
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 2)
+
+    def test_gaussian_blocks(self):
+        bs_gen, bs_ecp = get_gaussian_basis_blocks("Def2-TZVPD", [53])[53]
+        self.assertTrue(bs_gen.startswith("I     0"))
+        self.assertNotEqual(bs_ecp.find("I-ECP"), -1)
+
+    def test_gaussian_blocks_no_ecp(self):
+        bs_gen, bs_ecp = get_gaussian_basis_blocks("Def2-TZVPD", [6])[6]
+        self.assertEqual(bs_ecp, "")
+
+    def test_gaussian_blocks_builtin(self):
+        bs_gen, bs_ecp = get_gaussian_basis_blocks("SDD", [53])[53]
+        self.assertEqual(bs_gen, "I 0\nSDD\n****\n")
+        self.assertEqual(bs_ecp, "I 0\nSDD\n")
+
+    def test_partial_hits(self):
+        get_gaussian_basis_blocks("Def2-TZVPD", [53])
+        blocks = get_gaussian_basis_blocks("Def2-TZVPD", [1, 53, 6])
+
+        self.assertEqual(list(sorted(blocks.keys())), [1, 6, 53])
+        info = basis_block_cache_info()["gaussian"]
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 3)
+
+    def test_gaussian_blocks_partially_builtin(self):
+        # 6-31G is not defined for iodine in the BSE
+        blocks = get_gaussian_basis_blocks("6-31G", [1, 53])
+        self.assertTrue(blocks[1][0].startswith("H     0"))
+        self.assertEqual(blocks[53], ("I 0\n6-31G\n****\n", "I 0\n6-31G\n"))
+
+    def test_eviction(self):
+        get_nwchem_basis_blocks.maxsize = 2
+        try:
+            get_nwchem_basis_blocks("Def2-TZVPD", [1, 6, 53])
+            self.assertEqual(basis_block_cache_info()["nwchem"].currsize, 2)
+        finally:
+            get_nwchem_basis_blocks.maxsize = BLOCK_CACHE_SIZE
+
+    def test_clear(self):
+        get_nwchem_basis_blocks("Def2-TZVPD", [53])
+        clear_basis_block_caches()
+        self.assertEqual(basis_block_cache_info()["nwchem"].currsize, 0)
+
+    def test_batch_single_fetch(self):
+        params = {
+            "type": "sp",
+            "method": "B3LYP",
+            "basis_set": "6-31+G(d,p)",
+            "custom_basis_sets": "I=Def2-TZVPD;",
+            "charge": "+1",
+        }
+        for software in ("gaussian", "orca", "nwchem"):
+            for i in range(3):
+                gen_input(software=software, file=STRUCTURE, **params)
+
+        for software in ("gaussian", "orca", "nwchem"):
+            with patch(f"ccinput.packages.{software}.get_basis_elements") as get_basis:
+                gen_input(software=software, file=STRUCTURE, **params)
+                get_basis.assert_not_called()
+
+        info = basis_block_cache_info()
+        for software in ("gaussian", "orca", "nwchem"):
+            self.assertEqual(info[software].misses, 1)
+            self.assertEqual(info[software].hits, 3)
+
+    def test_threads(self):
+        def get_blocks(el_num):
+            return get_gaussian_basis_blocks("Def2-TZVPD", [el_num])[el_num]
+
+        ref = [get_blocks(el_num) for el_num in (1, 6, 53)]
+        clear_basis_block_caches()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(get_blocks, [1, 6, 53] * 10))
+
+        self.assertEqual(results, ref * 10)
+        self.assertEqual(basis_block_cache_info()["gaussian"].currsize, 3)
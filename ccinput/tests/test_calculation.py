@@ -1,11 +1,18 @@
 from unittest import TestCase
+from mock import patch
+
+import numpy as np
 
 from ccinput.calculation import (
     Calculation,
     Parameters,
     Constraint,
+    Structure,
     parse_scan_constraints,
+    parse_str_constraints,
+    verify_charge_mult_batch,
 )
+from ccinput.utilities import get_coord, get_coords
 from ccinput.constants import CalcType
 from ccinput.exceptions import InvalidParameter, ImpossibleCalculation
 
@@ -381,3 +388,132 @@ class ScanParsingTests(TestCase):
                 xyz_str=self.xyz,
                 software="orca",
             )
+
+
+class ConstraintGeometryTests(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.structure = Structure(["C"] * 12, rng.uniform(-3, 3, (12, 3)))
+
+    def test_same_values(self):
+        rng = np.random.default_rng(1)
+        ids = [list(rng.permutation(12)[:k] + 1) for k in [2, 3, 4] * 20]
+        values = get_coords(self.structure.coordinates, ids)
+        for group, value in zip(ids, values):
+            self.assertEqual(value, get_coord(self.structure, group))
+
+    def test_structure(self):
+        values = self.structure.get_coords([[1, 2], [1, 2, 3]])
+        self.assertEqual(
+            list(values),
+            [
+                self.structure.get_coord([1, 2]),
+                self.structure.get_coord([1, 2, 3]),
+            ],
+        )
+
+    def test_empty(self):
+        self.assertEqual(len(get_coords(self.structure.coordinates, [])), 0)
+
+    def test_invalid_number_of_atoms(self):
+        with self.assertRaises(InvalidParameter):
+            get_coords(self.structure.coordinates, [[1, 2, 3, 4, 5]])
+
+    def test_single_evaluation(self):
+        with patch("ccinput.calculation.get_coords", wraps=get_coords) as batch:
+            with patch("ccinput.calculation.get_coord") as single:
+                constraints = parse_str_constraints(
+                    "freeze/1_2;freeze/1_2_3;scan_auto_120_10/1_2_3_4;scan_1.5_2.0_5/5_6",
+                    self.structure,
+                    software="orca",
+                )
+        self.assertEqual(batch.call_count, 1)
+        single.assert_not_called()
+        self.assertEqual(constraints[2].start_d, self.structure.get_coord([1, 2, 3, 4]))
+        self.assertEqual(constraints[3].start_d, 1.5)
+
+    def test_scan_single_evaluation(self):
+        with patch("ccinput.calculation.get_coords", wraps=get_coords) as batch:
+            scans = parse_scan_constraints(
+                arr=[["1", "2"], ["3", "4", "5"]],
+                sfrom=[],
+                sto=[2.0, 90.0],
+                snsteps=[5, 5],
+                sstep=[],
+                xyz_str=self.structure,
+                software="orca",
+            )
+        self.assertEqual(batch.call_count, 1)
+        self.assertEqual(scans[1].start_d, self.structure.get_coord([3, 4, 5]))
+
+    def test_invalid_ids(self):
+        with self.assertRaises(InvalidParameter):
+            parse_str_constraints("freeze/1_2;freeze/1_13", self.structure, "orca")
+        with self.assertRaises(InvalidParameter):
+            parse_str_constraints("freeze/1_1", self.structure, "orca")
+
+
+class BatchChargeMultTests(TestCase):
+    def setUp(self):
+        self.params = Parameters("gaussian", method="am1")
+
+    def get_error(self, xyz, charge, multiplicity):
+        try:
+            Calculation(
+                xyz,
+                self.params,
+                CalcType.SP,
+                charge=charge,
+                multiplicity=multiplicity,
+                software="gaussian",
+            )
+        except (InvalidParameter, ImpossibleCalculation) as e:
+            return str(e)
+        return None
+
+    def test_same_as_calculation(self):
+        structures = ["Cl 0 0 0\n", "O 0 0 0\nH 1 0 0\nH 0 1 0\n", "H 0 0 0\n"]
+        values = [-2, -1, 0, 1, 1.5, 2, 2.00001, 3, 0.99999, np.nan]
+
+        cases = [(s, c, m) for s in structures for c in values for m in values]
+        valid, errors = verify_charge_mult_batch(
+            [Structure.from_xyz(s).atomic_numbers for s, c, m in cases],
+            [c for s, c, m in cases],
+            [m for s, c, m in cases],
+        )
+
+        for i, (xyz, charge, multiplicity) in enumerate(cases):
+            error = self.get_error(xyz, charge, multiplicity)
+            self.assertEqual(valid[i], error is None)
+            self.assertEqual(errors.get(i), error)
+
+    def test_strings(self):
+        valid, errors = verify_charge_mult_batch(
+            [[1], [1], [1], [1]], ["0", "1.0", "a", ""], ["2", "2", "2", "2"]
+        )
+        self.assertEqual(valid.tolist(), [True, False, False, False])
+        self.assertEqual(errors[1], "Invalid charge: '1.0'")
+
+    def test_structures(self):
+        structures = [Structure.from_xyz("Cl 0 0 0\n"), [17, 1]]
+        valid, errors = verify_charge_mult_batch(structures, [-1, 0], [1, 1])
+        self.assertEqual(valid.tolist(), [True, True])
+        self.assertEqual(errors, {})
+
+    def test_padded_array(self):
+        structures = np.array([[17, 0, 0], [8, 1, 1], [1, 0, 0]])
+        valid, errors = verify_charge_mult_batch(structures, [0, 0, 0], [2, 1, 1])
+        self.assertEqual(valid.tolist(), [True, True, False])
+
+    def test_infinite(self):
+        valid, errors = verify_charge_mult_batch([[1]], [np.inf], [2])
+        self.assertFalse(valid[0])
+        self.assertIn(0, errors)
+
+    def test_empty(self):
+        valid, errors = verify_charge_mult_batch([], [], [])
+        self.assertEqual(len(valid), 0)
+
+    def test_different_lengths(self):
+        with self.assertRaises(InvalidParameter):
+            verify_charge_mult_batch([[1], [1]], [0], [2])
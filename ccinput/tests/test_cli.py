@@ -1,11 +1,19 @@
+import io
 import shlex
 import os
 from mock import patch
 import tempfile
 import json
 
-from ccinput.calculation import Calculation, Parameters
-from ccinput.wrapper import gen_input, get_input_from_args, get_parser, cmd
+from ccinput.calculation import Calculation, Parameters, Structure
+from ccinput.wrapper import (
+    gen_input,
+    gen_obj,
+    get_input_from_args,
+    iter_input_from_args,
+    get_parser,
+    cmd,
+)
 from ccinput.tests.testing_utilities import InputTests
 from ccinput import presets
 
@@ -536,6 +544,15 @@ class ManualCliTests(InputTests):
         self.assertEqual(outputs[0], "ethanol.inp")
         self.assertEqual(outputs[1], "CH4.inp")
 
+    def test_multiple_files_output_dots(self):
+        cmd_line = f"orca sp HF -bs Def2SVP -f {self.struct('ethanol')} {self.struct('CH4')} -o sp.v2.inp -n 1 --mem 1G"
+
+        parser = get_parser()
+        args = parser.parse_args(shlex.split(cmd_line))
+
+        objs, outputs = get_input_from_args(args)
+        self.assertEqual(outputs, ["sp.v2_ethanol.inp", "sp.v2_CH4.inp"])
+
     def test_multiple_files_output_name_no_override(self):
         cmd_line = f"orca sp HF -bs Def2SVP -f {self.struct('ethanol')} {self.struct('CH4')} -o .inp -n 1 --mem 1G --name test"
 
@@ -776,6 +793,272 @@ class ManualCliTests(InputTests):
         line = f"gaussian sp HF -bs Def2SVP -f {self.struct('ethanol')} -n 1 --mem 1G"
         self.assertTrue(self.args_cmd_equivalent(args, line))
 
+    def test_frames(self):
+        cmd_line = f"orca sp HF -bs Def2SVP -f {self.struct('h2o_conformers')} --frames -n 1 --mem 1G"
+
+        parser = get_parser()
+        args = parser.parse_args(shlex.split(cmd_line))
+
+        objs, outputs = get_input_from_args(args)
+        self.assertEqual(len(objs), 3)
+        self.assertEqual(len(outputs), 0)
+        self.assertEqual(
+            [obj.calc.name for obj in objs],
+            ["h2o_conformers_1", "h2o_conformers_2", "h2o_conformers_3"],
+        )
+        self.assertIn("0.78500000", objs[2].input_file)
+
+    def test_frames_output(self):
+        cmd_line = f"orca sp HF -bs Def2SVP -f {self.struct('h2o_conformers')} {self.struct('CH4')} --frames -o calc_dir/sp.inp -n 1 --mem 1G"
+
+        parser = get_parser()
+        args = parser.parse_args(shlex.split(cmd_line))
+
+        objs, outputs = get_input_from_args(args)
+        self.assertEqual(len(objs), 4)
+        self.assertEqual(
+            outputs,
+            [
+                "calc_dir/sp_h2o_conformers_1.inp",
+                "calc_dir/sp_h2o_conformers_2.inp",
+                "calc_dir/sp_h2o_conformers_3.inp",
+                "calc_dir/sp_CH4_1.inp",
+            ],
+        )
+
+    def test_frames_name(self):
+        cmd_line = f"orca sp HF -bs Def2SVP -f {self.struct('h2o_conformers')} --frames -o .inp --name water -n 1 --mem 1G"
+
+        parser = get_parser()
+        args = parser.parse_args(shlex.split(cmd_line))
+
+        objs, outputs = get_input_from_args(args)
+        self.assertEqual(outputs, ["water_1.inp", "water_2.inp", "water_3.inp"])
+
+    def test_frame_range(self):
+        cmd_line = f"orca sp HF -bs Def2SVP -f {self.struct('h2o_conformers')} --frame_range 2-3 -o .inp -n 1 --mem 1G"
+
+        parser = get_parser()
+        args = parser.parse_args(shlex.split(cmd_line))
+
+        objs, outputs = get_input_from_args(args)
+        self.assertEqual(outputs, ["h2o_conformers_2.inp", "h2o_conformers_3.inp"])
+        self.assertIn("0.78500000", objs[1].input_file)
+
+    def test_sdf_library(self):
+        cmd_line = f"orca sp HF -bs Def2SVP -f {self.struct('library')[:-4]}.sdf --frames --record_charge -o .inp -n 1 --mem 1G"
+
+        parser = get_parser()
+        args = parser.parse_args(shlex.split(cmd_line))
+
+        objs, outputs = get_input_from_args(args)
+        self.assertEqual(len(objs), 6)
+        self.assertEqual(outputs[1], "library_2.inp")
+        self.assertIn("xyz 1 1", objs[1].input_file)
+        self.assertIn("xyz 0 3", objs[4].input_file)
+
+    def test_frames_equivalent(self):
+        cmd_line = (
+            f"orca sp HF -bs Def2SVP -f {self.struct('CH4')} --frames -n 1 --mem 1G"
+        )
+
+        parser = get_parser()
+        args = parser.parse_args(shlex.split(cmd_line))
+
+        objs, outputs = get_input_from_args(args)
+        ref = gen_input(
+            software="orca",
+            type="sp",
+            method="HF",
+            basis_set="Def2SVP",
+            file=self.struct("CH4"),
+            nproc=1,
+            mem="1G",
+        )
+        self.assertTrue(self.is_equivalent(ref, objs[0].input_file))
+
+    def test_scan_fanout(self):
+        cmd_line = f"orca constr_opt HF -bs Def2SVP -f {self.struct('ethanol')} --scan 5 8 --from 1.3 --to 1.5 --nsteps 3 --scan_fanout -o calc_dir/scan.inp -n 1 --mem 1G"
+
+        parser = get_parser()
+        args = parser.parse_args(shlex.split(cmd_line))
+
+        objs, outputs = get_input_from_args(args)
+        self.assertEqual(len(objs), 3)
+        self.assertEqual(
+            outputs,
+            [
+                "calc_dir/scan_ethanol_1.inp",
+                "calc_dir/scan_ethanol_2.inp",
+                "calc_dir/scan_ethanol_3.inp",
+            ],
+        )
+        for obj in objs:
+            self.assertIn("{ B 4 7 C }", obj.input_file)
+
+    def test_scan_fanout_xyz(self):
+        cmd_line = "nwchem constr_opt HF -bs STO-3G --xyz 'H 0 0 0\nH 0 0 0.74' --scan 1 2 --to 1.0 --nsteps 2 --scan_fanout -o .nw -n 1 --mem 1G"
+
+        parser = get_parser()
+        args = parser.parse_args(shlex.split(cmd_line))
+
+        objs, outputs = get_input_from_args(args)
+        self.assertEqual(outputs, ["calc_1.nw", "calc_2.nw", "calc_3.nw"])
+
+    def test_companion_file_directory(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, hide_cmd_output():
+            output = os.path.join(tmp_dir, "I.nw")
+            cmd(
+                cmd_line=f"nwchem sp B3LYP -bs 3-21G -f {self.struct('I')} -c -1 -s chloroform -sm SMD -csr Cl=1.00 -o {output}"
+            )
+            # The solvation parameters are written next to the input
+            self.assertEqual(sorted(os.listdir(tmp_dir)), ["I.nw", "I_sol.parameters"])
+
+    def test_xyz_xtb_no_structure(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, hide_cmd_output():
+            output = os.path.join(tmp_dir, "opt.inp")
+            cmd(cmd_line=f"xtb opt gfn2-xtb -x 'Cl 0 0 0' -c -1 -o {output}")
+            # Unlike frames and scan points, no structure file is written
+            self.assertEqual(os.listdir(tmp_dir), ["opt.inp"])
+
+    def test_scan_fanout_xtb_structures(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, hide_cmd_output():
+            output = os.path.join(tmp_dir, "out.inp")
+            cmd_line = f"xtb constr_opt gfn2-xtb -f {self.struct('ethanol')} --scan 5 8 --to 1.5 --nsteps 2 --scan_fanout -o {output}"
+            cmd(cmd_line=cmd_line)
+
+            # The structure of each point is written next to its input
+            self.assertEqual(
+                sorted(os.listdir(tmp_dir)),
+                [
+                    "ethanol_1.xyz",
+                    "ethanol_2.xyz",
+                    "out_ethanol_1.inp",
+                    "out_ethanol_2.inp",
+                ],
+            )
+            structure = Structure.from_file(os.path.join(tmp_dir, "ethanol_2.xyz"))
+            self.assertAlmostEqual(structure.get_coord([5, 8]), 1.5)
+
+    def get_calcs(self, cmd_line):
+        parser = get_parser()
+        args = parser.parse_args(shlex.split(cmd_line))
+        return get_input_from_args(args)
+
+    def test_jobs(self):
+        cmd_line = f"orca sp HF -bs Def2SVP -f {self.struct('ethanol')} {self.struct('CH4')} {self.struct('h2o')} -o test.inp -n 1 --mem 1G"
+
+        objs, outputs = self.get_calcs(cmd_line)
+        parallel_objs, parallel_outputs = self.get_calcs(cmd_line + " --jobs 2")
+
+        self.assertEqual(parallel_outputs, outputs)
+        self.assertEqual(
+            [obj.input_file for obj in parallel_objs],
+            [obj.input_file for obj in objs],
+        )
+
+    def test_jobs_frames(self):
+        cmd_line = f"orca sp HF -bs Def2SVP -f {self.struct('h2o_conformers')} {self.struct('CH4')} --frames -o calc_dir/sp.inp -n 1 --mem 1G -j 2"
+
+        objs, outputs = self.get_calcs(cmd_line)
+        self.assertEqual(len(objs), 4)
+        self.assertEqual(
+            outputs,
+            [
+                "calc_dir/sp_h2o_conformers_1.inp",
+                "calc_dir/sp_h2o_conformers_2.inp",
+                "calc_dir/sp_h2o_conformers_3.inp",
+                "calc_dir/sp_CH4_1.inp",
+            ],
+        )
+
+    def test_jobs_errors(self):
+        missing = self.struct("missing")
+        cmd_line = f"orca sp HF -bs Def2SVP -f {self.struct('ethanol')} {missing} {self.struct('CH4')} -o test.inp -n 1 --mem 1G -j 2"
+
+        report = io.StringIO()
+        with redirect_stdout(report):
+            objs, outputs = self.get_calcs(cmd_line)
+
+        # The other files are still generated
+        self.assertEqual(
+            [os.path.basename(outp) for outp in outputs],
+            ["test_ethanol.inp", "test_CH4.inp"],
+        )
+        self.assertEqual([obj.calc.name for obj in objs], ["ethanol", "CH4"])
+        self.assertIn(missing, report.getvalue())
+        self.assertIn("1 of 3 structures could not be processed", report.getvalue())
+
+    def test_serial_error(self):
+        cmd_line = f"orca sp HF -bs Def2SVP -f {self.struct('ethanol')} {self.struct('missing')} -n 1 --mem 1G"
+
+        with hide_cmd_output(), self.assertRaises(SystemExit):
+            self.get_calcs(cmd_line)
+
+    def test_streaming(self):
+        cmd_line = f"orca sp HF -bs Def2SVP -f {self.struct('ethanol')} {self.struct('CH4')} -o test.inp -n 1 --mem 1G"
+
+        parser = get_parser()
+        args = parser.parse_args(shlex.split(cmd_line))
+
+        with patch("ccinput.wrapper.gen_obj", wraps=gen_obj) as gen_obj_fn:
+            calcs = iter_input_from_args(args)
+            calc, output = next(calcs)
+            # The second structure is only processed when requested
+            self.assertEqual(gen_obj_fn.call_count, 1)
+            self.assertEqual(os.path.basename(output), "test_ethanol.inp")
+            self.assertEqual(len(list(calcs)), 1)
+
+    def test_streaming_partial_output(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, hide_cmd_output():
+            output = os.path.join(tmp_dir, "sp.inp")
+            cmd_line = f"orca sp HF -bs Def2SVP -f {self.struct('ethanol')} {self.struct('missing')} {self.struct('CH4')} -o {output} -n 1 --mem 1G"
+
+            with self.assertRaises(SystemExit):
+                cmd(cmd_line=cmd_line)
+
+            # The inputs generated before the error are written
+            self.assertEqual(os.listdir(tmp_dir), ["sp_ethanol.inp"])
+
+    def test_streaming_frames_output(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, hide_cmd_output():
+            output = os.path.join(tmp_dir, "sp.inp")
+            cmd_line = f"orca sp HF -bs Def2SVP -f {self.struct('h2o_conformers')} --frames -o {output} -n 1 --mem 1G"
+            cmd(cmd_line=cmd_line)
+
+            self.assertEqual(
+                sorted(os.listdir(tmp_dir)),
+                [
+                    "sp_h2o_conformers_1.inp",
+                    "sp_h2o_conformers_2.inp",
+                    "sp_h2o_conformers_3.inp",
+                ],
+            )
+
+    def test_frames_xtb_structures(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, hide_cmd_output():
+            output = os.path.join(tmp_dir, "opt.inp")
+            cmd_line = f"xtb constr_opt gfn2-xtb -f {self.struct('h2o_conformers')} --frame_range 2 --freeze 1 2 -o {output}"
+            cmd(cmd_line=cmd_line)
+
+            # The structure read by the xtb command is written next to the input
+            self.assertEqual(
+                sorted(os.listdir(tmp_dir)),
+                ["h2o_conformers_2.xyz", "opt_h2o_conformers_2.inp"],
+            )
+            with open(os.path.join(tmp_dir, "h2o_conformers_2.xyz")) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(lines[:2], ["3", "h2o_conformers_2"])
+            self.assertEqual(len(lines), 5)
+
+        objs, outputs = self.get_calcs(
+            f"xtb constr_opt gfn2-xtb -f {self.struct('h2o_conformers')} --frame_range 2 --freeze 1 2 -o opt.inp"
+        )
+        self.assertEqual(
+            objs[0].command,
+            "xtb h2o_conformers_2.xyz --opt tight --input opt_h2o_conformers_2.inp",
+        )
+
 
 class CliPresetTests(InputTests):
     def test_create_preset(self):
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+from ccinput.constants import (
+    ATOMIC_NUMBER,
+    ATOMIC_SYMBOL,
+    LOWERCASE_ATOMIC_SYMBOLS,
+    COVALENT_RADII,
+    get_element_tables,
+)
+
+
+class ElementTablesTests(TestCase):
+    def test_snapshot_up_to_date(self):
+        # If this fails, run `python -m ccinput.constants`
+        self.assertEqual(
+            (ATOMIC_NUMBER, ATOMIC_SYMBOL, LOWERCASE_ATOMIC_SYMBOLS, COVALENT_RADII),
+            get_element_tables(),
+        )
+
+    def test_tables(self):
+        self.assertEqual(ATOMIC_NUMBER["I"], 53)
+        self.assertEqual(ATOMIC_SYMBOL[53], "I")
+        self.assertEqual(LOWERCASE_ATOMIC_SYMBOLS["cl"], "Cl")
+        self.assertEqual(COVALENT_RADII["C"], 0.76)
+
+
+class ImportTests(TestCase):
+    def get_imported_modules(self, module):
+        out = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                f"import sys, {module}; print(' '.join(sys.modules))",
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout
+        return out.split()
+
+    def test_startup_imports(self):
+        modules = self.get_imported_modules("ccinput.wrapper")
+        self.assertNotIn("periodictable", modules)
+        self.assertNotIn("basis_set_exchange", modules)
@@ -3878,6 +3878,57 @@ class GaussianTests(InputTests):
 
         self.assertTrue(self.is_equivalent(REF, inp.input_file))
 
+    def test_sp_HF_CP_detected_fragments(self):
+        params = {
+            "nproc": 8,
+            "mem": "10000MB",
+            "type": "Single-Point Energy",
+            "file": "h2o_dimer.xyz",
+            "software": "Gaussian",
+            "method": "HF",
+            "basis_set": "3-21G",
+            "charge": "0",
+            "specifications": "counterpoise=2",
+        }
+
+        inp = self.generate_calculation(**params)
+
+        REF = """
+        %chk=h2o_dimer.chk
+        %nproc=8
+        %mem=10000MB
+        #p sp HF/3-21G counterpoise(2)
+
+        File created by ccinput
+
+        0 1
+        O(Fragment=1) -1.55100700 -0.11452000 0.00000000
+        H(Fragment=1) -1.93425900 0.76250300 0.00000000
+        H(Fragment=1) -0.59967700 0.04071200 0.00000000
+        O(Fragment=2) 1.35062500 0.11146900 0.00000000
+        H(Fragment=2) 1.68039800 -0.37374100 -0.75856100
+        H(Fragment=2) 1.68039800 -0.37374100 0.75856100
+
+        """
+
+        self.assertTrue(self.is_equivalent(REF, inp.input_file))
+
+    def test_sp_HF_CP_detected_wrong_num_frag(self):
+        params = {
+            "nproc": 8,
+            "mem": "10000MB",
+            "type": "Single-Point Energy",
+            "file": "ethanol.xyz",
+            "software": "Gaussian",
+            "method": "HF",
+            "basis_set": "3-21G",
+            "charge": "0",
+            "specifications": "counterpoise=2",
+        }
+
+        with self.assertRaises(InvalidParameter):
+            self.generate_calculation(**params)
+
     def test_sp_HF_CP_wrong_num_frag(self):
         params = {
             "nproc": 8,
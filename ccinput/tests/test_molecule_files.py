@@ -0,0 +1,187 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from ccinput.molecule_files import (
+    iter_sdf_records,
+    iter_mol2_records,
+    iter_molecule_records,
+    is_molecule_file,
+)
+from ccinput.wrapper import gen_obj, gen_frame_objs, set_record_charge
+from ccinput.exceptions import InvalidParameter, InvalidXYZ, ImpossibleCalculation
+
+STRUCTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "structures")
+SDF_LIBRARY = os.path.join(STRUCTURES, "library.sdf")
+MOL2_LIBRARY = os.path.join(STRUCTURES, "library.mol2")
+
+
+class SdfTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, content):
+        path = os.path.join(self.tmpdir.name, "library.sdf")
+        with open(path, "w") as out:
+            out.write(content)
+        return path
+
+    def test_records(self):
+        records = list(iter_sdf_records(SDF_LIBRARY))
+        self.assertEqual(
+            [r.name for r in records],
+            [
+                "methane",
+                "ammonium",
+                "methyl radical",
+                "hydroxide",
+                "oxygen",
+                "methyl cation",
+            ],
+        )
+
+    def test_structure(self):
+        record = next(iter_sdf_records(SDF_LIBRARY))
+        self.assertEqual(record.structure.elements, ["C", "H", "H", "H", "H"])
+        self.assertEqual(list(record.structure.coordinates[1]), [0.6291] * 3)
+
+    def test_charges(self):
+        charges = [r.charge for r in iter_sdf_records(SDF_LIBRARY)]
+        self.assertEqual(charges, [0, 1, 0, -1, 0, 1])
+
+    def test_multiplicities(self):
+        multiplicities = [r.multiplicity for r in iter_sdf_records(SDF_LIBRARY)]
+        self.assertEqual(multiplicities, [None, None, 2, None, 3, None])
+
+    def test_v3000(self):
+        record = list(iter_sdf_records(SDF_LIBRARY))[-1]
+        self.assertEqual(record.structure.elements, ["C", "H", "H", "H"])
+        self.assertEqual(record.structure.coordinates[2][1], 0.9344)
+
+    def test_streaming(self):
+        with open(SDF_LIBRARY) as f:
+            content = f.read()
+        path = self.write(content + "broken\n\n\n  1  0\n")
+
+        records = iter_sdf_records(path)
+        for i in range(6):
+            next(records)
+        with self.assertRaises(InvalidParameter):
+            next(records)
+
+    def test_invalid_element(self):
+        with open(SDF_LIBRARY) as f:
+            content = f.read().replace(" C   0", " Xx  0", 1)
+        with self.assertRaises(InvalidXYZ):
+            next(iter_sdf_records(self.write(content)))
+
+    def test_invalid_counts(self):
+        with self.assertRaises(InvalidParameter):
+            next(iter_sdf_records(self.write("title\n\n\nabc\n")))
+
+    def test_trailing_lines(self):
+        with open(SDF_LIBRARY) as f:
+            content = f.read()
+        records = list(iter_sdf_records(self.write(content + "\n\n")))
+        self.assertEqual(len(records), 6)
+
+
+class Mol2Tests(TestCase):
+    def test_records(self):
+        records = list(iter_mol2_records(MOL2_LIBRARY))
+        self.assertEqual([r.name for r in records], ["water", "ammonium", "hydroxide"])
+        self.assertEqual(records[0].structure.elements, ["O", "H", "H"])
+
+    def test_charges(self):
+        # No charges, formal charges and partial charges
+        charges = [r.charge for r in iter_mol2_records(MOL2_LIBRARY)]
+        self.assertEqual(charges, [None, 1, -1])
+
+    def test_no_charge_column(self):
+        with open(MOL2_LIBRARY) as f:
+            content = f.read()
+        # Hydroxide without the column of the partial charges
+        content = content.replace("OH          -1.1800", "OH").replace(
+            "OH           0.1800", "OH"
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "library.mol2")
+            with open(path, "w") as out:
+                out.write(content)
+            records = list(iter_mol2_records(path))
+        self.assertIsNone(records[2].charge)
+
+    def test_record_charge_unspecified(self):
+        # The given charge is kept for the molecules without charges
+        args = {"charge": 2}
+        set_record_charge(args, next(iter_mol2_records(MOL2_LIBRARY)))
+        self.assertEqual(args["charge"], 2)
+
+    def test_no_multiplicity(self):
+        for record in iter_mol2_records(MOL2_LIBRARY):
+            self.assertIsNone(record.multiplicity)
+
+
+class MoleculeFileTests(TestCase):
+    def test_is_molecule_file(self):
+        self.assertTrue(is_molecule_file("lib.sdf"))
+        self.assertTrue(is_molecule_file("lib.MOL2"))
+        self.assertFalse(is_molecule_file("lib.xyz"))
+
+    def test_unknown_format(self):
+        with self.assertRaises(InvalidParameter):
+            iter_molecule_records("lib.pdb")
+
+    def test_gen_obj(self):
+        calc = gen_obj(software="xtb", type="sp", method="gfn2-xtb", file=SDF_LIBRARY)
+        self.assertEqual(calc.calc.structure.elements, ["C", "H", "H", "H", "H"])
+        self.assertEqual(calc.calc.name, "library")
+
+    def test_gen_frame_objs(self):
+        calcs = gen_frame_objs(
+            software="xtb",
+            type="sp",
+            method="gfn2-xtb",
+            file=SDF_LIBRARY,
+            record_charge=True,
+        )
+        calcs = list(calcs)
+        self.assertEqual(len(calcs), 6)
+        self.assertEqual(calcs[0].calc.name, "library_1")
+        self.assertEqual(
+            [(c.calc.charge, c.calc.multiplicity) for c in calcs],
+            [(0, 1), (1, 1), (0, 2), (-1, 1), (0, 3), (1, 1)],
+        )
+
+    def test_gen_frame_objs_range(self):
+        calcs = gen_frame_objs(
+            software="xtb",
+            type="sp",
+            method="gfn2-xtb",
+            file=MOL2_LIBRARY,
+            frame_range="2-3",
+            record_charge=True,
+        )
+        self.assertEqual([c.calc.charge for c in calcs], [1, -1])
+
+    def test_without_record_charge(self):
+        with self.assertRaises(ImpossibleCalculation):
+            list(
+                gen_frame_objs(
+                    software="xtb", type="sp", method="gfn2-xtb", file=SDF_LIBRARY
+                )
+            )
+
+    def test_record_charge_parse_name(self):
+        with self.assertRaises(InvalidParameter):
+            gen_obj(
+                software="xtb",
+                type="sp",
+                method="gfn2-xtb",
+                file=SDF_LIBRARY,
+                record_charge=True,
+                parse_name=True,
+            )
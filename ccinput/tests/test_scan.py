@@ -0,0 +1,238 @@
+import os
+import tempfile
+from unittest import TestCase
+from mock import patch
+
+import numpy as np
+
+from ccinput.calculation import Structure, parse_str_constraints
+from ccinput.scan import (
+    get_scan_values,
+    get_moving_atoms,
+    displace_coordinate,
+    gen_scan_points,
+)
+from ccinput.utilities import get_bonds
+from ccinput.wrapper import gen_scan_objs
+from ccinput.exceptions import InvalidParameter, UnimplementedError
+
+STRUCTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "structures")
+
+
+class ScanGeometryTests(TestCase):
+    def setUp(self):
+        self.structure = Structure.from_file(os.path.join(STRUCTURES, "ethanol.xyz"))
+        self.bonds = get_bonds(self.structure.elements, self.structure.coordinates)
+
+    def scans(self, constraints):
+        return parse_str_constraints(constraints, self.structure, software="orca")
+
+    def test_bonds(self):
+        self.assertEqual(
+            self.bonds.tolist(),
+            [[0, 1], [0, 2], [0, 3], [0, 4], [4, 5], [4, 6], [4, 7], [7, 8]],
+        )
+
+    def test_scan_values(self):
+        scan = self.scans("scan_1.3_1.6_3/5_8")[0]
+        self.assertTrue(np.allclose(get_scan_values(scan), [1.3, 1.4, 1.5, 1.6]))
+
+    def test_moving_atoms(self):
+        self.assertEqual(get_moving_atoms(9, self.bonds, [5, 8]).tolist(), [7, 8])
+        self.assertEqual(
+            get_moving_atoms(9, self.bonds, [8, 5]).tolist(), [0, 1, 2, 3, 4, 5, 6]
+        )
+        self.assertEqual(get_moving_atoms(9, self.bonds, [1, 5, 8]).tolist(), [7, 8])
+        self.assertEqual(
+            get_moving_atoms(9, self.bonds, [4, 1, 5, 8]).tolist(), [4, 5, 6, 7, 8]
+        )
+
+    @patch("ccinput.scan.warn")
+    def test_moving_atoms_ring(self, warn_fn):
+        # The bond 8-9 is closed into a ring with atom 1
+        bonds = np.concatenate([self.bonds, [[0, 8]]])
+        self.assertEqual(get_moving_atoms(9, bonds, [5, 8]).tolist(), [7])
+        warn_fn.assert_called_once()
+
+    @patch("ccinput.scan.warn")
+    def test_moving_atoms_not_bonded(self, warn_fn):
+        # Hydrogens 2 and 3 are not bonded
+        self.assertEqual(get_moving_atoms(9, self.bonds, [1, 2, 3]).tolist(), [2])
+
+    def test_displacements(self):
+        for constraint in [
+            "scan_1.3_1.6_3/5_8",
+            "scan_100_120_2/1_5_8",
+            "scan_-60_60_4/1_5_8_9",
+            "scan_170_-170_2/4_1_5_8",
+        ]:
+            scan = self.scans(constraint)[0]
+            values, coordinates = gen_scan_points(self.structure, [scan])
+            for (value,), point in zip(values, coordinates):
+                structure = Structure(self.structure.elements, point)
+                self.assertAlmostEqual(structure.get_coord(scan.ids), value)
+
+    def test_rigid_displacement(self):
+        # The distances within the moving and fixed parts are unchanged
+        scan = self.scans("scan_-60_60_4/4_1_5_8")[0]
+        values, coordinates = gen_scan_points(self.structure, [scan])
+        ref = self.structure.coordinates
+        moving = [4, 5, 6, 7, 8]
+        for point in coordinates:
+            for part in [moving, [0, 1, 2, 3]]:
+                d = np.linalg.norm(point[part][:, None] - point[part][None], axis=2)
+                d_ref = np.linalg.norm(ref[part][:, None] - ref[part][None], axis=2)
+                self.assertTrue(np.allclose(d, d_ref))
+
+    def test_linear_angle(self):
+        structure = Structure.from_xyz("O 0 0 -1.16\nC 0 0 0\nO 0 0 1.16")
+        scans = parse_str_constraints("scan_180_120_2/1_2_3", structure, "orca")
+        values, coordinates = gen_scan_points(structure, scans)
+        for (value,), point in zip(values, coordinates):
+            self.assertAlmostEqual(
+                Structure(structure.elements, point).get_coord([1, 2, 3]), value
+            )
+
+    def test_grid(self):
+        scans = self.scans("scan_1.3_1.5_2/5_8;scan_100_120_1/1_5_8")
+        values, coordinates = gen_scan_points(self.structure, scans)
+        self.assertEqual(len(values), 6)
+        self.assertEqual(coordinates.shape, (6, 9, 3))
+        for value, point in zip(values, coordinates):
+            structure = Structure(self.structure.elements, point)
+            self.assertAlmostEqual(structure.get_coord([5, 8]), value[0])
+            self.assertAlmostEqual(structure.get_coord([1, 5, 8]), value[1])
+
+    def test_displace_batch(self):
+        scan = self.scans("scan_1.3_1.6_1/5_8")[0]
+        coordinates = np.stack([self.structure.coordinates] * 2)
+        displaced = displace_coordinate(coordinates, [5, 8], [7, 8], [1.3, 1.6])
+        self.assertEqual(displaced.shape, (4, 9, 3))
+        self.assertTrue(np.allclose(displaced[0], displaced[2]))
+
+
+class ScanFanoutTests(TestCase):
+    def setUp(self):
+        self.file = os.path.join(STRUCTURES, "ethanol.xyz")
+
+    def gen(self, **kwargs):
+        args = {
+            "software": "orca",
+            "type": "constr_opt",
+            "method": "HF",
+            "basis_set": "STO-3G",
+            "file": self.file,
+        }
+        args.update(kwargs)
+        return list(gen_scan_objs(**args))
+
+    def test_points(self):
+        calcs = self.gen(scan=[[5, 8]], sfrom=[1.3], sto=[1.5], snsteps=[3])
+        self.assertEqual(len(calcs), 3)
+        self.assertEqual(
+            [c.calc.name for c in calcs], ["ethanol_1", "ethanol_2", "ethanol_3"]
+        )
+        for calc, value in zip(calcs, [1.3, 1.4, 1.5]):
+            self.assertAlmostEqual(calc.calc.structure.get_coord([5, 8]), value)
+            self.assertEqual(len(calc.calc.constraints), 1)
+            self.assertFalse(calc.calc.constraints[0].scan)
+
+    def test_constraint_string(self):
+        calcs = self.gen(constraints="freeze/1_5;scan_100_120_3/1_5_8;", name="angle")
+        self.assertEqual(calcs[2].calc.name, "angle_3")
+        self.assertEqual(
+            [c.ids for c in calcs[0].calc.constraints], [[1, 5], [1, 5, 8]]
+        )
+        self.assertIn("{ A 0 4 7 C }", calcs[0].input_file)
+
+    def test_freeze_kept(self):
+        calcs = self.gen(freeze=[[1, 2, 3]], scan=[[5, 8]], sto=[1.5], snsteps=[1])
+        self.assertEqual(
+            [c.ids for c in calcs[0].calc.constraints], [[1, 2, 3], [5, 8]]
+        )
+
+    def test_nwchem(self):
+        # NWChem does not support native scans
+        calcs = self.gen(software="nwchem", constraints="scan_1.3_1.5_2/5_8")
+        self.assertIn("bond 5 8 constant", calcs[1].input_file)
+
+    @patch("ccinput.calculation.warn")
+    def test_gaussian_start(self, warn_fn):
+        # Unlike the native Gaussian scans, the points start from the given value
+        calcs = self.gen(
+            software="gaussian", scan=[[4, 1, 5, 8]], sfrom=[-90], sto=[90], snsteps=[2]
+        )
+        for calc, value in zip(calcs, [-90, 0, 90]):
+            self.assertAlmostEqual(calc.calc.structure.get_coord([4, 1, 5, 8]), value)
+        self.assertIn("D 4 1 5 8 F", calcs[0].input_file)
+        warn_fn.assert_not_called()
+
+    def test_number_of_points(self):
+        # Same number of points as the native scans of each package
+        for software, num_points in [("orca", 4), ("xtb", 4), ("gaussian", 5)]:
+            calcs = self.gen(
+                software=software,
+                method="gfn2-xtb" if software == "xtb" else "HF",
+                basis_set="" if software == "xtb" else "STO-3G",
+                scan=[[5, 8]],
+                sto=[1.7],
+                snsteps=[4],
+            )
+            self.assertEqual(len(calcs), num_points)
+            self.assertAlmostEqual(calcs[-1].calc.structure.get_coord([5, 8]), 1.7)
+
+    def test_pyscf(self):
+        with self.assertRaises(UnimplementedError):
+            self.gen(software="pyscf", scan=[[5, 8]], sto=[1.5], snsteps=[1])
+
+    def test_xtb_output(self):
+        calcs = self.gen(
+            software="xtb",
+            method="gfn2-xtb",
+            basis_set="",
+            scan=[[5, 8]],
+            sto=[1.5],
+            snsteps=[2],
+            output="calc_dir/scan.inp",
+        )
+        self.assertEqual(
+            calcs[1].command,
+            "xtb ethanol_2.xyz --opt tight --input calc_dir/scan_ethanol_2.inp",
+        )
+        self.assertTrue(calcs[1].structure_file.startswith("9\nethanol_2\n"))
+
+    def test_xyz(self):
+        calcs = self.gen(
+            file=None, xyz="H 0 0 0\nH 0 0 0.74", scan=[[1, 2]], sto=[1.0], snsteps=[3]
+        )
+        self.assertEqual([c.calc.name for c in calcs], ["calc_1", "calc_2", "calc_3"])
+
+    def test_parse_name(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "Cl2_radical_anion.xyz")
+            with open(path, "w") as out:
+                out.write("2\n\nCl 0 0 0\nCl 0 0 2.0\n")
+
+            calcs = self.gen(
+                software="xtb",
+                method="gfn2-xtb",
+                basis_set="",
+                file=path,
+                scan=[[1, 2]],
+                sto=[2.2],
+                snsteps=[2],
+                parse_name=True,
+            )
+        self.assertEqual(calcs[1].calc.name, "Cl2_radical_anion_2")
+        self.assertEqual(calcs[1].calc.charge, -1)
+        self.assertEqual(calcs[1].calc.multiplicity, 2)
+        # The points are not written to the input file
+        self.assertIsNone(calcs[1].calc.file)
+
+    def test_not_constrained_optimisation(self):
+        with self.assertRaises(InvalidParameter):
+            self.gen(type="opt", scan=[[5, 8]], sto=[1.5], snsteps=[1])
+
+    def test_no_scan(self):
+        with self.assertRaises(InvalidParameter):
+            self.gen(constraints="freeze/1_5")
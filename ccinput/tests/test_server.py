@@ -0,0 +1,197 @@
+import io
+import os
+import sys
+import signal
+import tempfile
+import threading
+import subprocess
+from unittest import TestCase
+from mock import patch
+
+from ccinput.server import (
+    ThreadOutput,
+    Client,
+    create_server,
+    get_warnings,
+    process_request,
+)
+from ccinput.wrapper import gen_input
+from ccinput.exceptions import InvalidParameter, ImpossibleCalculation
+
+PARAMS = {
+    "software": "orca",
+    "type": "sp",
+    "method": "HF",
+    "basis_set": "STO-3G",
+    "xyz": "H 0 0 0\nH 0 0 0.74",
+}
+
+
+class RequestTests(TestCase):
+    def test_input(self):
+        response = process_request(
+            '{"id": 3, "software": "orca", "type": "sp", "method": "HF", '
+            '"basis_set": "STO-3G", "xyz": "H 0 0 0\\nH 0 0 0.74"}'
+        )
+        self.assertEqual(response["id"], 3)
+        self.assertEqual(response["name"], "calc")
+        self.assertEqual(response["input"], gen_input(**PARAMS))
+        self.assertEqual(response["files"], {})
+
+    def test_command(self):
+        response = process_request(
+            '{"software": "xtb", "type": "opt", "xyz": "Cl 0 0 0", "charge": -1}'
+        )
+        self.assertEqual(response["command"], "xtb calc.xyz --opt tight --chrg -1")
+        # Only the frames and scan points come with their structure
+        self.assertEqual(response["files"], {})
+
+    def test_companion_files(self):
+        response = process_request(
+            '{"software": "nwchem", "type": "sp", "method": "B3LYP", "basis_set": "3-21G", '
+            '"xyz": "I 0 0 0", "charge": -1, "name": "I", "solvent": "chloroform", '
+            '"solvation_model": "SMD", "custom_solvation_radii": "Cl=1.00"}'
+        )
+        self.assertEqual(list(response["files"]), ["I_sol.parameters"])
+
+    def test_error(self):
+        response = process_request('{"software": "orca", "type": "sp"}')
+        self.assertEqual(response["type"], "InvalidParameter")
+        self.assertNotIn("input", response)
+
+    def test_invalid_json(self):
+        self.assertEqual(process_request("{software")["type"], "InvalidParameter")
+        self.assertEqual(process_request("[1, 2]")["type"], "InvalidParameter")
+
+    def test_warnings(self):
+        self.assertEqual(
+            get_warnings("*** No solvation radii specified ***\n\n"),
+            ["No solvation radii specified"],
+        )
+
+
+class ServerTests(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, "ccinput.sock")
+
+        patcher = patch("sys.stdout", ThreadOutput(io.StringIO()))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.server = create_server(self.path)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def test_generate(self):
+        with Client(self.path) as client:
+            response = client.generate(**PARAMS)
+            self.assertEqual(response["input"], gen_input(**PARAMS))
+            self.assertEqual(response["warnings"], [])
+
+            # Multiple requests on the same connection
+            response = client.generate(name="hydrogen", **PARAMS)
+            self.assertEqual(response["name"], "hydrogen")
+
+    def test_socket_permissions(self):
+        # No permissions for the group and the other users
+        self.assertEqual(os.stat(self.path).st_mode & 0o077, 0)
+
+    def test_errors(self):
+        with Client(self.path) as client:
+            with self.assertRaises(InvalidParameter):
+                client.generate(software="orca")
+            with self.assertRaises(ImpossibleCalculation):
+                client.generate(**dict(PARAMS, xyz="H 0 0 0"))
+            self.assertIn("error", client.request(software="orca"))
+
+            # The server still works after the errors
+            client.generate(**PARAMS)
+
+    def test_concurrent(self):
+        responses = {}
+
+        def send_requests(index):
+            with Client(self.path) as client:
+                responses[index] = [
+                    client.generate(
+                        id=i, solvent="water", solvation_model="CPCM", **PARAMS
+                    )
+                    for i in range(5)
+                ]
+
+        threads = [threading.Thread(target=send_requests, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(responses), 4)
+        for thread_responses in responses.values():
+            self.assertEqual([r["id"] for r in thread_responses], list(range(5)))
+            # The warnings of each request are returned with it
+            for response in thread_responses:
+                self.assertEqual(
+                    response["warnings"],
+                    ["No solvation radii specified; using default radii"],
+                )
+
+    def test_many_connections(self):
+        clients = [Client(self.path, timeout=30) for i in range(64)]
+        try:
+            for client in clients:
+                self.assertEqual(client.generate(**PARAMS)["name"], "calc")
+        finally:
+            for client in clients:
+                client.close()
+
+    def test_already_running(self):
+        with self.assertRaises(InvalidParameter):
+            create_server(self.path)
+
+
+class ServeCommandTests(TestCase):
+    def test_serve(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "ccinput.sock")
+            code = "from ccinput.wrapper import cmd\n" f"cmd('serve --socket {path}')\n"
+            process = subprocess.Popen(
+                [sys.executable, "-c", code],
+                stdout=subprocess.PIPE,
+                universal_newlines=True,
+            )
+            try:
+                self.assertIn("Listening on", process.stdout.readline())
+                with Client(path, timeout=30) as client:
+                    self.assertEqual(
+                        client.generate(**PARAMS)["input"], gen_input(**PARAMS)
+                    )
+            finally:
+                process.send_signal(signal.SIGINT)
+                process.communicate(timeout=30)
+
+            # The socket is removed when the server stops
+            self.assertFalse(os.path.exists(path))
+
+    def test_stale_socket(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "ccinput.sock")
+            server = create_server(path)
+            server.server_close()
+
+            # The socket of a server which did not stop properly is replaced
+            server = create_server(path)
+            server.server_close()
+
+    def test_socket_not_removable(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "ccinput.sock")
+            with open(path, "w"):
+                pass
+
+            with patch("os.unlink", side_effect=PermissionError("Permission denied")):
+                with self.assertRaises(InvalidParameter):
+                    create_server(path)
@@ -1,7 +1,23 @@
+import os
+import tempfile
 from unittest import TestCase
+from mock import patch
 
-from ccinput.utilities import standardize_xyz
-from ccinput.exceptions import InvalidXYZ
+from ccinput.utilities import (
+    standardize_xyz,
+    parse_xyz,
+    iter_xyz_frames,
+    build_xyz_frame_index,
+    load_xyz_frame_index,
+    iter_xyz_frame_range,
+    parse_frame_range,
+    XYZ_FRAME_INDEX_SUFFIX,
+)
+from ccinput.calculation import Structure
+from ccinput.wrapper import gen_obj, gen_frame_objs
+from ccinput.exceptions import InvalidXYZ, InvalidParameter
+
+STRUCTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "structures")
 
 
 class XyzTests(TestCase):
@@ -113,3 +129,346 @@ class XyzTests(TestCase):
         self.assertEqual(
             standardize_xyz(xyz), "Cl   0.00000000   0.00000000   0.00000000\n"
         )
+
+    def test_atomic_number(self):
+        xyz = "17 0.0 0.0 0.0\n6 1.0 0.0 0.0\n"
+        self.assertEqual(
+            standardize_xyz(xyz),
+            "Cl   0.00000000   0.00000000   0.00000000\nC    1.00000000   0.00000000   0.00000000\n",
+        )
+
+    def test_list(self):
+        xyz = ["Cl 0.0 0.0 0.0", "", "H 1.0 0.0 0.0"]
+        self.assertEqual(
+            standardize_xyz(xyz),
+            "Cl   0.00000000   0.00000000   0.00000000\nH    1.00000000   0.00000000   0.00000000\n",
+        )
+
+    def test_large(self):
+        lines = [f"{('H', 'c', '6')[i % 3]} {i}.5 -{i}.25 1e-3" for i in range(1000)]
+        expected = "".join(
+            f"{'HCC'[i % 3]:<2} {i + 0.5:>12.8f} {-i - 0.25:>12.8f} {0.001:>12.8f}\n"
+            for i in range(1000)
+        )
+        self.assertEqual(standardize_xyz("\n".join(lines)), expected)
+
+    def test_large_errors(self):
+        lines = ["H 0.0 0.0 0.0"] * 1000
+        for line, msg in [
+            ("Bl 0.0 0.0 0.0", "Invalid atomic label: 'Bl'"),
+            ("200 0.0 0.0 0.0", "Invalid atomic number: '200'"),
+            ("H 0.0 x 0.0", "Invalid atomic coordinate: 'x'"),
+            ("H 0.0 0.0", "Invalid xyz: found line 'H 0.0 0.0'"),
+        ]:
+            with self.assertRaises(InvalidXYZ) as cm:
+                standardize_xyz(lines[:500] + [line] + lines[500:])
+            self.assertEqual(str(cm.exception), msg)
+
+    def test_fields_across_lines(self):
+        lines = ["H 0.0 0.0 0.0"] * 100 + ["H 0.0 0.0", "0.0 H 0.0 0.0 0.0"]
+        with self.assertRaises(InvalidXYZ):
+            standardize_xyz(lines)
+
+    def test_non_ascii(self):
+        self.assertEqual(
+            standardize_xyz(["Cl\u00a00.0 0.0 0.0"] * 100),
+            "Cl   0.00000000   0.00000000   0.00000000\n" * 100,
+        )
+
+    def test_not_string(self):
+        with self.assertRaises(InvalidXYZ):
+            standardize_xyz(["H 0.0 0.0 0.0", 1])
+
+
+class StructureTests(TestCase):
+    def setUp(self):
+        self.xyz = "3\n\nO 0.0 0.0 0.0\nH 0.96 0.0 0.0\nh -0.24 0.93 0.0\n"
+
+    def test_elements(self):
+        structure = Structure.from_xyz(self.xyz)
+        self.assertEqual(structure.elements, ["O", "H", "H"])
+        self.assertEqual(len(structure), 3)
+        self.assertEqual(structure.coordinates.shape, (3, 3))
+
+    def test_xyz(self):
+        structure = Structure.from_xyz(self.xyz)
+        self.assertEqual(structure.xyz, standardize_xyz(self.xyz))
+
+    def test_xyz_lazy(self):
+        structure = Structure.from_xyz(self.xyz)
+        self.assertIsNone(structure._xyz)
+        structure.xyz
+        self.assertIsNotNone(structure._xyz)
+
+    def test_atomic_numbers(self):
+        structure = Structure.from_xyz(self.xyz)
+        self.assertEqual(list(structure.atomic_numbers), [8, 1, 1])
+        self.assertEqual(structure.num_electrons, 10)
+
+    def test_unique_elements(self):
+        structure = Structure.from_xyz("Cl 0 0 0\nH 1 0 0\nCl 2 0 0\nI 3 0 0\n")
+        self.assertEqual(structure.unique_elements, ("Cl", "H", "I"))
+
+    def test_getitem(self):
+        el, coords = Structure.from_xyz(self.xyz)[1]
+        self.assertEqual(el, "H")
+        self.assertEqual(list(coords), [0.96, 0.0, 0.0])
+
+    def test_get_coord(self):
+        structure = Structure.from_xyz(self.xyz)
+        self.assertAlmostEqual(structure.get_coord([1, 2]), 0.96)
+        self.assertAlmostEqual(structure.get_coord([2, 1, 3]), 104.5, places=0)
+
+    def test_from_structure(self):
+        structure = Structure.from_xyz(self.xyz)
+        self.assertIs(Structure.from_xyz(structure), structure)
+
+    def test_equal(self):
+        self.assertEqual(
+            Structure.from_xyz(self.xyz), Structure.from_xyz(standardize_xyz(self.xyz))
+        )
+        self.assertNotEqual(
+            Structure.from_xyz(self.xyz), Structure.from_xyz("O 0 0 0\n")
+        )
+
+    def test_invalid(self):
+        with self.assertRaises(InvalidXYZ):
+            Structure.from_xyz("1\n\nBl 0.0 0.0 0.0\n")
+
+    def test_from_file(self):
+        structure = Structure.from_file(os.path.join(STRUCTURES, "ethanol.xyz"))
+        self.assertEqual(len(structure), 9)
+
+    def test_parsed_once(self):
+        with patch("ccinput.calculation.parse_xyz", wraps=parse_xyz) as parse:
+            calc = gen_obj(
+                software="gaussian",
+                type="constr_opt",
+                method="HF",
+                basis_set="3-21G",
+                constraints="freeze/1_2;freeze/2_3;scan_1.0_1.5_5/1_2_3;",
+                freeze=[[1, 3]],
+                file=os.path.join(STRUCTURES, "ethanol.xyz"),
+            )
+            self.assertEqual(parse.call_count, 1)
+
+        for constraint in calc.calc.constraints:
+            self.assertGreater(constraint.start_d, 0)
+
+
+class FramesTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, content):
+        path = os.path.join(self.tmpdir.name, "frames.xyz")
+        with open(path, "w") as out:
+            out.write(content)
+        return path
+
+    def test_frames(self):
+        frames = list(iter_xyz_frames(os.path.join(STRUCTURES, "h2o_conformers.xyz")))
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(frames[1][0], "energy: -76.0238")
+        self.assertEqual(len(frames[1][1]), 3)
+
+    def test_single_frame(self):
+        frames = list(iter_xyz_frames(os.path.join(STRUCTURES, "ethanol.xyz")))
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(
+            Structure.from_xyz(frames[0][1]),
+            Structure.from_file(os.path.join(STRUCTURES, "ethanol.xyz")),
+        )
+
+    def test_empty_comment(self):
+        path = self.write("1\n\nH 0 0 0\n1\n\nH 1 0 0")
+        structures = [s for c, s in Structure.iter_file(path)]
+        self.assertEqual(len(structures), 2)
+        self.assertEqual(structures[1].coordinates[0][0], 1.0)
+
+    def test_truncated(self):
+        path = self.write("1\n\nH 0 0 0\n2\n\nH 1 0 0\n")
+        frames = iter_xyz_frames(path)
+        next(frames)
+        with self.assertRaises(InvalidXYZ):
+            next(frames)
+
+    def test_blank_line_in_frame(self):
+        path = self.write("2\n\nH 0 0 0\n\nH 1 0 0\n")
+        with self.assertRaises(InvalidXYZ):
+            list(iter_xyz_frames(path))
+
+    def test_invalid_header(self):
+        path = self.write("1\n\nH 0 0 0\nH 1 0 0\n")
+        with self.assertRaises(InvalidXYZ):
+            list(iter_xyz_frames(path))
+
+    def test_invalid_atom(self):
+        path = self.write("1\n\nH 0 0 0\n1\n\nBl 1 0 0\n")
+        with self.assertRaises(InvalidXYZ):
+            list(Structure.iter_file(path))
+
+    def test_gen_frame_objs(self):
+        calcs = gen_frame_objs(
+            software="xtb",
+            type="sp",
+            method="gfn2-xtb",
+            file=os.path.join(STRUCTURES, "h2o_conformers.xyz"),
+        )
+        names = [calc.calc.name for calc in calcs]
+        self.assertEqual(names, [f"h2o_conformers_{i}" for i in range(1, 4)])
+
+    def test_gen_frame_objs_parse_name(self):
+        path = self.write("1\n\nCl 0 0 0\n1\n\nCl 1 0 0\n")
+        os.rename(path, os.path.join(self.tmpdir.name, "Cl_anion.xyz"))
+        calcs = gen_frame_objs(
+            software="xtb",
+            type="sp",
+            method="gfn2-xtb",
+            file=os.path.join(self.tmpdir.name, "Cl_anion.xyz"),
+            parse_name=True,
+        )
+        for calc in calcs:
+            self.assertEqual(calc.calc.charge, -1)
+            self.assertIn(f"{calc.calc.name}.xyz", calc.command)
+
+    def test_gen_frame_objs_lazy(self):
+        with patch("ccinput.wrapper.generate_calculation") as generate:
+            calcs = gen_frame_objs(
+                software="xtb",
+                type="sp",
+                method="gfn2-xtb",
+                file=os.path.join(STRUCTURES, "h2o_conformers.xyz"),
+            )
+            next(calcs)
+            self.assertEqual(generate.call_count, 1)
+
+
+class FrameIndexTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "frames.xyz")
+
+        frames = []
+        for i in range(20):
+            num_atoms = 2 * (i % 3 + 1)
+            atoms = "".join(f"H {i} {j} 0.0\n" for j in range(num_atoms))
+            frames.append(f"{num_atoms}\nframe {i}\n{atoms}")
+        with open(self.path, "w") as out:
+            out.write("\n".join(frames))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_index(self):
+        index = build_xyz_frame_index(self.path)
+        self.assertEqual(len(index), 20)
+        with open(self.path) as f:
+            f.seek(index[7])
+            self.assertEqual(f.readline(), "4\n")
+            self.assertEqual(f.readline(), "frame 7\n")
+
+    def test_small_chunks(self):
+        index = build_xyz_frame_index(self.path)
+        for size in [1, 7, 64]:
+            with patch("ccinput.utilities.XYZ_FRAME_INDEX_CHUNK_SIZE", size):
+                self.assertEqual(
+                    build_xyz_frame_index(self.path).tolist(), index.tolist()
+                )
+
+    def test_range(self):
+        frames = list(iter_xyz_frames(self.path))
+        self.assertEqual(list(iter_xyz_frame_range(self.path, 5, 12)), frames[5:12])
+        self.assertEqual(list(iter_xyz_frame_range(self.path, 18, None)), frames[18:])
+
+    def test_invalid_range(self):
+        with self.assertRaises(InvalidParameter):
+            list(iter_xyz_frame_range(self.path, 15, 21))
+        with self.assertRaises(InvalidParameter):
+            list(iter_xyz_frame_range(self.path, 5, 5))
+
+    def test_empty_file(self):
+        with open(self.path, "w") as out:
+            out.write("")
+        self.assertEqual(len(build_xyz_frame_index(self.path)), 0)
+
+    def test_truncated(self):
+        with open(self.path, "a") as out:
+            out.write("\n3\ncomment\nH 0 0 0\n")
+        with self.assertRaises(InvalidXYZ):
+            build_xyz_frame_index(self.path)
+
+    def test_invalid_header(self):
+        with open(self.path, "a") as out:
+            out.write("\nH 0 0 0\n")
+        with self.assertRaises(InvalidXYZ):
+            build_xyz_frame_index(self.path)
+
+    def test_blank_line_in_frame(self):
+        with open(self.path, "a") as out:
+            out.write("\n2\ncomment\nH 0 0 0\n\nH 0 0 1\n")
+        with self.assertRaises(InvalidXYZ):
+            build_xyz_frame_index(self.path)
+
+    def test_invalid_atoms(self):
+        with open(self.path, "a") as out:
+            out.write("\n2\ncomment\nH 0 0 0\nH 0 0\n")
+        frames = iter_xyz_frame_range(self.path, 20, 21)
+        with self.assertRaises(InvalidXYZ):
+            Structure.from_xyz(next(frames)[1])
+
+    def test_not_persisted(self):
+        load_xyz_frame_index(self.path)
+        self.assertFalse(os.path.isfile(self.path + XYZ_FRAME_INDEX_SUFFIX))
+
+    def test_persisted(self):
+        index = load_xyz_frame_index(self.path, persist=True)
+        self.assertTrue(os.path.isfile(self.path + XYZ_FRAME_INDEX_SUFFIX))
+
+        with patch("ccinput.utilities.build_xyz_frame_index") as build:
+            self.assertEqual(load_xyz_frame_index(self.path).tolist(), index.tolist())
+            build.assert_not_called()
+
+    def test_persisted_outdated(self):
+        load_xyz_frame_index(self.path, persist=True)
+        with open(self.path, "a") as out:
+            out.write("\n1\n\nH 0 0 0\n")
+        self.assertEqual(len(load_xyz_frame_index(self.path)), 21)
+
+    @patch("ccinput.utilities.warn")
+    def test_persist_error(self, warn_fn):
+        # The index cannot be written (e.g., read-only directory)
+        os.mkdir(self.path + XYZ_FRAME_INDEX_SUFFIX)
+        self.assertEqual(len(load_xyz_frame_index(self.path, persist=True)), 20)
+        warn_fn.assert_called_once()
+
+    def test_persisted_invalid(self):
+        with open(self.path + XYZ_FRAME_INDEX_SUFFIX, "w") as out:
+            out.write("invalid")
+        self.assertEqual(len(load_xyz_frame_index(self.path)), 20)
+
+    def test_parse_frame_range(self):
+        self.assertEqual(parse_frame_range("12-15"), (11, 15))
+        self.assertEqual(parse_frame_range("3"), (2, 3))
+        self.assertEqual(parse_frame_range("3-"), (2, None))
+        for frame_range in ["0-3", "5-4", "a-b", "-3"]:
+            with self.assertRaises(InvalidParameter):
+                parse_frame_range(frame_range)
+
+    def test_gen_frame_objs_range(self):
+        calcs = list(
+            gen_frame_objs(
+                software="xtb",
+                type="sp",
+                method="gfn2-xtb",
+                file=self.path,
+                frame_range="11-13",
+            )
+        )
+        self.assertEqual(
+            [calc.calc.name for calc in calcs], ["frames_11", "frames_12", "frames_13"]
+        )
+        self.assertEqual(calcs[0].calc.structure.coordinates[0][0], 10.0)
@@ -0,0 +1,237 @@
+from unittest import TestCase
+from mock import patch
+
+import numpy as np
+
+from ccinput.constants import CalcType
+from ccinput.utilities import (
+    build_synonym_index,
+    get_synonym_index,
+    get_abs_type,
+    get_abs_method,
+    get_abs_basis_set,
+    get_abs_solvent,
+    get_method,
+    get_basis_set,
+    get_solvent,
+    resolution_cache_info,
+    build_prefix_trie,
+    is_exchange_correlation_combination,
+    get_exchange_correlation_combinations,
+    clear_resolution_caches,
+    SYNONYM_TABLES,
+    get_bonds,
+    get_fragments,
+    COVALENT_BOND_TOLERANCE,
+)
+from ccinput.exceptions import InvalidParameter, InternalError
+from ccinput.elements import COVALENT_RADII
+
+
+class SynonymIndexTests(TestCase):
+    def test_build(self):
+        index = build_synonym_index({"a": ["b", "c"], "d": []})
+        self.assertEqual(index, {"a": "a", "b": "a", "c": "a", "d": "d"})
+
+    def test_build_multiple_tables(self):
+        index = build_synonym_index({"a": ["b"]}, {"c": [], "a": []})
+        self.assertEqual(index, {"a": "a", "b": "a", "c": "c"})
+
+    def test_collision(self):
+        with self.assertRaises(InternalError):
+            build_synonym_index({"a": ["b"], "c": ["b"]})
+
+    def test_collision_canonical(self):
+        with self.assertRaises(InternalError):
+            build_synonym_index({"a": ["b"], "b": []})
+
+    def test_collision_between_tables(self):
+        with self.assertRaises(InternalError):
+            build_synonym_index({"a": ["b"]}, {"b": []})
+
+    def test_no_collision_in_tables(self):
+        for name in SYNONYM_TABLES:
+            self.assertGreater(len(get_synonym_index(name)), 0)
+
+    def test_built_once(self):
+        self.assertIs(get_synonym_index("method"), get_synonym_index("method"))
+
+    def test_type(self):
+        self.assertEqual(get_abs_type("Geometrical Optimisation"), CalcType.OPT)
+
+    def test_method_synonym(self):
+        self.assertEqual(get_abs_method("B3-LYP"), get_abs_method("b3lyp"))
+
+    def test_method_unknown_trust_me(self):
+        self.assertEqual(get_abs_method("MyMethod", trust_me=True), "MyMethod")
+
+    def test_method_unknown(self):
+        with self.assertRaises(InvalidParameter):
+            get_abs_method("MyMethod")
+
+    def test_basis_set_bse_only(self):
+        self.assertEqual(get_abs_basis_set("5-21G"), "521g")
+
+    def test_solvent_synonym(self):
+        self.assertEqual(get_abs_solvent("DMF"), "dimethylformamide")
+
+    def test_solvent_vacuum(self):
+        self.assertEqual(get_abs_solvent("Vacuum"), "")
+
+
+class ResolutionCacheTests(TestCase):
+    def setUp(self):
+        clear_resolution_caches()
+
+    def test_method_cached(self):
+        self.assertEqual(get_method("B3LYP", "gaussian"), "B3LYP")
+        with patch("ccinput.utilities.get_abs_method") as abs_method:
+            self.assertEqual(get_method("B3LYP", "gaussian"), "B3LYP")
+            abs_method.assert_not_called()
+
+        info = resolution_cache_info()["method"]
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 1)
+
+    def test_method_fallback_cached(self):
+        self.assertEqual(get_method("UM062X", "gaussian"), "UM062X")
+        self.assertEqual(get_method("UM062X", "gaussian"), "UM062X")
+        self.assertEqual(resolution_cache_info()["method"].hits, 1)
+
+    def test_software_specific(self):
+        get_method("B3LYP", "gaussian")
+        get_method("B3LYP", "orca")
+        self.assertEqual(resolution_cache_info()["method"].misses, 2)
+
+    @patch("ccinput.utilities.warn")
+    def test_warning_replayed(self, warn_fn):
+        for i in range(3):
+            self.assertEqual(get_method("MyMethod", "gaussian"), "MyMethod")
+
+        self.assertEqual(warn_fn.call_count, 3)
+        warn_fn.assert_called_with("Unknown method 'MyMethod'")
+        self.assertEqual(resolution_cache_info()["method"].misses, 1)
+
+    @patch("ccinput.utilities.warn")
+    def test_warning_replayed_basis_set(self, warn_fn):
+        get_basis_set("MyBasisSet", "orca")
+        get_basis_set("MyBasisSet", "orca")
+        self.assertEqual(warn_fn.call_count, 2)
+        warn_fn.assert_called_with("Unknown basis set 'MyBasisSet'")
+
+    @patch("ccinput.utilities.warn")
+    def test_warning_replayed_solvent(self, warn_fn):
+        get_solvent("MySolvent", "orca")
+        get_solvent("MySolvent", "orca")
+        self.assertEqual(warn_fn.call_count, 2)
+
+    @patch("ccinput.utilities.warn")
+    def test_no_warning(self, warn_fn):
+        get_basis_set("Def2-SVP", "orca")
+        get_basis_set("Def2-SVP", "orca")
+        warn_fn.assert_not_called()
+
+    def test_solvation_model(self):
+        self.assertEqual(get_solvent("octanol", "orca", "smd"), "1-octanol")
+        self.assertEqual(get_solvent("octanol", "orca", "cpcm"), "octanol")
+
+    def test_error_not_cached(self):
+        for i in range(2):
+            with self.assertRaises(KeyError):
+                get_solvent("water", "unknown software")
+        self.assertEqual(resolution_cache_info()["solvent"].currsize, 0)
+
+    def test_clear(self):
+        get_method("B3LYP", "gaussian")
+        clear_resolution_caches()
+        self.assertEqual(resolution_cache_info()["method"].currsize, 0)
+
+
+class ExchangeCorrelationTests(TestCase):
+    def test_trie(self):
+        trie = build_prefix_trie(["b", "br", "a"])
+        self.assertEqual(trie, {"b": {"": 0, "r": {"": 1}}, "a": {"": 2}})
+
+    def test_trie_duplicate(self):
+        trie = build_prefix_trie(["b", "b"])
+        self.assertEqual(trie, {"b": {"": 0}})
+
+    def test_combination(self):
+        self.assertEqual(
+            is_exchange_correlation_combination("pw91lyp", "gaussian"), "PW91LYP"
+        )
+
+    def test_combination_nwchem(self):
+        self.assertEqual(
+            is_exchange_correlation_combination("becke88lyp", "nwchem"),
+            "becke88 lyp",
+        )
+
+    def test_longer_exchange(self):
+        # "brx" also starts with the exchange functional "b"
+        self.assertEqual(
+            is_exchange_correlation_combination("brxlyp", "gaussian"), "BRxLYP"
+        )
+
+    def test_not_combination(self):
+        self.assertFalse(is_exchange_correlation_combination("b3lyp", "gaussian"))
+        self.assertFalse(is_exchange_correlation_combination("blypx", "gaussian"))
+        self.assertFalse(is_exchange_correlation_combination("", "gaussian"))
+
+    def test_all_combinations(self):
+        combinations = get_exchange_correlation_combinations("gaussian")
+        self.assertEqual(combinations["blyp"], "BLYP")
+        for method, keyword in combinations.items():
+            self.assertEqual(
+                is_exchange_correlation_combination(method, "gaussian"), keyword
+            )
+
+    def test_all_combinations_copy(self):
+        get_exchange_correlation_combinations("nwchem").clear()
+        self.assertNotEqual(len(get_exchange_correlation_combinations("nwchem")), 0)
+
+
+class BondDetectionTests(TestCase):
+    def pairwise_bonds(self, elements, coordinates):
+        radii = np.array([COVALENT_RADII[el] for el in elements])
+        first, second = np.triu_indices(len(elements), k=1)
+        distances = np.linalg.norm(coordinates[first] - coordinates[second], axis=1)
+        bonded = distances < radii[first] + radii[second] + COVALENT_BOND_TOLERANCE
+        return np.stack([first[bonded], second[bonded]], axis=1)
+
+    def test_cell_list(self):
+        rng = np.random.default_rng(0)
+        for num_atoms in [2, 10, 200, 2000]:
+            elements = list(rng.choice(["H", "C", "O", "I"], num_atoms))
+            coordinates = rng.uniform(0, 2.2 * num_atoms ** (1 / 3), (num_atoms, 3))
+            self.assertEqual(
+                get_bonds(elements, coordinates).tolist(),
+                self.pairwise_bonds(elements, coordinates).tolist(),
+            )
+
+    def test_negative_coordinates(self):
+        coordinates = np.array([[-10.0, -10.0, -10.0], [-10.0, -10.0, -9.26]])
+        self.assertEqual(get_bonds(["H", "H"], coordinates).tolist(), [[0, 1]])
+
+    def test_single_atom(self):
+        self.assertEqual(get_bonds(["He"], [[0.0, 0.0, 0.0]]).shape, (0, 2))
+
+    def test_fragments(self):
+        coordinates = np.array(
+            [
+                [5.0, 0.0, 0.0],
+                [0.0, 0.0, 0.0],
+                [0.0, 0.0, 0.74],
+                [5.0, 0.0, 0.74],
+                [10.0, 0.0, 0.0],
+            ]
+        )
+        self.assertEqual(
+            get_fragments(["H"] * 5, coordinates).tolist(), [1, 2, 2, 1, 3]
+        )
+
+    def test_fragments_chain(self):
+        # The labels propagate along long chains
+        coordinates = np.zeros((500, 3))
+        coordinates[:, 0] = np.arange(500)[::-1] * 1.5
+        self.assertEqual(set(get_fragments(["C"] * 500, coordinates)), {1})
@@ -0,0 +1,198 @@
+import subprocess
+import sys
+from unittest import TestCase
+from mock import patch, MagicMock
+
+from ccinput.wrapper import (
+    BackendRegistry,
+    SOFTWARE_BACKENDS,
+    SOFTWARE_CLASSES,
+    register_backend,
+    gen_input,
+    gen_parameters,
+    gen_batch_objs,
+    generate_calculation,
+)
+from ccinput.calculation import Parameters
+from ccinput.packages.gaussian import GaussianCalculation
+from ccinput.drivers.pysis import PysisDriver
+from ccinput.exceptions import InvalidParameter
+
+
+class EchoDriver:
+    def __init__(self, calc):
+        self.output = f"echo {calc.parameters.method}"
+
+
+PARAMS = {
+    "software": "xtb",
+    "type": "sp",
+    "method": "gfn2-xtb",
+    "xyz": "Cl 0 0 0\n",
+    "charge": -1,
+}
+
+
+class BackendRegistryTests(TestCase):
+    def setUp(self):
+        self.registry = BackendRegistry(SOFTWARE_BACKENDS)
+        patcher = patch("ccinput.wrapper.SOFTWARE_CLASSES", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = patch("ccinput.wrapper.get_backend_entry_points", return_value={})
+        self.entry_points = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get(self):
+        self.assertIs(self.registry["gaussian"], GaussianCalculation)
+        self.assertIs(self.registry["Pysisyphus"], PysisDriver)
+
+    def test_global_registry(self):
+        self.assertIs(SOFTWARE_CLASSES["gaussian"], GaussianCalculation)
+
+    def test_contains(self):
+        self.assertIn("orca", self.registry)
+        self.assertNotIn("mydriver", self.registry)
+
+    def test_names(self):
+        self.assertEqual(list(self.registry), list(SOFTWARE_BACKENDS))
+
+    def test_lazy(self):
+        self.assertFalse(self.registry.is_loaded("orca"))
+        self.registry["orca"]
+        self.assertTrue(self.registry.is_loaded("orca"))
+
+    def test_unknown(self):
+        with self.assertRaises(KeyError):
+            self.registry["mydriver"]
+
+    def test_unknown_driver(self):
+        with self.assertRaises(InvalidParameter):
+            gen_input(driver="mydriver", **PARAMS)
+
+    def test_register_class(self):
+        register_backend("mydriver", EchoDriver)
+        self.assertEqual(gen_input(driver="MyDriver", **PARAMS), "echo gfn2-xtb")
+
+    def test_register_path(self):
+        register_backend("mydriver", "ccinput.tests.test_wrapper:EchoDriver")
+        self.assertFalse(self.registry.is_loaded("mydriver"))
+        self.assertEqual(gen_input(driver="mydriver", **PARAMS), "echo gfn2-xtb")
+
+    def test_register_replace(self):
+        register_backend("xtb", EchoDriver)
+        self.assertEqual(gen_input(**PARAMS), "echo gfn2-xtb")
+
+    def test_entry_point(self):
+        entry_point = MagicMock()
+        entry_point.load.return_value = EchoDriver
+        self.entry_points.return_value = {"mydriver": entry_point}
+
+        self.assertIn("mydriver", self.registry)
+        self.assertIn("mydriver", list(self.registry))
+        self.assertEqual(gen_input(driver="mydriver", **PARAMS), "echo gfn2-xtb")
+
+    def test_entry_point_no_replace(self):
+        entry_point = MagicMock()
+        entry_point.load.return_value = EchoDriver
+        self.entry_points.return_value = {"xtb": entry_point}
+
+        self.assertNotEqual(gen_input(**PARAMS), "echo gfn2-xtb")
+        entry_point.load.assert_not_called()
+
+    def test_only_selected_backend_imported(self):
+        code = (
+            "import sys\n"
+            "from ccinput.wrapper import gen_input\n"
+            "gen_input(software='xtb', type='sp', method='gfn2-xtb', "
+            "xyz='Cl 0 0 0', charge=-1)\n"
+            "print(' '.join(sys.modules))\n"
+        )
+        modules = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout.split()
+
+        self.assertIn("ccinput.packages.xtb", modules)
+        self.assertNotIn("ccinput.packages.gaussian", modules)
+        self.assertNotIn("ccinput.basis_sets", modules)
+
+
+class BatchGenerationTests(TestCase):
+    STRUCTURES = ["Cl 0 0 0\n", "Br 0 0 0\n", "I 0 0 0\n"]
+
+    def test_equivalent(self):
+        for software in ["gaussian", "orca", "nwchem"]:
+            args = {
+                "software": software,
+                "type": "sp",
+                "method": "HF",
+                "basis_set": "Def2-SVP",
+                "charge": -1,
+            }
+            calcs = gen_batch_objs(self.STRUCTURES, name="halide", **args)
+            for index, (xyz, calc) in enumerate(zip(self.STRUCTURES, calcs), 1):
+                ref = generate_calculation(xyz=xyz, name=f"halide_{index}", **args)
+                self.assertEqual(calc.input_file, ref.input_file)
+
+    def test_parameters_resolved_once(self):
+        with patch("ccinput.wrapper.Parameters", wraps=Parameters) as parameters:
+            calcs = list(
+                gen_batch_objs(
+                    self.STRUCTURES,
+                    software="orca",
+                    type="sp",
+                    method="HF",
+                    basis_set="Def2-SVP",
+                    charge=-1,
+                )
+            )
+        self.assertEqual(len(calcs), 3)
+        parameters.assert_called_once()
+
+    def test_parameters_not_shared(self):
+        # The theory level of NWChem is changed by the package
+        calcs = list(
+            gen_batch_objs(
+                self.STRUCTURES[:2],
+                software="nwchem",
+                type="sp",
+                method="HF",
+                basis_set="Def2-SVP",
+                charge=-1,
+            )
+        )
+        self.assertIsNot(calcs[0].calc.parameters, calcs[1].calc.parameters)
+
+    def test_charges(self):
+        calcs = list(
+            gen_batch_objs(
+                ["Cl 0 0 0", "H 0 0 0\nH 0 0 0.74"],
+                charges=[-1, 0],
+                multiplicities=[1, 1],
+                names=["chloride", "hydrogen"],
+                software="xtb",
+                type="sp",
+            )
+        )
+        self.assertEqual([c.calc.charge for c in calcs], [-1, 0])
+        self.assertEqual([c.calc.name for c in calcs], ["chloride", "hydrogen"])
+
+    def test_default_names(self):
+        calcs = list(gen_batch_objs(self.STRUCTURES, **PARAMS))
+        self.assertEqual([c.calc.name for c in calcs], ["calc_1", "calc_2", "calc_3"])
+        self.assertEqual([c.calc.charge for c in calcs], [-1] * 3)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(InvalidParameter):
+            next(gen_batch_objs(self.STRUCTURES, software="orca", type="sp"))
+
+    def test_gen_parameters(self):
+        parameters = gen_parameters(
+            software="Gaussian", type="sp", method="HF", basis_set="Def2SVP", nproc=8
+        )
+        self.assertEqual(parameters.software, "gaussian")
+        self.assertEqual(parameters.kwargs, {})
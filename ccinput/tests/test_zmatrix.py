@@ -0,0 +1,225 @@
+import os
+from unittest import TestCase
+
+import numpy as np
+
+from ccinput.zmatrix import (
+    is_zmatrix,
+    parse_zmatrix,
+    zmatrix_to_cartesian,
+    zmatrices_to_cartesian,
+)
+from ccinput.calculation import Structure
+from ccinput.wrapper import gen_obj
+from ccinput.exceptions import InvalidParameter, InvalidXYZ
+
+STRUCTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "structures")
+
+WATER = "O\nH 1 0.96\nH 1 0.96 2 104.5"
+
+METHANE = """C
+H 1 1.09
+H 1 1.09 2 109.4712
+H 1 1.09 2 109.4712 3 120.0
+H 1 1.09 2 109.4712 3 -120.0
+"""
+
+
+def distance(coords, a, b):
+    return np.linalg.norm(coords[a] - coords[b])
+
+
+def angle(coords, a, b, c):
+    v1 = coords[a] - coords[b]
+    v2 = coords[c] - coords[b]
+    return np.degrees(np.arccos(v1.dot(v2) / (np.linalg.norm(v1) * np.linalg.norm(v2))))
+
+
+def dihedral(coords, a, b, c, d):
+    # IUPAC convention, as used by Z-matrices
+    b1 = coords[b] - coords[a]
+    b2 = coords[c] - coords[b]
+    b3 = coords[d] - coords[c]
+    n1 = np.cross(b1, b2)
+    n2 = np.cross(b2, b3)
+    return np.degrees(np.arctan2(np.linalg.norm(b2) * b1.dot(n2), n1.dot(n2)))
+
+
+class ZMatrixParsingTests(TestCase):
+    def test_is_zmatrix(self):
+        self.assertTrue(is_zmatrix(WATER))
+        self.assertTrue(is_zmatrix(["C1", "H2 1 1.09"]))
+        self.assertFalse(is_zmatrix("3\n\nO 0 0 0\nH 0 0 1\nH 0 1 0"))
+        self.assertFalse(is_zmatrix("O 0 0 0\nH 0 0 1\nH 0 1 0"))
+        self.assertFalse(is_zmatrix([]))
+
+    def test_not_zmatrix_title(self):
+        # XYZ structure with a title line instead of the number of atoms
+        xyz = "water\nO 0 0 0\nH 0 0 1\nH 0 1 0"
+        self.assertFalse(is_zmatrix(xyz))
+        with self.assertRaises(InvalidXYZ) as cm:
+            Structure.from_xyz(xyz)
+        self.assertNotIn("Invalid atomic label", str(cm.exception))
+
+    def test_is_zmatrix_variables(self):
+        self.assertTrue(is_zmatrix("O\nH 1 r\nH 1 r 2 a\n\nr 0.96\na 104.5"))
+        self.assertTrue(is_zmatrix("O1\nH2 O1 0.96"))
+        self.assertTrue(is_zmatrix("C"))
+
+    def test_parse(self):
+        elements, refs, values = parse_zmatrix(METHANE)
+        self.assertEqual(elements, ["C", "H", "H", "H", "H"])
+        self.assertEqual(refs[0].tolist(), [-1, -1, -1])
+        self.assertEqual(refs[3].tolist(), [0, 1, 2])
+        self.assertEqual(values[4].tolist(), [1.09, 109.4712, -120.0])
+
+    def test_variables(self):
+        elements, refs, values = parse_zmatrix(
+            "C\nO 1 r\nH 1 rh 2 a\nH 1 rh 2 a 3 -d\n\nr=1.2\nrh 1.1\na = 120.0\nd 180"
+        )
+        self.assertEqual(values[1, 0], 1.2)
+        self.assertEqual(values[3].tolist(), [1.1, 120.0, -180.0])
+
+    def test_variables_section(self):
+        elements, refs, values = parse_zmatrix(["H", "H 1 r", "Variables:", "r = 0.74"])
+        self.assertEqual(values[1, 0], 0.74)
+
+    def test_labels(self):
+        with open(os.path.join(STRUCTURES, "ethane.zmat")) as f:
+            elements, refs, values = parse_zmatrix(f.read())
+        self.assertEqual(elements, ["C"] * 2 + ["H"] * 6)
+        self.assertEqual(refs[6].tolist(), [1, 0, 5])
+
+    def test_atomic_numbers(self):
+        elements, refs, values = parse_zmatrix("8\n1 1 0.96")
+        self.assertEqual(elements, ["O", "H"])
+
+    def test_dummy_atoms(self):
+        elements, refs, values = parse_zmatrix("X\nC 1 1.0\nX2 2 1.0 1 90.0")
+        self.assertEqual(elements, [None, "C", None])
+
+    def test_gaussian_flag(self):
+        elements, refs, values = parse_zmatrix(METHANE.replace("-120.0", "-120.0 0"))
+        self.assertEqual(values[4, 2], -120.0)
+
+    def test_unknown_variable(self):
+        with self.assertRaises(InvalidParameter):
+            parse_zmatrix("H\nH 1 r")
+
+    def test_unknown_label(self):
+        with self.assertRaises(InvalidParameter):
+            parse_zmatrix("H\nH H1 0.74")
+
+    def test_invalid_element(self):
+        with self.assertRaises(InvalidXYZ):
+            parse_zmatrix("Zz\nH 1 0.74")
+
+    def test_invalid_number_of_fields(self):
+        with self.assertRaises(InvalidParameter):
+            parse_zmatrix("H\nH 1 0.74 2")
+
+    def test_forward_reference(self):
+        with self.assertRaises(InvalidParameter):
+            parse_zmatrix("H\nH 2 0.74")
+
+    def test_same_references(self):
+        with self.assertRaises(InvalidParameter):
+            parse_zmatrix("O\nH 1 0.96\nH 1 0.96 1 104.5")
+
+    def test_negative_bond(self):
+        with self.assertRaises(InvalidParameter):
+            parse_zmatrix("H\nH 1 -0.74")
+
+    def test_invalid_variable(self):
+        with self.assertRaises(InvalidParameter):
+            parse_zmatrix("H\nH 1 r\n\nr = abc")
+
+    def test_empty(self):
+        with self.assertRaises(InvalidParameter):
+            parse_zmatrix("\n\n")
+
+
+class ZMatrixConversionTests(TestCase):
+    def test_orientation(self):
+        coords = zmatrix_to_cartesian(*parse_zmatrix(WATER)[1:])
+        self.assertEqual(coords[0].tolist(), [0.0, 0.0, 0.0])
+        self.assertEqual(coords[1].tolist(), [0.0, 0.0, 0.96])
+        self.assertAlmostEqual(coords[2][1], 0.0)
+        self.assertGreater(coords[2][0], 0.0)
+
+    def test_internal_coordinates(self):
+        coords = zmatrix_to_cartesian(*parse_zmatrix(METHANE)[1:])
+        for i in range(1, 5):
+            self.assertAlmostEqual(distance(coords, 0, i), 1.09)
+        self.assertAlmostEqual(angle(coords, 2, 0, 1), 109.4712)
+        self.assertAlmostEqual(dihedral(coords, 3, 0, 1, 2), 120.0)
+        self.assertAlmostEqual(dihedral(coords, 4, 0, 1, 2), -120.0)
+
+    def test_ethane(self):
+        structure = Structure.from_file(os.path.join(STRUCTURES, "ethane.zmat"))
+        coords = structure.coordinates
+        self.assertAlmostEqual(distance(coords, 0, 1), 1.54)
+        self.assertAlmostEqual(distance(coords, 1, 7), 1.09)
+        self.assertAlmostEqual(angle(coords, 0, 1, 6), 109.4712)
+        self.assertAlmostEqual(abs(dihedral(coords, 2, 0, 1, 5)), 180.0)
+        self.assertAlmostEqual(dihedral(coords, 6, 1, 0, 5), 120.0)
+
+    def test_batch(self):
+        zmatrices = [WATER, METHANE, "H\nH 1 0.74", "He"]
+        batch = zmatrices_to_cartesian(zmatrices)
+        self.assertEqual(len(batch), 4)
+        for zmatrix, (elements, coords) in zip(zmatrices, batch):
+            single_elements, single_coords = zmatrices_to_cartesian([zmatrix])[0]
+            self.assertEqual(elements, single_elements)
+            self.assertTrue(np.allclose(coords, single_coords))
+        self.assertEqual(batch[3][1].tolist(), [[0.0, 0.0, 0.0]])
+
+    def test_batch_empty(self):
+        self.assertEqual(zmatrices_to_cartesian([]), [])
+
+    def test_dummy_atoms(self):
+        # Linear molecule defined through a dummy atom
+        elements, coords = zmatrices_to_cartesian(
+            ["C\nX 1 1.0\nO 1 1.16 2 90.0\nO 1 1.16 2 90.0 3 180.0"]
+        )[0]
+        self.assertEqual(elements, ["C", "O", "O"])
+        self.assertAlmostEqual(angle(coords, 1, 0, 2), 180.0)
+
+    def test_only_dummy_atoms(self):
+        with self.assertRaises(InvalidParameter):
+            zmatrices_to_cartesian(["X\nX 1 1.0"])
+
+    def test_collinear_references(self):
+        with self.assertRaises(InvalidParameter):
+            zmatrices_to_cartesian(
+                ["C\nC 1 1.2\nH 2 1.06 1 180.0\nH 1 1.06 2 180.0 3 0.0"]
+            )
+
+
+class ZMatrixInputTests(TestCase):
+    def test_structure(self):
+        structure = Structure.from_xyz(WATER)
+        self.assertEqual(structure.elements, ["O", "H", "H"])
+        self.assertAlmostEqual(distance(structure.coordinates, 0, 2), 0.96)
+
+    def test_from_zmatrices(self):
+        structures = Structure.from_zmatrices([WATER, METHANE])
+        self.assertEqual([len(s) for s in structures], [3, 5])
+
+    def test_calculation(self):
+        calc = gen_obj(software="xtb", type="sp", method="gfn2-xtb", xyz=METHANE)
+        self.assertEqual(calc.calc.structure, Structure.from_xyz(METHANE))
+
+    def test_file(self):
+        calc = gen_obj(
+            software="xtb",
+            type="sp",
+            method="gfn2-xtb",
+            file=os.path.join(STRUCTURES, "ethane.zmat"),
+        )
+        self.assertEqual(len(calc.calc.structure), 8)
+        self.assertEqual(calc.calc.name, "ethane")
+
+    def test_missing_file(self):
+        with self.assertRaises(InvalidParameter):
+            Structure.from_file("missing.zmat")
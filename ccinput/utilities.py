@@ -1,5 +1,8 @@
 import os
+import mmap
 import string
+from functools import lru_cache
+
 import numpy as np
 
 from ccinput.constants import (
@@ -19,8 +22,9 @@ from ccinput.constants import (
     BASIS_SET_EXCHANGE_KEY,
     EXCHANGE_FUNCTIONALS,
     CORRELATION_FUNCTIONALS,
+    COVALENT_RADII,
 )
-from ccinput.exceptions import InvalidParameter, InvalidXYZ
+from ccinput.exceptions import InvalidParameter, InvalidXYZ, InternalError
 
 MEMORY_FACTORS = {
     "m": 1,
@@ -99,8 +103,18 @@ def standardize_xyz(xyz):
         H 0.0 0.0 0.0
         H 1.0 0.0 0.0
     """
+    return format_xyz(*parse_xyz(xyz))
+
+
+# Smaller structures are faster to parse line by line
+VECTORIZED_XYZ_MIN_LINES = 32
+
 
-    standard_xyz = ""
+def parse_xyz(xyz):
+    """
+    Parses variations of the XYZ format (see standardize_xyz) into the list of
+    element symbols and the (n, 3) array of coordinates of the atoms.
+    """
     if isinstance(xyz, list):
         arr_xyz = xyz
     elif isinstance(xyz, str):
@@ -123,9 +137,15 @@ def standardize_xyz(xyz):
                 + f"but actually contains {len(arr_xyz) - 2} atoms"
             )
 
-    for el in arr_xyz:
-        line_data = []
+    if len(arr_xyz) >= VECTORIZED_XYZ_MIN_LINES:
+        parsed = _parse_xyz_lines(arr_xyz)
+        if parsed is not None:
+            return parsed
 
+    # Line by line parsing, which gives the exact error
+    elements = []
+    coordinates = []
+    for el in arr_xyz:
         if not isinstance(el, str):
             raise InvalidXYZ(
                 f"Could not parse xyz from array: contains element '{el}' "
@@ -139,53 +159,311 @@ def standardize_xyz(xyz):
         if not len(sel) == 4:
             raise InvalidXYZ(f"Invalid xyz: found line '{el}'")
 
-        if sel[0] not in ATOMIC_NUMBER:
-            if sel[0].isdigit():
-                try:
-                    el_Z = int(sel[0])
-                except ValueError:
-                    raise InvalidXYZ(f"Invalid atomic label: '{sel[0]}'")
-                else:
-                    if el_Z not in ATOMIC_SYMBOL:
-                        raise InvalidXYZ(f"Invalid atomic number: '{el_Z}'")
-                    el_symb = ATOMIC_SYMBOL[el_Z]
-                    line_data.append(el_symb)
-            else:
-                if sel[0].lower() in LOWERCASE_ATOMIC_SYMBOLS:
-                    line_data.append(LOWERCASE_ATOMIC_SYMBOLS[sel[0].lower()])
-                else:
-                    raise InvalidXYZ(f"Invalid atomic label: '{sel[0]}'")
-        else:
-            line_data.append(sel[0])
+        elements.append(get_element_symbol(sel[0]))
 
+        line_coordinates = []
         for coord in sel[1:]:
             try:
                 c = float(coord)
             except ValueError:
                 raise InvalidXYZ(f"Invalid atomic coordinate: '{coord}'")
             else:
-                line_data.append(c)
+                line_coordinates.append(c)
+        coordinates.append(line_coordinates)
 
-        standard_xyz += "{:<2} {:>12.8f} {:>12.8f} {:>12.8f}\n".format(*line_data)
+    return elements, np.array(coordinates, dtype=float).reshape(-1, 3)
 
-    return standard_xyz
 
+# Characters considered as whitespace by str.split
+_ASCII_WHITESPACE = np.zeros(128, dtype=bool)
+_ASCII_WHITESPACE[[ord(c) for c in string.whitespace + "\x1c\x1d\x1e\x1f"]] = True
 
-def parse_xyz_from_file(path):
+
+def _parse_xyz_lines(lines):
+    """
+    Vectorized parsing of the lines of atoms. Returns None if the lines are not
+    all valid, in which case parse_xyz parses them one by one to find the error.
+    """
+    try:
+        text = "\n".join(lines)
+    except TypeError:
+        return None
+
+    if not text.isascii():
+        return None
+
+    # Every line must contain 4 fields or be blank
+    chars = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    space = _ASCII_WHITESPACE[chars]
+    field_starts = ~space
+    field_starts[1:] &= space[:-1]
+    newlines = np.flatnonzero(chars == ord("\n"))
+    fields_per_line = np.bincount(
+        np.searchsorted(newlines, np.flatnonzero(field_starts))
+    )
+    if np.any((fields_per_line != 0) & (fields_per_line != 4)):
+        return None
+
+    fields = text.split()
+    try:
+        coordinates = np.array(
+            [fields[1::4], fields[2::4], fields[3::4]], dtype=float
+        ).T.reshape(-1, 3)
+    except ValueError:
+        return None
+
+    # Each distinct atomic label is only validated once
+    labels = fields[0::4]
+    symbols = {}
+    for label in set(labels):
+        try:
+            symbols[label] = get_element_symbol(label)
+        except InvalidXYZ:
+            return None
+
+    return [symbols[label] for label in labels], coordinates
+
+
+def get_element_symbol(label):
+    """
+    Returns the element symbol of an atomic label: element symbol in any case
+    or atomic number. Raises InvalidXYZ if the label is invalid.
+    """
+    if label in ATOMIC_NUMBER:
+        return label
+
+    if label.isdigit():
+        try:
+            el_Z = int(label)
+        except ValueError:
+            raise InvalidXYZ(f"Invalid atomic label: '{label}'")
+        if el_Z not in ATOMIC_SYMBOL:
+            raise InvalidXYZ(f"Invalid atomic number: '{el_Z}'")
+        return ATOMIC_SYMBOL[el_Z]
+
+    if label.lower() in LOWERCASE_ATOMIC_SYMBOLS:
+        return LOWERCASE_ATOMIC_SYMBOLS[label.lower()]
+    raise InvalidXYZ(f"Invalid atomic label: '{label}'")
+
+
+def format_xyz(elements, coordinates):
+    """Returns the standard XYZ string of the atoms (see standardize_xyz)"""
+    if len(elements) == 0:
+        return ""
+
+    # All the lines are formatted in one operation
+    values = np.empty((len(elements), 4), dtype=object)
+    values[:, 0] = elements
+    values[:, 1:] = np.asarray(coordinates, dtype=float).tolist()
+    return ("%-2s %12.8f %12.8f %12.8f\n" * len(elements)) % tuple(
+        values.ravel().tolist()
+    )
+
+
+def read_xyz_file(path):
+    """Returns the lines of the atoms of an XYZ file"""
     if not os.path.isfile(path):
         raise InvalidParameter(f"Input file not found: {path}")
 
     with open(path) as f:
         _lines = f.readlines()
 
-    lines = _lines[2:]
-
     if len(_lines) < 3:
         raise InvalidXYZ("Invalid XYZ: No atoms specified")
 
-    lines = [i.strip() for i in _lines[2:] if i.strip() != ""]
+    lines = [line.strip() for line in _lines[2:]]
 
-    return standardize_xyz(lines)
+    return [line for line in lines if line != ""]
+
+
+def _read_xyz_frame(header, readline):
+    """
+    Reads the frame starting with the given header line (number of atoms), the
+    following lines being read with readline. Returns the comment line and the
+    lines of the atoms.
+    """
+    try:
+        num_atoms = int(header)
+    except ValueError:
+        raise InvalidXYZ(f"Invalid xyz header: found line '{header.strip()}'")
+
+    comment = readline().strip()
+    lines = [readline().strip() for i in range(num_atoms)]
+    if num_atoms < 1 or "" in lines:
+        num_found = len([i for i in lines if i != ""])
+        raise InvalidXYZ(
+            f"Invalid xyz header: {num_atoms} atoms specified, "
+            + f"but actually contains {num_found} atoms"
+        )
+    return comment, lines
+
+
+def iter_xyz_frames(path):
+    """
+    Reads the frames of a multi-frame XYZ file (trajectory, conformer ensemble)
+    one at a time. Yields the comment line and the lines of the atoms of each
+    frame; the file is never read completely in memory.
+    """
+    if not os.path.isfile(path):
+        raise InvalidParameter(f"Input file not found: {path}")
+
+    with open(path) as f:
+        for line in f:
+            if line.strip() == "":
+                continue
+            yield _read_xyz_frame(line, f.readline)
+
+
+# Suffix of the frame indexes saved next to the multi-frame XYZ files
+XYZ_FRAME_INDEX_SUFFIX = ".frames.npy"
+
+# Number of bytes searched for line breaks at once when indexing the frames
+XYZ_FRAME_INDEX_CHUNK_SIZE = 2**26
+
+
+def build_xyz_frame_index(path):
+    """
+    Returns the byte offsets of the frames of a multi-frame XYZ file as an
+    array. The file is memory-mapped and only the header lines of the frames
+    are read; the atoms are validated when the frames are read.
+    """
+    if not os.path.isfile(path):
+        raise InvalidParameter(f"Input file not found: {path}")
+
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    offsets = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+
+        next_header = 0  # Line number of the header of the next frame
+        num_lines = 0  # Number of lines in the previous chunks
+        for start in range(0, size, XYZ_FRAME_INDEX_CHUNK_SIZE):
+            chunk = np.frombuffer(
+                mm[start : start + XYZ_FRAME_INDEX_CHUNK_SIZE], dtype=np.uint8
+            )
+            line_starts = np.flatnonzero(chunk == ord("\n")) + start + 1
+            if start == 0:
+                line_starts = np.concatenate(([0], line_starts))
+            line_starts = line_starts[line_starts < size]
+
+            while next_header < num_lines + len(line_starts):
+                pos = int(line_starts[next_header - num_lines])
+                end = mm.find(b"\n", pos)
+                header = mm[pos : end if end != -1 else size].decode()
+
+                if header.strip() == "":
+                    next_header += 1
+                    continue
+
+                try:
+                    num_atoms = int(header)
+                except ValueError:
+                    raise InvalidXYZ(
+                        f"Invalid xyz header: found line '{header.strip()}'"
+                    )
+                if num_atoms < 1:
+                    raise InvalidXYZ(f"Invalid xyz header: {num_atoms} atoms specified")
+
+                offsets.append(pos)
+                next_header += num_atoms + 2
+            num_lines += len(line_starts)
+
+    if next_header > num_lines:
+        num_found = max(num_lines - next_header + num_atoms, 0)
+        raise InvalidXYZ(
+            f"Invalid xyz header: {num_atoms} atoms specified, "
+            + f"but actually contains {num_found} atoms"
+        )
+    return np.array(offsets, dtype=np.int64)
+
+
+def load_xyz_frame_index(path, persist=False):
+    """
+    Returns the frame index of a multi-frame XYZ file (see build_xyz_frame_index).
+    If persist is True, the index is saved next to the file and reused as long
+    as the file is not modified.
+    """
+    index_path = path + XYZ_FRAME_INDEX_SUFFIX
+    if not os.path.isfile(path):
+        raise InvalidParameter(f"Input file not found: {path}")
+
+    # The index starts with the size and modification time of the file
+    stat = os.stat(path)
+    signature = [stat.st_size, stat.st_mtime_ns]
+
+    if os.path.isfile(index_path):
+        try:
+            saved = np.load(index_path)
+        except (OSError, ValueError):
+            saved = None
+        if saved is not None and saved[:2].tolist() == signature:
+            return saved[2:]
+
+    index = build_xyz_frame_index(path)
+    if persist:
+        try:
+            with open(index_path, "wb") as out:
+                np.save(out, np.concatenate((signature, index)).astype(np.int64))
+        except OSError as e:
+            # The index is still usable without being saved
+            warn(f"Could not save the frame index to {index_path}: {e}")
+    return index
+
+
+def iter_xyz_frame_range(path, start, stop, index=None, persist=False):
+    """
+    Yields the comment line and the lines of the atoms of the frames start to
+    stop (excluded, counting from 0, None for the last frame) of a multi-frame
+    XYZ file. Only the requested frames are read, using the frame index of the
+    file.
+    """
+    if index is None:
+        index = load_xyz_frame_index(path, persist=persist)
+
+    if stop is None:
+        stop = len(index)
+
+    if not 0 <= start < stop <= len(index):
+        raise InvalidParameter(
+            f"Invalid frame range: {start + 1}-{stop} "
+            + f"(the file contains {len(index)} frames)"
+        )
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for i in range(start, stop):
+            mm.seek(int(index[i]))
+            yield _read_xyz_frame(
+                mm.readline().decode(), lambda: mm.readline().decode()
+            )
+
+
+def parse_frame_range(frame_range):
+    """
+    Parses a range of frames given as "first-last" or "frame" (counting from 1,
+    inclusive). Returns the start and stop of the range counting from 0, like
+    for iter_xyz_frame_range. The last frame can be omitted ("first-").
+    """
+    first, sep, last = str(frame_range).partition("-")
+    try:
+        start = int(first) - 1
+        if not sep:
+            stop = start + 1
+        elif last.strip() == "":
+            stop = None
+        else:
+            stop = int(last)
+    except ValueError:
+        raise InvalidParameter(f"Invalid frame range: '{frame_range}'")
+
+    if start < 0 or (stop is not None and stop <= start):
+        raise InvalidParameter(f"Invalid frame range: '{frame_range}'")
+    return start, stop
+
+
+def parse_xyz_from_file(path):
+    return standardize_xyz(read_xyz_file(path))
 
 
 def indexify(txt):
@@ -202,49 +480,76 @@ def get_theory_level(method):
     return "dft"
 
 
+def build_synonym_index(*tables):
+    """
+    Returns a dictionary mapping every canonical name of the tables and all its
+    synonyms to the canonical name. The tables are {canonical: [synonyms]}
+    dictionaries. Raises an InternalError if a synonym is used for different
+    canonical names.
+    """
+    index = {}
+    for table in tables:
+        for canonical, synonyms in table.items():
+            for synonym in [canonical, *synonyms]:
+                if index.setdefault(synonym, canonical) != canonical:
+                    raise InternalError(
+                        f"Synonym '{synonym}' used for both "
+                        f"'{index[synonym]}' and '{canonical}'"
+                    )
+    return index
+
+
+SYNONYM_TABLES = {
+    "type": (SYN_TYPES,),
+    "software": (SYN_SOFTWARE,),
+    "method": (SYN_METHODS,),
+    "basis_set": (SYN_BASIS_SETS, dict.fromkeys(BASIS_SET_EXCHANGE_KEY, [])),
+    "solvent": (SYN_SOLVENTS,),
+}
+
+
+@lru_cache(maxsize=None)
+def get_synonym_index(name):
+    """Returns the synonym index of one of the SYNONYM_TABLES (built on first use)"""
+    return build_synonym_index(*SYNONYM_TABLES[name])
+
+
 def get_abs_type(str_type):
     """
     Converts a string calculation type into the correct CalcType.
     Takes into account different equivalent ways to write the calculation types.
     """
-    _str_type = indexify(str_type)
-    for calc_type, synonyms in SYN_TYPES.items():
-        if _str_type in synonyms:
-            return calc_type
+    calc_type = get_synonym_index("type").get(indexify(str_type))
+    if calc_type is not None:
+        return calc_type
 
     raise InvalidParameter(f"Invalid calculation type: '{str_type}'")
 
 
 def get_abs_software(software):
-    _software = indexify(software)
-    for s in SYN_SOFTWARE:
-        if _software in SYN_SOFTWARE[s] or _software == s:
-            return s
+    abs_software = get_synonym_index("software").get(indexify(software))
+    if abs_software is not None:
+        return abs_software
     raise InvalidParameter(f"Unknown software package: '{software}'")
 
 
 def get_abs_method(method, trust_me=False):
-    _method = indexify(method)
-    for m in SYN_METHODS:
-        if _method in SYN_METHODS[m] or _method == m:
-            return m
+    abs_method = get_synonym_index("method").get(indexify(method))
+    if abs_method is not None:
+        return abs_method
 
     if trust_me:
         warn(f"Using unknown method '{method}'")
-        return m
+        return method
     else:
         raise InvalidParameter(f"Unknown method: '{method}'")
 
 
 def get_abs_basis_set(basis_set, trust_me=False):
-    _bs = indexify(basis_set)
-
-    for bs in SYN_BASIS_SETS:
-        if _bs.lower() in SYN_BASIS_SETS[bs] or _bs.lower() == bs:
-            return bs
-    for bs in BASIS_SET_EXCHANGE_KEY:
-        if _bs.lower() == bs:
-            return bs
+    abs_basis_set = get_synonym_index("basis_set").get(indexify(basis_set))
+    if abs_basis_set is not None:
+        return abs_basis_set
+
     if trust_me:
         warn(f"Using unknown basis set '{basis_set}'")
         return basis_set
@@ -256,9 +561,11 @@ def get_abs_solvent(solvent, trust_me=False):
     _solvent = indexify(solvent)
     if _solvent in ["", "vacuum", "vac"]:
         return ""
-    for solv in SYN_SOLVENTS:
-        if _solvent in SYN_SOLVENTS[solv] or _solvent == solv:
-            return solv
+
+    abs_solvent = get_synonym_index("solvent").get(_solvent)
+    if abs_solvent is not None:
+        return abs_solvent
+
     if trust_me:
         warn(f"Using unknown solvent '{solvent}'")
         return solvent
@@ -266,25 +573,107 @@ def get_abs_solvent(solvent, trust_me=False):
         raise InvalidParameter(f"Unknown solvent: '{solvent}'")
 
 
+def build_prefix_trie(words):
+    """
+    Returns a trie of the words as nested dictionaries indexed by character.
+    The node at the end of each word contains the position of the word in
+    words under the "" key.
+    """
+    trie = {}
+    for i, word in enumerate(words):
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node.setdefault("", i)
+    return trie
+
+
+@lru_cache(maxsize=None)
+def get_exchange_trie(software):
+    return build_prefix_trie(list(EXCHANGE_FUNCTIONALS[software]))
+
+
 def is_exchange_correlation_combination(method, software):
+    """
+    Returns the keyword of the method if it is the combination of an exchange
+    and a correlation functional for the software, False otherwise. If
+    multiple combinations are possible, the first exchange functional of
+    EXCHANGE_FUNCTIONALS is used.
+    """
+    correlation_functionals = CORRELATION_FUNCTIONALS[software]
+
+    # Position of the exchange functional and length of the prefix
+    best = None
+    node = get_exchange_trie(software)
+    for length in range(len(method) + 1):
+        if "" in node and method[length:] in correlation_functionals:
+            if best is None or node[""] < best[0]:
+                best = (node[""], length)
+        if length == len(method) or method[length] not in node:
+            break
+        node = node[method[length]]
+
+    if best is None:
+        return False
+
     fill = ""
     if software == "nwchem":
         fill = " "
+    length = best[1]
+    return (
+        EXCHANGE_FUNCTIONALS[software][method[:length]]
+        + fill
+        + correlation_functionals[method[length:]]
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_exchange_correlation_combinations(software):
+    combinations = {}
     for x in EXCHANGE_FUNCTIONALS[software]:
-        if method[: len(x)] == x:
-            if method[len(x) :] in CORRELATION_FUNCTIONALS[software]:
-                return (
-                    EXCHANGE_FUNCTIONALS[software][method[: len(x)]]
-                    + fill
-                    + CORRELATION_FUNCTIONALS[software][method[len(x) :]]
+        for c in CORRELATION_FUNCTIONALS[software]:
+            # Same priority as is_exchange_correlation_combination
+            if x + c not in combinations:
+                combinations[x + c] = is_exchange_correlation_combination(
+                    x + c, software
                 )
-    return False
+    return combinations
+
+
+def get_exchange_correlation_combinations(software):
+    """
+    Returns all the combinations of exchange and correlation functionals of the
+    software as a dictionary mapping the lowercase name of the combination
+    (as accepted by is_exchange_correlation_combination) to its keyword.
+    """
+    return dict(_get_exchange_correlation_combinations(software))
+
+
+# Maximum number of resolved keywords kept in memory by get_method,
+# get_basis_set and get_solvent (per function)
+RESOLUTION_CACHE_SIZE = 1024
+
+
+def _replay(resolution):
+    keyword, warnings = resolution
+    for msg in warnings:
+        warn(msg)
+    return keyword
 
 
 def get_method(method, software):
+    """
+    Returns the keyword of the method for the software. The resolution is
+    memoized along with its warnings, which are emitted again on every call.
+    """
+    return _replay(_resolve_method(method, software))
+
+
+@lru_cache(maxsize=RESOLUTION_CACHE_SIZE)
+def _resolve_method(method, software):
     if software == "pyscf":
         # PySCF already handles synonyms to some extent
-        return method
+        return method, ()
 
     try:
         abs_method = get_abs_method(method)
@@ -299,19 +688,20 @@ def get_method(method, software):
                 else:
                     if abs_method in SOFTWARE_METHODS[software]:
                         return (
-                            method[0].upper() + SOFTWARE_METHODS[software][abs_method]
+                            method[0].upper() + SOFTWARE_METHODS[software][abs_method],
+                            (),
                         )
 
                 xc_check = is_exchange_correlation_combination(
                     method.lower()[1:], software
                 )
                 if isinstance(xc_check, str):
-                    return method[0].upper() + xc_check
+                    return method[0].upper() + xc_check, ()
 
             xc_check = is_exchange_correlation_combination(method.lower(), software)
             if isinstance(xc_check, str):
-                return xc_check
-            warn(f"Unknown method '{method}'")
+                return xc_check, ()
+            return method, (f"Unknown method '{method}'",)
         if software == "nwchem":
             if method.lower()[0] in ["u", "r"]:
                 try:
@@ -320,61 +710,87 @@ def get_method(method, software):
                     pass
                 else:
                     if abs_method in SOFTWARE_METHODS[software]:
-                        return method[0] + SOFTWARE_METHODS[software][abs_method]
+                        return method[0] + SOFTWARE_METHODS[software][abs_method], ()
             # nwchem also supports combination of functionals
             if len(method.split()) == 2:
                 xc_check = is_exchange_correlation_combination(
                     indexify(method), "nwchem"
                 )
                 if isinstance(xc_check, str):
-                    return xc_check
-            warn(f"Unknown method '{method}'")
-        return method
+                    return xc_check, ()
+            return method, (f"Unknown method '{method}'",)
+        return method, ()
 
     else:
         if abs_method not in SOFTWARE_METHODS[software]:
-            warn(f"Unknown method for this package: '{method}'")
-            return method
+            return method, (f"Unknown method for this package: '{method}'",)
 
-        return SOFTWARE_METHODS[software][abs_method]
+        return SOFTWARE_METHODS[software][abs_method], ()
 
 
 def get_basis_set(basis_set, software):
+    """Returns the keyword of the basis set for the software (memoized)"""
+    return _replay(_resolve_basis_set(basis_set, software))
+
+
+@lru_cache(maxsize=RESOLUTION_CACHE_SIZE)
+def _resolve_basis_set(basis_set, software):
     if software == "pyscf":
         # PySCF already handles synonyms to some extent
-        return basis_set
+        return basis_set, ()
 
     try:
         abs_basis_set = get_abs_basis_set(basis_set)
     except InvalidParameter:
-        warn(f"Unknown basis set '{basis_set}'")
-        return basis_set
+        return basis_set, (f"Unknown basis set '{basis_set}'",)
 
     if abs_basis_set in SOFTWARE_BASIS_SETS[software]:
-        return SOFTWARE_BASIS_SETS[software][abs_basis_set]
+        return SOFTWARE_BASIS_SETS[software][abs_basis_set], ()
     else:
-        return BASIS_SET_EXCHANGE_KEY[abs_basis_set]
+        return BASIS_SET_EXCHANGE_KEY[abs_basis_set], ()
 
 
 def get_solvent(solvent, software, solvation_model="smd"):
+    """Returns the keyword of the solvent for the software (memoized)"""
+    return _replay(_resolve_solvent(solvent, software, solvation_model))
+
+
+@lru_cache(maxsize=RESOLUTION_CACHE_SIZE)
+def _resolve_solvent(solvent, software, solvation_model):
     try:
         abs_solvent = get_abs_solvent(solvent)
     except InvalidParameter:
-        warn(f"Unknown solvent '{solvent}'")
-        return solvent
+        return solvent, (f"Unknown solvent '{solvent}'",)
 
     if software in ("orca", "qchem") and abs_solvent == "noctanol":
         # Weird exception in ORCA
         if solvation_model == "smd":
-            return "1-octanol"
+            return "1-octanol", ()
         elif solvation_model == "cpcm":
-            return "octanol"
+            return "octanol", ()
         # Note that ch2cl2 is a valid keyword for SMD, although not listed in the manual
 
     if abs_solvent == "":
-        return abs_solvent
+        return abs_solvent, ()
+
+    return SOFTWARE_SOLVENTS[software][abs_solvent], ()
 
-    return SOFTWARE_SOLVENTS[software][abs_solvent]
+
+RESOLUTION_CACHES = {
+    "method": _resolve_method,
+    "basis_set": _resolve_basis_set,
+    "solvent": _resolve_solvent,
+}
+
+
+def resolution_cache_info():
+    """Returns the statistics of the keyword resolution caches"""
+    return {name: fn.cache_info() for name, fn in RESOLUTION_CACHES.items()}
+
+
+def clear_resolution_caches():
+    for fn in RESOLUTION_CACHES.values():
+        fn.cache_clear()
 
 
 def has_dispersion_parameters(method, version="d3"):
@@ -447,6 +863,166 @@ def get_coord(xyz, ids):
         raise InvalidParameter(f"Invalid number of atoms: {len(ids)}")
 
 
+def _row_dot(a, b):
+    # Stacked matrix products give the same results as the dot product of each row
+    return np.matmul(a[:, np.newaxis, :], b[:, :, np.newaxis])[:, 0, 0]
+
+
+def _row_norm(a):
+    return np.sqrt(_row_dot(a, a))
+
+
+def get_coords(coordinates, ids):
+    """
+    Returns the distances, angles and dihedral angles between groups of atoms
+    (one-indexed), like get_coord, for all the groups at once. The coordinates
+    are given as an (n, 3) array.
+    """
+    coordinates = np.asarray(coordinates, dtype=float)
+    values = np.empty(len(ids))
+
+    groups = {}
+    for i, group in enumerate(ids):
+        groups.setdefault(len(group), []).append(i)
+
+    for size, indices in groups.items():
+        if size not in (2, 3, 4):
+            raise InvalidParameter(f"Invalid number of atoms: {size}")
+
+        atoms = coordinates[np.array([ids[i] for i in indices], dtype=int) - 1]
+        if size == 2:
+            values[indices] = _row_norm(atoms[:, 0] - atoms[:, 1])
+        elif size == 3:
+            v1 = atoms[:, 0] - atoms[:, 1]
+            v2 = atoms[:, 2] - atoms[:, 1]
+            values[indices] = (
+                np.arccos(_row_dot(v1, v2) / (_row_norm(v1) * _row_norm(v2)))
+                * 180
+                / np.pi
+            )
+        else:
+            v1 = atoms[:, 1] - atoms[:, 0]
+            v2 = atoms[:, 2] - atoms[:, 1]
+            v3 = atoms[:, 3] - atoms[:, 2]
+
+            n1 = np.cross(v1, v2)
+            n1 = n1 / _row_norm(n1)[:, np.newaxis]
+
+            n2 = np.cross(v2, v3)
+            n2 = n2 / _row_norm(n2)[:, np.newaxis]
+
+            m1 = np.cross(n1, v2 / _row_norm(v2)[:, np.newaxis])
+            x = _row_dot(n1, n2)
+            y = _row_dot(m1, n2)
+
+            values[indices] = np.arctan2(y, x) * 180 / np.pi
+    return values
+
+
+# Two atoms are bonded if their distance is below the sum of their covalent radii plus this tolerance (Å)
+COVALENT_BOND_TOLERANCE = 0.4
+
+# Covalent radius of the elements without one in COVALENT_RADII (Å)
+DEFAULT_COVALENT_RADIUS = 1.5
+
+
+# Offsets of the neighbouring cells searched from each cell: the cell itself and half of
+# its 26 neighbours, so that each pair of cells is only searched once
+CELL_OFFSETS = [(0, 0, 0)] + [
+    (i, j, k)
+    for i in (-1, 0, 1)
+    for j in (-1, 0, 1)
+    for k in (-1, 0, 1)
+    if (i, j, k) > (0, 0, 0)
+]
+
+
+def get_bonds(elements, coordinates):
+    """
+    Returns the pairs of bonded atoms (zero-indexed, (m, 2) array sorted by
+    first then second atom) as detected from the covalent radii of the atoms.
+
+    The pairs are searched with a cell list: the atoms are hashed into cubic
+    cells as large as the longest possible bond, so only the atoms of
+    neighbouring cells are compared and the cost grows linearly with the
+    number of atoms.
+    """
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 3)
+    radii = np.array(
+        [COVALENT_RADII.get(el, DEFAULT_COVALENT_RADIUS) for el in elements]
+    )
+    if len(radii) < 2:
+        return np.zeros((0, 2), dtype=int)
+
+    cell_size = 2 * radii.max() + COVALENT_BOND_TOLERANCE
+
+    # Padding of one cell on each side, so that neighbouring cells never wrap around
+    cells = np.floor((coordinates - coordinates.min(axis=0)) / cell_size).astype(
+        np.int64
+    )
+    cells += 1
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    first = []
+    second = []
+    for offset in CELL_OFFSETS:
+        neighbour_keys = keys + (offset[0] * dims[1] + offset[1]) * dims[2] + offset[2]
+        starts = np.searchsorted(sorted_keys, neighbour_keys, side="left")
+        ends = np.searchsorted(sorted_keys, neighbour_keys, side="right")
+        counts = ends - starts
+
+        # All the atoms of the neighbouring cell of each atom
+        atoms = np.repeat(np.arange(len(keys)), counts)
+        positions = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        others = order[np.repeat(starts, counts) + positions]
+
+        if offset == (0, 0, 0):
+            same_cell = atoms < others
+            atoms, others = atoms[same_cell], others[same_cell]
+
+        distances = np.linalg.norm(coordinates[atoms] - coordinates[others], axis=1)
+        bonded = distances < radii[atoms] + radii[others] + COVALENT_BOND_TOLERANCE
+        first.append(atoms[bonded])
+        second.append(others[bonded])
+
+    first = np.concatenate(first)
+    second = np.concatenate(second)
+    bonds = np.stack([np.minimum(first, second), np.maximum(first, second)], axis=1)
+    return bonds[np.lexsort((bonds[:, 1], bonds[:, 0]))]
+
+
+def get_fragments(elements, coordinates):
+    """
+    Returns the fragment of each atom (numbered from 1 in order of first atom)
+    as the connected components of the bonds of get_bonds.
+    """
+    bonds = get_bonds(elements, coordinates)
+    labels = np.arange(len(elements))
+
+    # Each atom takes the lowest label of its neighbours, then follows the labels
+    # until they point to themselves
+    a, b = bonds[:, 0], bonds[:, 1]
+    while True:
+        previous = labels.copy()
+        np.minimum.at(labels, a, labels[b])
+        np.minimum.at(labels, b, labels[a])
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels, previous):
+            break
+
+    return np.unique(labels, return_inverse=True)[1] + 1
+
+
 def warn(msg):
     print(f"*** {msg} ***")
 
@@ -492,15 +1068,15 @@ def add_fragments_xyz(xyz, frag):
     return xyz_frag
 
 
-def check_fragments(counterpoise, fragments, xyz):
-    """Checks if the fragments are reasonably defined"""
+def check_fragments(counterpoise, fragments, structure):
+    """Checks if the fragments are reasonably defined for the atoms of the structure"""
     fragments = fragments.split(",")
     try:
         fragments = [int(i) for i in fragments]
     except:
         raise InvalidParameter("Fragment numbers must be integers")
     unique_fragments = list(set(fragments))
-    if len([i + "\n" for i in clean_xyz(xyz).split("\n") if i != ""]) != len(fragments):
+    if len(structure) != len(fragments):
         raise InvalidParameter("You must assign exactly one fragment to each atom")
     elif sorted(unique_fragments) != list(range(1, max(unique_fragments) + 1)):
         raise InvalidParameter("Fragment numbers must start from 1")
@@ -1,18 +1,19 @@
 import os
 import sys
+import copy
 import shlex
+import inspect
+import importlib
+import itertools
+import threading
+import concurrent.futures
+from collections.abc import Mapping
+from contextlib import redirect_stdout
 
 from ccinput.__init__ import __version__
-from ccinput.packages.gaussian import GaussianCalculation
-from ccinput.packages.orca import OrcaCalculation
-from ccinput.packages.nwchem import NWChemCalculation
-from ccinput.packages.qchem import QChemCalculation
-from ccinput.packages.xtb import XtbCalculation
-from ccinput.drivers.pysis import PysisDriver
-from ccinput.packages.psi4 import Psi4Calculation
-from ccinput.packages.pyscf import PySCFCalculation
 
 from ccinput.calculation import (
+    Structure,
     Calculation,
     Parameters,
     Constraint,
@@ -20,13 +21,21 @@ from ccinput.calculation import (
     parse_freeze_constraints,
     parse_scan_constraints,
 )
+from ccinput.scan import gen_scan_points
+from ccinput.archives import ArchiveWriter, get_archive_format
+from ccinput.constants import CalcType
 from ccinput.utilities import (
     get_abs_type,
     get_abs_software,
-    standardize_xyz,
-    parse_xyz_from_file,
+    get_charge_mult_from_name,
+    parse_frame_range,
     warn,
 )
+from ccinput.molecule_files import (
+    MoleculeRecord,
+    is_molecule_file,
+    iter_molecule_records,
+)
 from ccinput.exceptions import *
 from ccinput.presets import (
     save_preset,
@@ -36,25 +45,137 @@ from ccinput.presets import (
     is_preset,
 )
 
-SOFTWARE_CLASSES = {
-    "gaussian": GaussianCalculation,
-    "orca": OrcaCalculation,
-    "nwchem": NWChemCalculation,
-    "xtb": XtbCalculation,
-    "pysis": PysisDriver,
-    "pysisyphus": PysisDriver,
-    "qchem": QChemCalculation,
-    "psi4": Psi4Calculation,
-    "pyscf": PySCFCalculation,
+# Classes of the packages and drivers as "module:class", imported on first use
+SOFTWARE_BACKENDS = {
+    "gaussian": "ccinput.packages.gaussian:GaussianCalculation",
+    "orca": "ccinput.packages.orca:OrcaCalculation",
+    "nwchem": "ccinput.packages.nwchem:NWChemCalculation",
+    "xtb": "ccinput.packages.xtb:XtbCalculation",
+    "pysis": "ccinput.drivers.pysis:PysisDriver",
+    "pysisyphus": "ccinput.drivers.pysis:PysisDriver",
+    "qchem": "ccinput.packages.qchem:QChemCalculation",
+    "psi4": "ccinput.packages.psi4:Psi4Calculation",
+    "pyscf": "ccinput.packages.pyscf:PySCFCalculation",
 }
 
+# Entry point group through which other packages can provide backends
+BACKEND_ENTRY_POINT_GROUP = "ccinput.backends"
+
+# Number of chunks of structures sent to each process with --jobs, to balance
+# the load while limiting the communication between the processes
+PARALLEL_CHUNKS_PER_JOB = 4
+
+
+def load_backend(path):
+    """Imports the class of a backend from its "module:class" path"""
+    module_name, class_name = path.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def get_backend_entry_points():
+    """Returns the backends declared by the installed packages as {name: entry point}"""
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python < 3.8
+        return {}
+
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        eps = eps.select(group=BACKEND_ENTRY_POINT_GROUP)
+    else:
+        eps = eps.get(BACKEND_ENTRY_POINT_GROUP, [])
+    return {ep.name.lower(): ep for ep in eps}
+
+
+class BackendRegistry(Mapping):
+    """
+    Mapping from the name of a package or driver to the class which generates
+    its input. The module of each backend is only imported when its class is
+    first requested.
+
+    Other backends can be added with register or declared by other packages in
+    the "ccinput.backends" entry point group (e.g., "mydriver =
+    mypackage.module:MyDriver"). Entry points are only looked up for names
+    which are not registered and cannot replace the built-in backends.
+    """
+
+    def __init__(self, backends):
+        self._paths = dict(backends)
+        self._classes = {}
+        self._entry_points = None
+        self._lock = threading.Lock()
+
+    def register(self, name, backend):
+        """Registers a class or a "module:class" path under the name"""
+        with self._lock:
+            name = name.lower()
+            self._classes.pop(name, None)
+            if isinstance(backend, str):
+                self._paths[name] = backend
+            else:
+                self._paths[name] = None
+                self._classes[name] = backend
+
+    def _get_entry_points(self):
+        if self._entry_points is None:
+            self._entry_points = get_backend_entry_points()
+        return self._entry_points
+
+    def __getitem__(self, name):
+        name = name.lower()
+        cls = self._classes.get(name)
+        if cls is not None:
+            return cls
+
+        with self._lock:
+            if name in self._classes:
+                return self._classes[name]
+
+            if name in self._paths:
+                cls = load_backend(self._paths[name])
+            elif name in self._get_entry_points():
+                cls = self._get_entry_points()[name].load()
+            else:
+                raise KeyError(name)
+
+            self._classes[name] = cls
+            return cls
+
+    def __contains__(self, name):
+        name = name.lower()
+        return name in self._paths or name in self._get_entry_points()
+
+    def __iter__(self):
+        names = list(self._paths)
+        names += [name for name in self._get_entry_points() if name not in names]
+        return iter(names)
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+    def is_loaded(self, name):
+        return name.lower() in self._classes
+
+
+SOFTWARE_CLASSES = BackendRegistry(SOFTWARE_BACKENDS)
+
+
+def register_backend(name, backend):
+    """Adds a package or driver (class or "module:class" path) to SOFTWARE_CLASSES"""
+    SOFTWARE_CLASSES.register(name, backend)
+
 
 def process_calculation(calc):
     if calc.driver in ["none", None, ""] or calc.driver == calc.parameters.software:
-        cls = SOFTWARE_CLASSES[calc.parameters.software](calc)
+        name = calc.parameters.software
     else:
-        cls = SOFTWARE_CLASSES[calc.driver](calc)
-    return cls
+        name = calc.driver
+
+    try:
+        backend = SOFTWARE_CLASSES[name]
+    except KeyError:
+        raise InvalidParameter(f"Unknown software package or driver: '{name}'")
+    return backend(calc)
 
 
 def generate_calculation(
@@ -91,8 +212,18 @@ def generate_calculation(
     driver="none",
     trust_me=False,
     fragments=None,
+    parameters=None,
     **kwargs,
 ):
+    """
+    Returns the object of the package generating the input of the calculation.
+
+    The Parameters built by gen_parameters from the same arguments can be
+    given as "parameters" to skip their resolution; they are then used as is.
+    """
+    # Arguments of the call, from which the Parameters are built
+    args = dict(locals())
+
     if software is None:
         raise InvalidParameter("Specify a software package to use")
 
@@ -102,7 +233,8 @@ def generate_calculation(
     if xyz == "":
         raise InvalidParameter("No input structure")
 
-    xyz_structure = standardize_xyz(xyz)
+    # The structure is parsed once and shared by the constraints and the package
+    xyz_structure = Structure.from_xyz(xyz)
 
     abs_software = get_abs_software(software)
 
@@ -111,22 +243,10 @@ def generate_calculation(
 
     calc_type = get_abs_type(type)
 
-    params = Parameters(
-        abs_software,
-        solvent,
-        solvation_model,
-        solvation_radii,
-        custom_solvation_radii,
-        basis_set,
-        method,
-        specifications,
-        density_fitting,
-        custom_basis_sets,
-        d3,
-        d3bj,
-        trust_me,
-        **kwargs,
-    )
+    if parameters is None:
+        params = build_parameters(args)
+    else:
+        params = parameters
 
     _constraints = parse_str_constraints(
         constraints, xyz_structure, software=abs_software
@@ -162,9 +282,15 @@ def generate_calculation(
 
 
 def gen_obj(**args):
+    set_structure_from_file(args, args.pop("record_charge", False))
+    return generate_calculation(**args)
+
+
+def set_structure_from_file(args, record_charge=False):
+    """Parses the structure of the "file" argument, if any, as "xyz" argument"""
     if "file" in args:
         if args["file"] is None:
-            pass
+            path = None
         elif isinstance(args["file"], list):
             if len(args["file"]) > 1:
                 print("file", args["file"])
@@ -172,13 +298,281 @@ def gen_obj(**args):
                     "No support for multiple input files at once except from the command line"
                 )
             else:
-                xyz = parse_xyz_from_file(args["file"][0])
-                args["xyz"] = xyz
+                path = args["file"][0]
         else:
-            xyz = parse_xyz_from_file(args["file"])
-            args["xyz"] = xyz
+            path = args["file"]
+
+        if path is None:
+            pass
+        elif is_molecule_file(path):
+            # Only the first molecule of the file is used
+            record = next(iter_molecule_records(path), None)
+            if record is None:
+                raise InvalidParameter(f"No molecule found in the file: {path}")
+            args["xyz"] = record.structure
+            if record_charge:
+                set_record_charge(args, record)
+        else:
+            args["xyz"] = Structure.from_file(path)
+
+
+def set_record_charge(args, record):
+    """Uses the charge and multiplicity of a molecule record (SDF, MOL2) when specified"""
+    if args.get("parse_name"):
+        raise InvalidParameter(
+            "Cannot use both the charge of the records and the file name"
+        )
+
+    if record.charge is not None:
+        args["charge"] = record.charge
+    if record.multiplicity is not None:
+        args["multiplicity"] = record.multiplicity
+
+
+def gen_frame_objs(**args):
+    """
+    Generates one calculation per frame of the multi-frame XYZ file given as
+    "file" (trajectory, conformer ensemble), or per molecule of an SDF or MOL2
+    file. The frames are read and processed one at a time. The calculations
+    are named after the file (or the given name) and the index of the frame,
+    starting from 1.
+
+    Only the frames of "frame_range" ("first-last", see parse_frame_range) are
+    generated if given. In XYZ files, they are found with the frame index of
+    the file, which is saved next to it if "save_frame_index" is True.
+
+    If "record_charge" is True, the charge and multiplicity of the molecules
+    of SDF and MOL2 files are used when specified. If "output" is given, the
+    outputs of the frames follow it as pattern (see get_output_path).
+    """
+    path = args.pop("file", None)
+    if isinstance(path, list):
+        if len(path) > 1:
+            raise UnimplementedError(
+                "No support for multiple input files at once except from the command line"
+            )
+        path = path[0]
+
+    if path is None:
+        raise InvalidParameter("Specify a multi-frame XYZ file")
+
+    args.pop("xyz", None)
+    name = args.pop("name", None) or os.path.splitext(os.path.basename(path))[0]
+
+    start, stop = 0, None
+    if args.get("frame_range"):
+        start, stop = parse_frame_range(args["frame_range"])
+    args.pop("frame_range", None)
+    save_frame_index = args.pop("save_frame_index", False)
+    record_charge = args.pop("record_charge", False)
+    output = args.pop("output", None)
+
+    # The frames are not files of their own (e.g., for the xtb command)
+    if args.pop("parse_name", False):
+        if record_charge:
+            raise InvalidParameter(
+                "Cannot use both the charge of the records and the file name"
+            )
+        args["charge"], args["multiplicity"] = get_charge_mult_from_name(path)
+
+    if is_molecule_file(path):
+        frames = itertools.islice(iter_molecule_records(path), start, stop)
+    else:
+        frames = (
+            MoleculeRecord(comment, structure, None, None)
+            for comment, structure in Structure.iter_file(
+                path, start, stop, persist_index=save_frame_index
+            )
+        )
+
+    for index, record in enumerate(frames, start + 1):
+        frame_args = dict(args)
+        frame_name = f"{name}_{index}"
+        if record_charge:
+            set_record_charge(frame_args, record)
+        if output:
+            # The input can be referenced by the command (e.g., xtb)
+            frame_args["output"] = get_output_path(output, frame_name)
+        yield generate_calculation(
+            xyz=record.structure, name=frame_name, write_structure=True, **frame_args
+        )
+
+
+def gen_scan_objs(**args):
+    """
+    Generates one constrained optimisation per point of the scans ("scan"
+    arguments and scans of the "constraints" string) instead of a single scan.
+    The structure of each point is displaced to the values of the scanned
+    coordinates, which are then frozen along with the other constraints (see
+    ccinput.scan). The calculations are named after the calculation and the
+    index of the point, starting from 1. If "output" is given, the outputs of
+    the points follow it as pattern (see get_output_path).
+
+    Since the geometries are built by ccinput, the scans can start from any
+    value, even with Gaussian.
+    """
+    record_charge = args.pop("record_charge", False)
+    set_structure_from_file(args, record_charge)
+    path = args.pop("file", None)
+    if isinstance(path, list):
+        path = path[0]
+
+    if args.get("software") is None:
+        raise InvalidParameter("Specify a software package to use")
+    if args.get("type") is None:
+        raise InvalidParameter("Specify a calculation type")
+    if get_abs_type(args["type"]) != CalcType.CONSTR_OPT:
+        raise InvalidParameter(
+            "Scans can only be fanned out for constrained optimisations"
+        )
+    if args.get("xyz", "") == "":
+        raise InvalidParameter("No input structure")
+
+    software = get_abs_software(args["software"])
+    if software == "pyscf":
+        raise UnimplementedError(
+            "Frozen coordinates are not implemented for PySCF: cannot fan out scans"
+        )
+    structure = Structure.from_xyz(args.pop("xyz"))
+
+    # The scans are replaced by frozen coordinates, the other constraints are kept
+    constraints = [c for c in args.pop("constraints", "").split(";") if c.strip() != ""]
+    freeze_constraints = [
+        c for c in constraints if not c.strip().lower().startswith("scan")
+    ]
+    scans = parse_str_constraints(
+        ";".join(c for c in constraints if c not in freeze_constraints),
+        structure,
+        software=software,
+        native_scan=False,
+    )
+    scans += parse_scan_constraints(
+        args.pop("scan", []),
+        args.pop("sfrom", []),
+        args.pop("sto", []),
+        args.pop("snsteps", []),
+        args.pop("sstep", []),
+        structure,
+        software=software,
+        native_scan=False,
+    )
+    if len(scans) == 0:
+        raise InvalidParameter("No scan to fan out")
+
+    name = args.pop("name", None)
+    if name is None:
+        name = os.path.splitext(os.path.basename(path))[0] if path else "calc"
+    output = args.pop("output", None)
+
+    # The points are not files of their own (e.g., for the xtb command)
+    if args.pop("parse_name", False):
+        if path is None:
+            raise InvalidParameter("Cannot parse the name without an input file")
+        if record_charge:
+            raise InvalidParameter(
+                "Cannot use both the charge of the records and the file name"
+            )
+        args["charge"], args["multiplicity"] = get_charge_mult_from_name(path)
+
+    freeze = list(args.pop("freeze", [])) + [scan.ids for scan in scans]
+    values, coordinates = gen_scan_points(structure, scans, software)
+    for index, point in enumerate(coordinates, 1):
+        point_args = dict(args)
+        point_name = f"{name}_{index}"
+        if output:
+            # The input can be referenced by the command (e.g., xtb)
+            point_args["output"] = get_output_path(output, point_name)
+        yield generate_calculation(
+            xyz=Structure(structure.elements, point),
+            name=point_name,
+            constraints=";".join(freeze_constraints),
+            freeze=freeze,
+            write_structure=True,
+            **point_args,
+        )
 
-    return generate_calculation(**args)
+
+def gen_parameters(**args):
+    """
+    Builds and validates the Parameters (method, basis sets, solvation, ...)
+    of the arguments of generate_calculation, which do not depend on the
+    structure.
+    """
+    bound = inspect.signature(generate_calculation).bind(**args)
+    bound.apply_defaults()
+    args = bound.arguments
+
+    if args["software"] is None:
+        raise InvalidParameter("Specify a software package to use")
+
+    if args["method"] is None:
+        raise InvalidParameter("Specify a calculation method")
+
+    return build_parameters(args)
+
+
+def build_parameters(args):
+    """
+    Returns the Parameters of the arguments of generate_calculation, given as
+    a dictionary of all its arguments (with the extra keyword arguments as
+    "kwargs")
+    """
+    return Parameters(
+        get_abs_software(args["software"]),
+        args["solvent"],
+        args["solvation_model"],
+        args["solvation_radii"],
+        args["custom_solvation_radii"],
+        args["basis_set"],
+        args["method"],
+        args["specifications"],
+        args["density_fitting"],
+        args["custom_basis_sets"],
+        args["d3"],
+        args["d3bj"],
+        args["trust_me"],
+        **args["kwargs"],
+    )
+
+
+def gen_batch_objs(structures, charges=None, multiplicities=None, names=None, **args):
+    """
+    Generates one calculation per structure (Structure objects or XYZ
+    strings) with the same parameters. The parameters are resolved and
+    validated once, then shared by all the calculations.
+
+    The charges, multiplicities and names of the structures can be given as
+    iterables; by default, the "charge" and "multiplicity" arguments are used
+    for all the structures and the calculations are named after the "name"
+    argument (or "calc") and the index of the structure, starting from 1.
+    """
+    args.pop("xyz", None)
+    args.pop("file", None)
+    args.pop("parameters", None)
+    name = args.pop("name", None) or "calc"
+
+    if charges is None:
+        charges = itertools.repeat(args.get("charge", 0))
+    if multiplicities is None:
+        multiplicities = itertools.repeat(args.get("multiplicity", 1))
+    if names is None:
+        names = (f"{name}_{index}" for index in itertools.count(1))
+    args.pop("charge", None)
+    args.pop("multiplicity", None)
+
+    parameters = gen_parameters(**args)
+    for structure, charge, multiplicity, calc_name in zip(
+        structures, charges, multiplicities, names
+    ):
+        # Some packages adapt the parameters to the calculation (e.g., the theory level)
+        yield generate_calculation(
+            xyz=structure,
+            charge=charge,
+            multiplicity=multiplicity,
+            name=calc_name,
+            parameters=copy.copy(parameters),
+            **args,
+        )
 
 
 def gen_input(**args):
@@ -200,7 +594,7 @@ def get_parser():
     parser.add_argument(
         "software",
         nargs="?",
-        help="Desired software package (Gaussian, ORCA, Q-Chem, ...)",
+        help="Desired software package (Gaussian, ORCA, Q-Chem, ...), or 'serve' to start a generation server",
     )
 
     parser.add_argument("type", nargs="?", help="Calculation type (opt, freq, sp, ...)")
@@ -269,7 +663,26 @@ def get_parser():
         default=None,
         nargs="+",
         type=str,
-        help="XYZ structure(s) as file(s)",
+        help="Structure(s) as file(s) (XYZ, SDF or MOL2)",
+    )
+
+    parser.add_argument(
+        "--frames",
+        action="store_true",
+        help="Generate one input per frame of multi-frame XYZ files (trajectories, conformer ensembles)",
+    )
+
+    parser.add_argument(
+        "--frame_range",
+        default=None,
+        type=str,
+        help="Only generate the inputs of the given frames ('first-last', counting from 1; implies --frames)",
+    )
+
+    parser.add_argument(
+        "--save_frame_index",
+        action="store_true",
+        help="Save the index of the frames next to multi-frame XYZ files for faster access",
     )
 
     parser.add_argument(
@@ -277,7 +690,13 @@ def get_parser():
         "-o",
         default="",
         type=str,
-        help="Write the result to the specified file (single file) or using the specified pattern (multiple files)",
+        help="Write the result to the specified file (single file) or using the specified pattern (multiple files); the companion files (e.g., NWChem solvation parameters) are written in the same directory",
+    )
+
+    parser.add_argument(
+        "--archive_stdout",
+        action="store_true",
+        help="Write the archive given as output (.tar, .tar.gz, .tgz or .zip) to the standard output",
     )
 
     parser.add_argument(
@@ -342,6 +761,20 @@ def get_parser():
         help="Step size in Å (for --scan)",
     )
 
+    parser.add_argument(
+        "--scan_fanout",
+        action="store_true",
+        help="Generate one constrained optimisation per point of the scans instead of a single scan (with ORCA and xtb, the number of steps is the number of points, as in their scans; otherwise there is one more point than steps)",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        default=1,
+        type=int,
+        help="Number of processes generating the inputs of multiple files in parallel",
+    )
+
     parser.add_argument(
         "--nproc", "-n", default=1, type=int, help="Number of CPU cores to use"
     )
@@ -366,6 +799,12 @@ def get_parser():
         help="Use filenames to assign the charge and multiplicity",
     )
 
+    parser.add_argument(
+        "--record_charge",
+        action="store_true",
+        help="Use the charge and multiplicity of the molecules of SDF and MOL2 files",
+    )
+
     parser.add_argument(
         "--trust_me",
         action="store_true",
@@ -425,6 +864,12 @@ def get_parser():
         type=str.lower,
         help="Specify a computation driver other than the calculation package",
     )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        type=str,
+        help="Unix socket of the generation server (ccinput serve)",
+    )
     parser.add_argument(
         "--version", "-v", action="version", version=f"%(prog)s {__version__}"
     )
@@ -445,6 +890,17 @@ def cmd(cmd_line=None):
     else:
         args = parser.parse_args()
 
+    if args.software == "serve":
+        # Imported here, since the server imports this module
+        from ccinput.server import serve
+
+        try:
+            serve(args.socket)
+        except CCInputException as e:
+            print(f"!!! {str(e)} !!!")
+            exit(0)
+        return
+
     if args.save:
         if args.preset:
             warn("Cannot both save and load a preset")
@@ -457,29 +913,39 @@ def cmd(cmd_line=None):
         list_presets()
         exit(0)
 
-    if args.preset:
-        calcs, outputs = get_input_from_args(
-            args, default_params=vars(parser.parse_args([]))
+    archive = get_archive_format(args.output)
+    if archive is not None:
+        archive_path = args.output
+        archive_format, args.output = archive
+        if args.output == "":
+            print(
+                "!!! Specify a name for the archive (e.g., sp.inp.tar.gz for inputs named sp_<name>.inp) !!!"
+            )
+            exit(0)
+    elif args.archive_stdout:
+        print(
+            "!!! Specify the format of the archive as output (e.g., sp.inp.tar.gz, .tar or .zip) !!!"
         )
+        exit(0)
+
+    # The inputs are written as they are generated
+    if args.preset:
+        calcs = iter_input_from_args(args, default_params=vars(parser.parse_args([])))
     else:
-        calcs, outputs = get_input_from_args(args)
-
-    if args.output != "":
-        for calc, outp in zip(calcs, outputs):
-            with open(outp, "w") as out:
-                out.write(calc.input_file)
-            if hasattr(calc, "radii_parameters") and calc.radii_parameters != "":
-                with open(f"{calc.calc.name}_sol.parameters", "w") as file:
-                    file.write(calc.radii_parameters)
-            if hasattr(calc, "command") and calc.command:
-                print(f'Input file written to {outp} - run "{calc.command}"')
-            else:
-                print(f"Input file written to {outp}")
+        calcs = iter_input_from_args(args)
+
+    if archive is not None:
+        write_archive(calcs, archive_path, archive_format, args.archive_stdout)
+    elif args.output != "":
+        for calc, outp in calcs:
+            write_calc(calc, outp)
     else:
-        if len(calcs) == 1:
-            print(calcs[0].output)
+        # The inputs are only separated by headers if there are several
+        first_calcs = list(itertools.islice(calcs, 2))
+        if len(first_calcs) == 1:
+            print(first_calcs[0][0].output)
         else:
-            for calc in calcs:
+            for calc, outp in itertools.chain(first_calcs, calcs):
                 n = max(int((39 - len(calc.calc.name)) / 2), 4)
                 header = "-" * n + f" {calc.calc.name} " + "-" * n
                 print(header)
@@ -487,14 +953,112 @@ def cmd(cmd_line=None):
                 print("\n\n")
 
 
+def write_calc(calc, outp, archive=None):
+    """
+    Writes the input of a calculation and its companion files, as files or as
+    members of the archive (see ArchiveWriter)
+    """
+    companion_files = get_companion_files(calc)
+    files = [(outp, calc.input_file)]
+    if archive is not None:
+        # The archive holds everything the command reads, but no empty input
+        companion_files = {**get_command_files(calc), **companion_files}
+        if calc.input_file == "" and len(companion_files) > 0:
+            files = []
+    for name, content in companion_files.items():
+        files.append((os.path.join(os.path.dirname(outp), name), content))
+
+    for path, content in files:
+        if archive is None:
+            with open(path, "w") as out:
+                out.write(content)
+        else:
+            archive.add(path, content)
+
+    if archive is not None:
+        outp = f"{files[0][0]} in {archive.name}"
+    if hasattr(calc, "command") and calc.command:
+        print(f'Input file written to {outp} - run "{calc.command}"')
+    else:
+        print(f"Input file written to {outp}")
+
+
+def get_companion_files(calc):
+    """
+    Returns the other files to write next to the input of a calculation
+    (solvation parameters, structure read by the command) as {name: content}
+    """
+    files = {}
+    if getattr(calc, "radii_parameters", "") != "":
+        files[f"{calc.calc.name}_sol.parameters"] = calc.radii_parameters
+    if getattr(calc, "structure_file", "") != "":
+        files[f"{calc.calc.name}.xyz"] = calc.structure_file
+    return files
+
+
+def get_command_files(calc):
+    """
+    Returns the structure file read by the command of a calculation (xtb) as
+    {name: content}, which is only on disk unless written in an archive
+    """
+    if not getattr(calc, "command", ""):
+        return {}
+    name = calc.get_output_name()
+    if calc.calc.file and os.path.isfile(calc.calc.file):
+        with open(calc.calc.file) as f:
+            return {name: f.read()}
+    return {name: f"{len(calc.calc.structure)}\n{calc.calc.name}\n{calc.calc.xyz}"}
+
+
+def write_archive(calcs, path, archive_format, to_stdout=False):
+    """
+    Writes the inputs of the calculations as members of an archive, at the
+    path or on the standard output
+    """
+    if not to_stdout:
+        with ArchiveWriter(path, archive_format) as archive:
+            for calc, outp in calcs:
+                write_calc(calc, outp, archive)
+        return
+
+    # The messages and warnings must not be mixed with the archive
+    stdout = sys.stdout.buffer
+    with redirect_stdout(sys.stderr):
+        with ArchiveWriter(
+            stdout, archive_format, name="archive on standard output"
+        ) as archive:
+            for calc, outp in calcs:
+                write_calc(calc, outp, archive)
+
+
 def get_input_from_args(args, default_params=None):
+    calcs = []
+    outputs = []
+    for calc, output in iter_input_from_args(args, default_params=default_params):
+        calcs.append(calc)
+        if output is not None:
+            outputs.append(output)
+    return calcs, outputs
+
+
+def iter_input_from_args(args, default_params=None):
+    """
+    Generates the calculations of the command line arguments one at a time,
+    with the path of their output (None if no output is given). The
+    structures are only processed when the next calculation is requested.
+    """
+    frames = args.frames or bool(args.frame_range)
+    if frames and args.scan_fanout:
+        print("!!! Cannot fan out the scans of multiple frames !!!")
+        exit(0)
     xyzs = []
     names = []
     outputs = []
     files = []
 
     if args.file:
-        xyzs = [parse_xyz_from_file(f) for f in args.file]
+        # The structures are parsed from the files by gen_obj
+        xyzs = [""] * len(args.file)
         files = args.file
         if len(args.file) > 1 or args.name is None:
             names = [os.path.basename(f).split(".")[0] for f in args.file]
@@ -502,23 +1066,11 @@ def get_input_from_args(args, default_params=None):
             names = [args.name]
 
         if args.output != "":
-            head, tail = os.path.split(args.output)
-            if tail.find(".") != -1:
-                has_ext = True
-                prefix, ext = tail.split(".")
-            else:
-                has_ext = False
-                prefix = tail
-
-            if prefix != "":
-                prefix += "_"
-            if len(args.file) > 1:
-                if has_ext:
-                    outputs = [
-                        os.path.join(head, prefix + name + "." + ext) for name in names
-                    ]
-                else:
-                    outputs = [os.path.join(head, prefix + name) for name in names]
+            if frames or args.scan_fanout:
+                # The outputs of the frames and points follow the pattern of the output
+                outputs = [args.output] * len(args.file)
+            elif len(args.file) > 1:
+                outputs = [get_output_path(args.output, name) for name in names]
             else:
                 outputs = [args.output]
     else:
@@ -551,6 +1103,7 @@ def get_input_from_args(args, default_params=None):
         "charge": args.charge,
         "multiplicity": args.mult,
         "parse_name": args.parse_name,
+        "record_charge": args.record_charge,
         "trust_me": args.trust_me,
         "d3": args.d3,
         "d3bj": args.d3bj,
@@ -573,18 +1126,124 @@ def get_input_from_args(args, default_params=None):
             elif params[k] == default_params[k]:
                 params[k] = v
 
-    calcs = []
+    tasks = []
     for ind, (name, xyz, file) in enumerate(zip(names, xyzs, files)):
         if len(outputs) >= ind + 1:
             output = outputs[ind]
         else:
             output = None
+        tasks.append(
+            (
+                name,
+                xyz,
+                file,
+                output,
+                frames,
+                args.frame_range,
+                args.save_frame_index,
+                args.scan_fanout,
+                params,
+            )
+        )
+
+    if args.jobs > 1 and len(tasks) > 1:
+        yield from iter_parallel_objs(tasks, args)
+        return
 
+    for task in tasks:
         try:
-            calc = gen_obj(name=name, xyz=xyz, file=file, output=output, **params)
+            for calc in iter_file_objs(*task):
+                yield calc, get_calc_output(calc, task[3], args)
         except CCInputException as e:
             print(f"!!! {str(e)} !!!")
             exit(0)
-        else:
-            calcs.append(calc)
-    return calcs, outputs
+
+
+def iter_file_objs(
+    name,
+    xyz,
+    file,
+    output,
+    frames,
+    frame_range,
+    save_frame_index,
+    scan_fanout,
+    params,
+):
+    """Generates the calculations of one structure of the command line"""
+    if frames:
+        yield from gen_frame_objs(
+            name=name,
+            file=file,
+            output=output,
+            frame_range=frame_range,
+            save_frame_index=save_frame_index,
+            **params,
+        )
+    elif scan_fanout:
+        yield from gen_scan_objs(name=name, xyz=xyz, file=file, output=output, **params)
+    else:
+        yield gen_obj(name=name, xyz=xyz, file=file, output=output, **params)
+
+
+def _gen_file_objs_task(task):
+    # Runs in the worker processes: the errors are returned to be reported
+    try:
+        return list(iter_file_objs(*task)), None
+    except CCInputException as e:
+        return None, str(e)
+
+
+def get_calc_output(calc, output, args):
+    """
+    Returns the output path of a calculation of the command line: the output
+    of its structure, or a path following the output pattern for frames and
+    scan points
+    """
+    if (args.frames or args.frame_range or args.scan_fanout) and args.output != "":
+        return get_output_path(args.output, calc.calc.name)
+    return output
+
+
+def iter_parallel_objs(tasks, args):
+    """
+    Generates the calculations of the structures in a pool of args.jobs
+    processes. The calculations are kept in the order of the structures and
+    the structures which cannot be processed are reported at the end instead
+    of stopping the generation.
+    """
+    chunksize = max(1, len(tasks) // (args.jobs * PARALLEL_CHUNKS_PER_JOB))
+    errors = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        results = executor.map(_gen_file_objs_task, tasks, chunksize=chunksize)
+        for task, (file_calcs, error) in zip(tasks, results):
+            if error is not None:
+                errors.append((task[2] or task[0], error))
+                continue
+            for calc in file_calcs:
+                yield calc, get_calc_output(calc, task[3], args)
+
+    if len(errors) > 0:
+        for source, error in errors:
+            print(f"!!! {source}: {error} !!!")
+        print(
+            f"!!! {len(errors)} of {len(tasks)} structures could not be processed !!!"
+        )
+
+
+def get_output_path(output, name):
+    """
+    Returns the path of the output of a calculation following the pattern given
+    with --output when generating multiple inputs: the name of the calculation
+    is appended to the prefix of the pattern.
+    """
+    head, tail = os.path.split(output)
+    if tail.find(".") != -1:
+        prefix, ext = tail.rsplit(".", 1)
+        ext = "." + ext
+    else:
+        prefix, ext = tail, ""
+
+    if prefix != "":
+        prefix += "_"
+    return os.path.join(head, prefix + name + ext)
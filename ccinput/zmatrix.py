@@ -0,0 +1,304 @@
+"""
+Z-matrix input.
+
+The Z-matrices are parsed into reference atoms and internal coordinates, then
+converted to Cartesian coordinates with the Natural Extension Reference Frame
+(NeRF) method. The conversion processes many molecules at once: each atom
+position depends on the previous ones, so the atoms are placed one row at a
+time, but each row is placed for all the molecules in one set of array
+operations.
+
+The first atom is placed at the origin, the second one on the z axis and the
+third one in the xz plane.
+"""
+
+import os
+
+import numpy as np
+
+from ccinput.utilities import get_element_symbol
+from ccinput.exceptions import InvalidParameter, InvalidXYZ
+
+ZMATRIX_EXTENSIONS = [".zmat", ".zmt", ".gzmat"]
+
+# Labels of dummy atoms, which are used as references but are not part of the structure
+ZMATRIX_DUMMY_LABELS = ["x", "xx"]
+
+# Sine of the angle below which three reference atoms are considered collinear
+ZMATRIX_COLLINEAR_TOLERANCE = 1e-6
+
+# Headers of the sections of variables (case insensitive, optional colon)
+ZMATRIX_VARIABLE_SECTIONS = ["variables", "constants"]
+
+
+def is_zmatrix(xyz):
+    """
+    Returns True if the string or list of lines is a Z-matrix. The first line
+    of a Z-matrix only contains the label of the first atom and the second
+    line places the second atom relative to it ("<label> <atom> <distance>"),
+    while XYZ input starts with the number of atoms, a title or the
+    coordinates of an atom.
+    """
+    if isinstance(xyz, str):
+        xyz = xyz.strip().split("\n", 2)
+    elif not isinstance(xyz, (list, tuple)) or len(xyz) == 0:
+        return False
+
+    if not all(isinstance(line, str) for line in xyz[:2]):
+        return False
+    fields = xyz[0].replace(",", " ").split()
+    if len(fields) != 1 or fields[0].isdigit():
+        return False
+    if len(xyz) == 1:
+        return True
+
+    second = xyz[1].replace(",", " ").split()
+    if len(second) != 3:
+        return False
+    ref, distance = second[1:]
+    if not (ref.isdigit() or ref == fields[0]):
+        return False
+    try:
+        float(distance)
+    except ValueError:
+        # Variable
+        return distance.lstrip("+-").isidentifier()
+    return True
+
+
+def _get_label_element(label):
+    """Returns the element symbol of an atom label (e.g. C, C12, 6) or None for dummy atoms"""
+    if label.isdigit():
+        return get_element_symbol(label)
+
+    symbol = label.rstrip("0123456789")
+    if symbol.lower() in ZMATRIX_DUMMY_LABELS:
+        return None
+    try:
+        return get_element_symbol(symbol)
+    except InvalidXYZ:
+        raise InvalidXYZ(f"Invalid atomic label: '{label}'")
+
+
+def _get_value(token, variables):
+    try:
+        return float(token)
+    except ValueError:
+        pass
+
+    sign = 1.0
+    name = token
+    if token[0] in "+-":
+        sign = -1.0 if token[0] == "-" else 1.0
+        name = token[1:]
+    if name not in variables:
+        raise InvalidParameter(f"Unknown Z-matrix variable: '{token}'")
+    return sign * variables[name]
+
+
+def parse_zmatrix(zmatrix):
+    """
+    Parses a Z-matrix given as a string or as a list of lines. The atoms can be
+    referred to by their number (counting from 1) or by their label, and the
+    values can be given directly or through variables defined after the atoms
+    (separated by a blank line or by a "Variables:" line).
+
+    Returns the elements (None for dummy atoms), the reference atoms of the
+    bond, angle and dihedral angle of each atom (counting from 0, -1 if
+    unused) and the bond lengths, angles and dihedral angles (in degrees).
+    """
+    if isinstance(zmatrix, str):
+        lines = zmatrix.strip().split("\n")
+    else:
+        lines = list(zmatrix)
+
+    atom_lines = []
+    variables = {}
+    in_variables = False
+    for line in lines:
+        line = line.strip()
+        if line.rstrip(":").lower() in ZMATRIX_VARIABLE_SECTIONS:
+            in_variables = True
+        elif line == "":
+            if len(atom_lines) > 0:
+                in_variables = True
+        elif in_variables:
+            fields = line.replace("=", " ").replace(",", " ").split()
+            if len(fields) != 2:
+                raise InvalidParameter(f"Invalid Z-matrix variable: '{line}'")
+            try:
+                variables[fields[0]] = float(fields[1])
+            except ValueError:
+                raise InvalidParameter(f"Invalid Z-matrix variable: '{line}'")
+        else:
+            atom_lines.append(line)
+
+    if len(atom_lines) == 0:
+        raise InvalidParameter("Empty Z-matrix")
+
+    num_atoms = len(atom_lines)
+    elements = []
+    refs = np.full((num_atoms, 3), -1, dtype=int)
+    values = np.zeros((num_atoms, 3))
+    labels = {}
+    for i, line in enumerate(atom_lines):
+        fields = line.replace(",", " ").split()
+        num_refs = min(i, 3)
+
+        # Gaussian marks the last field as a dihedral angle with a trailing 0
+        if num_refs == 3 and len(fields) == 8 and fields[7] == "0":
+            fields = fields[:7]
+        if len(fields) != 1 + 2 * num_refs:
+            raise InvalidParameter(f"Invalid Z-matrix line: '{line}'")
+
+        elements.append(_get_label_element(fields[0]))
+        labels.setdefault(fields[0], i)
+
+        for k in range(num_refs):
+            ref = fields[1 + 2 * k]
+            if ref.isdigit():
+                ref = int(ref) - 1
+            elif ref in labels:
+                ref = labels[ref]
+            else:
+                raise InvalidParameter(f"Unknown Z-matrix atom: '{ref}'")
+
+            if not 0 <= ref < i:
+                raise InvalidParameter(
+                    f"Invalid Z-matrix line: '{line}' (atoms can only refer to previous atoms)"
+                )
+            refs[i, k] = ref
+            values[i, k] = _get_value(fields[2 + 2 * k], variables)
+
+        if len(set(refs[i, :num_refs])) != num_refs:
+            raise InvalidParameter(
+                f"Invalid Z-matrix line: '{line}' (the reference atoms must be different)"
+            )
+        if num_refs > 0 and values[i, 0] <= 0:
+            raise InvalidParameter(
+                f"Invalid Z-matrix line: '{line}' (the bond length must be positive)"
+            )
+
+    return elements, refs, values
+
+
+def zmatrix_to_cartesian(refs, values):
+    """
+    Converts internal coordinates to Cartesian coordinates with the NeRF
+    method. The reference atoms and values are given as returned by
+    parse_zmatrix, either for one molecule (n, 3) or for a batch of molecules
+    padded to the same number of atoms (m, n, 3). Padding atoms must refer to
+    existing atoms; their coordinates are meaningless.
+
+    Returns the coordinates of all the atoms, including dummy atoms. The
+    coordinates of atoms defined relative to collinear reference atoms are
+    NaN.
+    """
+    refs = np.asarray(refs, dtype=int)
+    values = np.asarray(values, dtype=float)
+    single = refs.ndim == 2
+    if single:
+        refs = refs[np.newaxis]
+        values = values[np.newaxis]
+
+    num_molecules, num_atoms = refs.shape[:2]
+    coordinates = np.zeros((num_molecules, num_atoms, 3))
+    if num_atoms > 1:
+        coordinates[:, 1, 2] = values[:, 1, 0]
+
+    # Position of each atom in the local frame of its reference atoms
+    r = values[:, :, 0]
+    theta = np.radians(values[:, :, 1])
+    phi = np.radians(values[:, :, 2])
+    local = np.stack(
+        [
+            -r * np.cos(theta),
+            r * np.sin(theta) * np.cos(phi),
+            r * np.sin(theta) * np.sin(phi),
+        ],
+        axis=-1,
+    )
+
+    molecules = np.arange(num_molecules)
+    # The dihedral reference of the third atom puts it in the xz plane
+    origin_x = np.array([1.0, 0.0, 0.0])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i in range(2, num_atoms):
+            a = coordinates[molecules, refs[:, i, 0]]
+            b = coordinates[molecules, refs[:, i, 1]]
+            if i == 2:
+                c = b + origin_x
+            else:
+                c = coordinates[molecules, refs[:, i, 2]]
+
+            bc = a - b
+            bc /= np.linalg.norm(bc, axis=1)[:, np.newaxis]
+            cb = b - c
+            n = np.cross(cb, bc)
+            norm = np.linalg.norm(n, axis=1)
+            norm[norm < ZMATRIX_COLLINEAR_TOLERANCE * np.linalg.norm(cb, axis=1)] = (
+                np.nan
+            )
+            n /= norm[:, np.newaxis]
+            m = np.cross(n, bc)
+
+            coordinates[:, i] = (
+                a
+                + local[:, i, 0, np.newaxis] * bc
+                + local[:, i, 1, np.newaxis] * m
+                + local[:, i, 2, np.newaxis] * n
+            )
+
+    if single:
+        return coordinates[0]
+    return coordinates
+
+
+def zmatrices_to_cartesian(zmatrices):
+    """
+    Parses and converts many Z-matrices at once. The molecules are padded to
+    the same number of atoms and converted in one batch.
+
+    Returns the list of the elements and coordinates of each molecule, without
+    the dummy atoms.
+    """
+    parsed = [parse_zmatrix(zmatrix) for zmatrix in zmatrices]
+    if len(parsed) == 0:
+        return []
+
+    max_atoms = max(len(elements) for elements, refs, values in parsed)
+    refs = np.zeros((len(parsed), max_atoms, 3), dtype=int)
+    values = np.zeros((len(parsed), max_atoms, 3))
+    for i, (elements, mol_refs, mol_values) in enumerate(parsed):
+        refs[i, : len(elements)] = mol_refs
+        values[i, : len(elements)] = mol_values
+
+    coordinates = zmatrix_to_cartesian(refs, values)
+
+    structures = []
+    for i, (elements, mol_refs, mol_values) in enumerate(parsed):
+        mol_coordinates = coordinates[i, : len(elements)]
+        undefined = np.flatnonzero(np.isnan(mol_coordinates).any(axis=1))
+        if len(undefined) > 0:
+            raise InvalidParameter(
+                f"Invalid Z-matrix: the reference atoms of atom {undefined[0] + 1} are collinear"
+            )
+
+        atoms = [j for j, el in enumerate(elements) if el is not None]
+        if len(atoms) == 0:
+            raise InvalidParameter("Invalid Z-matrix: no atoms besides dummy atoms")
+        structures.append(([elements[j] for j in atoms], mol_coordinates[atoms].copy()))
+    return structures
+
+
+def is_zmatrix_file(path):
+    """Returns True if the extension of the file is one of ZMATRIX_EXTENSIONS"""
+    return os.path.splitext(path)[1].lower() in ZMATRIX_EXTENSIONS
+
+
+def read_zmatrix_file(path):
+    if not os.path.isfile(path):
+        raise InvalidParameter(f"Input file not found: {path}")
+
+    with open(path) as f:
+        return f.read()